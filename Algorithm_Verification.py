@@ -1,5 +1,10 @@
 import snap
-from Δ_list_coloring_Algorithm import run_delta_list_coloring
+import random
+
+from coloring_verifier import verify_coloring
+from dynamic_coloring import DynamicColoring
+from out_of_core import run_ooc_delta_list_coloring
+from Δ_list_coloring_Algorithm import find_theta, find_whel, run_delta_list_coloring
 
 
 # ------------------------------------------------------------
@@ -44,15 +49,9 @@ print(f"Coloring Result (per node): {result_dl['colors']}")
 # ------------------------------------------------------------
 # ⑤ 验证结果是否正确
 # ------------------------------------------------------------
-def is_valid(adj, colors):
-    for u in range(len(adj)):
-        for v in adj[u]:
-            if colors[u] == colors[v]:
-                return False
-    return True
-
-
-print("Coloring valid?", is_valid(adj_list, result_dl['colors']))
+report = verify_coloring(adj_list, result_dl['colors'])
+print("Coloring valid?", report['valid'], f"(conflicts {report['conflicts']}, "
+      f"uncolored {report['uncolored']}, {report['num_colors']} colors ≤ Δ = {report['bound']})")
 
 
 
@@ -89,4 +88,73 @@ for n in [4, 6, 8, 10]:
     adj_list = convert_to_adj_list(G)
     Delta = max(len(neis) for neis in adj_list)
     result_dl = run_delta_list_coloring(adj_list)
-    print(f"n = {n}, missing 1 edge, Δ = {Delta} → Δ-list-coloring 用色 {result_dl['num_colors']}, time {result_dl['elapsed_ms']:.3f} ms")
+    valid = verify_coloring(adj_list, result_dl['colors'])['valid']
+    print(f"n = {n}, missing 1 edge, Δ = {Delta} → Δ-list-coloring 用色 {result_dl['num_colors']}, "
+          f"time {result_dl['elapsed_ms']:.3f} ms, valid {valid}")
+
+
+# ----------------- 外存版：不连通的非正则图，每个分量都要着色 ------------------
+print("\n=== Out-of-core Δ-list-coloring on a disconnected non-regular graph ===")
+
+# 星 K1,3（Δ = 3 的根所在分量）+ 路 P4 + 圈 C4（2-正则分量，BFS 根到不了）
+adj_list = [[1, 2, 3], [0], [0], [0],
+            [5], [4, 6], [5, 7], [6],
+            [9, 11], [8, 10], [9, 11], [8, 10]]
+result_ooc = run_ooc_delta_list_coloring(adj_list)
+colors_ooc = result_ooc['colors'].tolist()
+report = verify_coloring(adj_list, colors_ooc)
+print(f"3 components, branch {result_ooc['branch']} → colors {colors_ooc}, valid {report['valid']}")
+assert -1 not in colors_ooc, "外存贪心分支漏掉了根以外的分量"
+assert report['valid']
+
+
+# ----------------- 子结构：菱形走 theta 分支，轮图找到真正的轮 ------------------
+print("\n=== Structure search: theta on a diamond, wheel on W6 ===")
+
+# 菱形（K4 去掉 0-3）：块内 DFS 只闭合奇圈，找不到偶圈；列表大小等于度数，走子结构分支
+adj_list = [[1, 2], [0, 2, 3], [0, 1, 3], [1, 2]]
+lists = [[0, 1], [0, 1, 2], [0, 1, 2], [0, 1]]
+u, v, paths = find_theta({0, 1, 2, 3}, adj_list)
+assert len(paths) == 3 and all(p[0] == u and p[-1] == v for p in paths)
+assert len({x for p in paths for x in p[1:-1]}) == sum(len(p) - 2 for p in paths), "theta 的三条路径内部相交"
+assert find_whel({0, 1, 2, 3}, adj_list) is None, "菱形里没有轮"
+result_theta = run_delta_list_coloring(adj_list, lists=lists, instrument=True)
+report = verify_coloring(adj_list, result_theta['colors'], lists=lists)
+print(f"diamond: theta {(u, v, paths)}, branch {result_theta['branch']} → {result_theta['colors']}, "
+      f"valid {report['valid']}")
+assert result_theta['branch'] == 'theta'
+assert report['valid']
+
+# 轮图 W6：中心 0，外圈 1..5；rim 必须是中心邻域里的圈
+adj_list = [[1, 2, 3, 4, 5]] + [[0, (i - 2) % 5 + 1, i % 5 + 1] for i in range(1, 6)]
+hub, rim = find_whel(set(range(6)), adj_list)
+print(f"W6: hub {hub}, rim {rim}")
+assert len(rim) >= 3 and hub not in rim and all(x in adj_list[hub] for x in rim)
+assert all(rim[(i + 1) % len(rim)] in adj_list[rim[i]] for i in range(len(rim))), "rim 不是圈"
+
+# ----------------- 动态着色：每批更新后合法且不超过 Δ+1 色 ------------------
+print("\n=== Dynamic coloring under random updates (invariant: valid, ≤ Δ+1 colors) ===")
+
+# 圈 C12 加 6 条弦，初始着色来自 Δ-list-coloring
+n = 12
+adj_list = [[(i - 1) % n, (i + 1) % n] for i in range(n)]
+for i in range(0, n, 2):
+    adj_list[i].append((i + 5) % n)
+    adj_list[(i + 5) % n].append(i)
+dyn = DynamicColoring(adj_list, run_delta_list_coloring(adj_list)['colors'])
+rng = random.Random(7)
+for batch in range(50):
+    alive = [v for v in range(len(dyn.adj)) if dyn.alive[v]]
+    edges = [(u, v) for u in alive for v in dyn.adj[u] if u < v]
+    dyn.apply(insert_edges=[tuple(rng.sample(alive, 2)) for _ in range(3)],
+              delete_edges=rng.sample(edges, 2),
+              insert_vertices=[rng.sample(alive, 2)] if batch % 5 == 0 else (),
+              delete_vertices=[rng.choice(alive)] if batch % 7 == 3 else ())
+    # 被删除的顶点是孤立点、颜色为 -1，校验时任给一色
+    snapshot = [sorted(nbrs) for nbrs in dyn.adj]
+    report = verify_coloring(snapshot, [max(c, 0) for c in dyn.colors], plus_one=True)
+    assert report['valid'], f"batch {batch}: {report}"
+    assert max(dyn.colors) <= dyn.Delta, f"batch {batch}: 用了超过 Δ+1 种颜色"
+stats = dyn.batch_stats[-1]
+print(f"50 batches, Δ = {stats['Delta']}, {stats['num_colors']} colors, "
+      f"max vertices left on color Δ after a batch: {max(s['extra_color'] for s in dyn.batch_stats)}")
@@ -0,0 +1,106 @@
+"""
+Micro-benchmark: find_even_cycle on the largest block of the Facebook graph
+对比新的显式栈版本与原来的递归版本。
+原版本在提前返回后会把非祖先顶点当成返祖边端点，沿 parent 回溯时可能死循环，
+因此放在子进程里运行并设超时。
+用法: python bench_even_cycle.py [edge_list_path] [repeats]
+"""
+import multiprocessing as mp
+import sys
+import time
+
+from block_cut_tree import biconnected_components
+from graph_cache import load_graph_cached
+from Δ_list_coloring_Algorithm import find_even_cycle
+
+
+def find_even_cycle_recursive(biconn, adj, propagate=False):
+    """
+    原实现（含 n 长度的工作数组与集合成员判断），仅用于对比。
+    - propagate=True 时把子调用找到的圈向上返回（修正后的递归版，用于公平计时）
+    """
+    n = len(adj)
+    parent = [-1] * n
+    depth = [0] * n
+    visited = [False] * n
+
+    def dfs(v):
+        visited[v] = True
+        for u in adj[v]:
+            if u not in biconn:
+                continue
+            if not visited[u]:
+                parent[u] = v
+                depth[u] = depth[v] + 1
+                res = dfs(u)
+                if propagate and res:
+                    return res
+            elif depth[u] < depth[v] - 1 and (depth[v] - depth[u] + 1) % 2 == 0:
+                cycle = []
+                x = v
+                while x != u:
+                    cycle.append(x)
+                    x = parent[x]
+                cycle.append(u)
+                return cycle[::-1]
+        return None
+
+    for v in biconn:
+        if not visited[v]:
+            res = dfs(v)
+            if res:
+                return res
+    return None
+
+
+def best_of(fn, repeats):
+    best, res = float('inf'), None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        res = fn()
+        best = min(best, time.perf_counter() - t0)
+    return res, best * 1000
+
+
+def _old_worker(biconn, adj_list, repeats, propagate, queue):
+    sys.setrecursionlimit(max(10000, 4 * len(adj_list)))
+    res, ms = best_of(lambda: find_even_cycle_recursive(biconn, adj_list, propagate), repeats)
+    queue.put((res, ms))
+
+
+def run_old_with_timeout(biconn, adj_list, repeats, timeout_s, propagate=False):
+    queue = mp.Queue()
+    proc = mp.Process(target=_old_worker, args=(biconn, adj_list, repeats, propagate, queue))
+    proc.start()
+    proc.join(timeout_s)
+    if proc.is_alive():
+        proc.terminate()
+        proc.join()
+        return None, None
+    return queue.get()
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else 'facebook_combined.txt'
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    timeout_s = 60.0
+
+    graph, _, load_stats = load_graph_cached(path)
+    bct = biconnected_components(graph)
+    sizes = bct.block_sizes()
+    block = bct.block(int(sizes.argmax()))
+    biconn = set(block.tolist())
+    print(f"{path}: n={graph.num_nodes}, m={graph.num_edges}, largest block = {len(block)} vertices")
+
+    adj_list = graph.to_adj_list()
+    new_res, new_ms = best_of(lambda: find_even_cycle(block, graph), repeats)
+    print(f"{'iterative (block-local ids, mask)':<35} → {new_ms:.3f} ms, "
+          f"cycle length {len(new_res) if new_res else None}")
+
+    for label, propagate in (("recursive, original", False), ("recursive, result fixed", True)):
+        old_res, old_ms = run_old_with_timeout(biconn, adj_list, repeats, timeout_s, propagate)
+        if old_ms is None:
+            print(f"{label:<35} → no result within {timeout_s:.0f} s")
+            continue
+        print(f"{label:<35} → {old_ms:.3f} ms, cycle length {len(old_res) if old_res else None}, "
+              f"speedup ×{old_ms / new_ms:.1f}")
@@ -0,0 +1,89 @@
+"""
+Vertex-ordering benchmark for the greedy colorers
+每个顶点顺序策略（random / identity / largest_first / smallest_last / dsatur）分别计时并统计颜色数，
+(Δ+1) 贪心与 Δ-list-coloring 的贪心分支各测一遍；degeneracy + 1 是 smallest_last 的颜色数上界。
+结果打印为表格，并追加到 ordering_benchmark.csv。
+用法: python bench_orderings.py [--datasets facebook_combined.txt ...] [--families power_law wheel_greedy ...]
+                               [--size 100000] [--seed 42]
+"""
+import argparse
+import os
+
+from bench_synthetic import FAMILIES
+from coloring_verifier import verify_coloring
+from experiment_log import append_csv, env_info, fmt_ms
+from graph_cache import load_graph_cached
+from orderings import STRATEGIES, degeneracy_ordering
+from Δ_1_coloring_Algorithm import run_delta_plus_one_coloring
+from Δ_list_coloring_Algorithm import run_delta_list_coloring
+
+ORDERING_CSV = "ordering_benchmark.csv"
+HEADER = [
+    "graph", "n", "m", "Delta", "degeneracy", "algorithm", "order", "order_ms", "elapsed_ms",
+    "num_colors", "valid", "fallback", "seed", "date_time",
+]
+
+
+def run_strategies(graph, seed):
+    """每个 (算法, 策略) 一行：(algorithm, order, order_ms, elapsed_ms, num_colors, valid, fallback)"""
+    rows = []
+    nonregular = bool((graph.degree < graph.max_degree()).any())
+    for order in STRATEGIES:
+        res = run_delta_plus_one_coloring(graph, seed=seed, order=order)
+        # DSATUR 的选点与取色交替进行，没有单独的顺序耗时
+        order_ms = "" if order == "dsatur" else res["order_ms"]
+        rows.append(("delta_plus_one", order, order_ms, res["elapsed_ms"], res["num_colors"],
+                     int(verify_coloring(graph, res["colors"], plus_one=True)["valid"]), ""))
+        # Δ-list-coloring 只有非正则（贪心）分支使用顶点顺序；random / identity 不适用
+        if nonregular and order not in ("random", "identity"):
+            res = run_delta_list_coloring(graph, instrument=True, order=order)
+            rows.append(("delta_list", order, "", res["elapsed_ms"], res["num_colors"],
+                         int(verify_coloring(graph, res["colors"])["valid"]),
+                         int(res["counters"].get("order_fallbacks", 0))))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--datasets", nargs="*", default=[])
+    parser.add_argument("--families", nargs="*", default=["power_law", "wheel_greedy", "cubic"], choices=list(FAMILIES))
+    parser.add_argument("--size", type=int, default=100000, help="合成图的目标边数")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    graphs = [(os.path.basename(path), lambda path=path: load_graph_cached(path)[0]) for path in args.datasets]
+    graphs += [(family, lambda family=family: FAMILIES[family](args.size, args.seed)) for family in args.families]
+
+    env = env_info()
+    for name, build in graphs:
+        graph = build()
+        _, core = degeneracy_ordering(graph)
+        degeneracy = max(core, default=0)
+        print(f"\n=== {name}: n={graph.num_nodes}, m={graph.num_edges}, Δ={graph.max_degree()}, "
+              f"degeneracy={degeneracy} ===")
+        print(f"{'algorithm':>15} {'order':>14} {'order_ms':>10} {'total_ms':>11} {'colors':>7} {'ok':>3}")
+        for algorithm, order, order_ms, elapsed_ms, k, valid, fallback in run_strategies(graph, args.seed):
+            order_col = f"{order_ms:.3f}" if order_ms != "" else "-"
+            print(f"{algorithm:>15} {order:>14} {order_col:>10} {elapsed_ms:>11.3f} {k:>7} {valid:>3}"
+                  + (" (fallback to BFS order)" if fallback else ""))
+            append_csv(ORDERING_CSV, HEADER, {
+                "graph": name,
+                "n": graph.num_nodes,
+                "m": graph.num_edges,
+                "Delta": graph.max_degree(),
+                "degeneracy": degeneracy,
+                "algorithm": algorithm,
+                "order": order,
+                "order_ms": fmt_ms(order_ms) if order_ms != "" else "",
+                "elapsed_ms": fmt_ms(elapsed_ms),
+                "num_colors": k,
+                "valid": valid,
+                "fallback": fallback,
+                "seed": args.seed,
+                "date_time": env["date_time"],
+            })
+    print(f"\nResults appended to {ORDERING_CSV}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Strong-scaling benchmark for the multi-core Jones–Plassmann (Δ+1)-coloring
+用法: python bench_parallel_scaling.py [--datasets twitter_combined.txt Slashdot0811.txt]
+                                      [--processes 1 2 4 8 16 32] [--seed 42]
+加速比与效率相对最快的单进程基线（逐顶点贪心与向量化 JP 中较快者），基线名称与耗时一并输出。
+结果打印为表格，并追加到 parallel_scaling.csv。
+"""
+import argparse
+import os
+
+from experiment_log import append_csv, env_info, fmt_ms
+from graph_cache import load_graph_cached
+from parallel_coloring import strong_scaling
+
+SCALING_CSV = "parallel_scaling.csv"
+HEADER = [
+    "dataset", "n", "m", "Delta", "processes", "elapsed_ms", "setup_ms", "speedup",
+    "num_colors", "rounds", "identical", "seed", "date_time", "cpu_count", "total_ms", "total_speedup",
+    "baseline", "baseline_ms", "efficiency",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--datasets", nargs="+", default=["twitter_combined.txt", "Slashdot0811.txt"])
+    parser.add_argument("--processes", nargs="+", type=int, default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    env = env_info()
+    for path in args.datasets:
+        graph, _, load_stats = load_graph_cached(path)
+        Delta = graph.max_degree()
+        print(f"\n=== {os.path.basename(path)}: n={graph.num_nodes}, m={graph.num_edges}, Δ={Delta} ===")
+        rows = strong_scaling(graph, args.processes, seed=args.seed)
+        if rows:
+            print(f"sequential baseline: {rows[0]['baseline']} {rows[0]['baseline_ms']:.3f} ms")
+        print(f"{'p':>4} {'time_ms':>12} {'speedup':>8} {'setup_ms':>10} {'total_ms':>12} {'total_sp':>8} "
+              f"{'eff':>6} {'colors':>7} {'rounds':>7} {'same':>5}")
+        for row in rows:
+            print(f"{row['processes']:>4} {row['elapsed_ms']:>12.3f} {row['speedup']:>8.2f} "
+                  f"{row['setup_ms']:>10.3f} {row['total_ms']:>12.3f} {row['total_speedup']:>8.2f} "
+                  f"{row['efficiency']:>6.2f} {row['num_colors']:>7} {row['rounds']:>7} {str(row['identical']):>5}")
+            append_csv(SCALING_CSV, HEADER, {
+                "dataset": os.path.basename(path),
+                "n": graph.num_nodes,
+                "m": graph.num_edges,
+                "Delta": Delta,
+                "processes": row["processes"],
+                "elapsed_ms": fmt_ms(row["elapsed_ms"]),
+                "setup_ms": fmt_ms(row["setup_ms"]),
+                "speedup": f"{row['speedup']:.3f}",
+                "num_colors": row["num_colors"],
+                "rounds": row["rounds"],
+                "identical": int(row["identical"]),
+                "seed": args.seed,
+                "date_time": env["date_time"],
+                "cpu_count": os.cpu_count(),
+                "total_ms": fmt_ms(row["total_ms"]),
+                "total_speedup": f"{row['total_speedup']:.3f}",
+                "baseline": row["baseline"],
+                "baseline_ms": fmt_ms(row["baseline_ms"]),
+                "efficiency": f"{row['efficiency']:.3f}",
+            })
+    print(f"\nScaling results appended to {SCALING_CSV}")
+
+
+if __name__ == "__main__":
+    main()
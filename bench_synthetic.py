@@ -0,0 +1,143 @@
+"""
+Synthetic-graph benchmark suite for delta_list_coloring and the (Δ+1) baselines
+每个图族在若干规模下逐阶段计时（块-割点树、偶圈 / theta / 轮查找、Brooks 判定、各着色算法），
+结果以长表形式（每行一个 族 × 规模 × 阶段）追加到 synthetic_scaling.csv。
+exponent 列是相邻两个规模之间 log(t) / log(m) 的斜率：≈1 为线性，明显大于 1 即超线性。
+用法: python bench_synthetic.py [--families cubic diamond_chain ...] [--sizes 10000 100000 1000000] [--seed 42]
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from block_cut_tree import biconnected_components
+from coloring_verifier import verify_coloring
+from experiment_log import append_csv, env_info, fmt_ms
+from graph_generators import (cubic_graph, cycle_graph, diamond_chain, near_complete_graph,
+                              power_law_graph, random_regular_graph, wheel_graph)
+from is_brooks_graph import is_brooks_graph
+from vectorized_coloring import run_vectorized_delta_plus_one_coloring
+from Δ_1_coloring_Algorithm import run_delta_plus_one_coloring
+from Δ_list_coloring_Algorithm import find_even_cycle, find_theta, find_whel, run_delta_list_coloring
+
+SCALING_CSV = "synthetic_scaling.csv"
+HEADER = [
+    "family", "target_m", "n", "m", "Delta", "branch", "structure_fallbacks", "phase", "ms", "exponent",
+    "num_colors", "valid", "seed", "date_time",
+]
+
+
+def _even(x):
+    return max(4, int(x) // 2 * 2)
+
+
+# 每个图族：目标边数 m → 图；注释为 delta_list_coloring 实际走的分支（branch 列取自计时的那次运行）。
+# diamond_chain：菱形块里找不到偶圈，改用菱形的 theta；帽子里的 4-圈与之同样大小且先找到，最终走偶圈分支。
+# near_complete：偶圈 / theta / 轮找到的 4 个顶点都落在团里（导出子图是 K4），全部被排除，整图按度数可选性着色。
+# 各查找本身的耗时由 run_instance 在最大的块上单独计时（even_cycle / theta / whel 阶段），穷举版本的对比见 bench_theta.py
+FAMILIES = {
+    "regular4":      lambda m, seed: random_regular_graph(_even(m / 2) + 1, 4, seed),      # 偶圈
+    "cubic":         lambda m, seed: cubic_graph(_even(m / 1.5), seed),                     # 偶圈
+    "even_cycle":    lambda m, seed: cycle_graph(_even(m)),                                 # 偶圈
+    "odd_cycle":     lambda m, seed: cycle_graph(_even(m) + 1),                             # 非 Brooks
+    "diamond_chain": lambda m, seed: diamond_chain(max(1, int(m) // 6)),                    # 偶圈（帽子）
+    "near_complete": lambda m, seed: near_complete_graph(_even(math.sqrt(2 * m))),          # 度数可选性
+    "wheel_greedy":  lambda m, seed: wheel_graph(max(4, int(m) // 2)),                      # 贪心（hub 度数更大，非正则）
+    "power_law":     lambda m, seed: power_law_graph(max(16, int(m) // 4), 8, seed=seed),   # 贪心（非正则）
+}
+
+
+def timed(fn, *args, **kw):
+    t0 = time.perf_counter()
+    res = fn(*args, **kw)
+    return res, (time.perf_counter() - t0) * 1000.0
+
+
+def is_valid_coloring(graph, colors, plus_one=False):
+    """合法、无未着色顶点，且颜色数不超过 Δ（plus_one 时 Δ+1）"""
+    return verify_coloring(graph, colors, plus_one=plus_one)['valid']
+
+
+def run_instance(family, target_m, seed):
+    """
+    生成一个实例并逐阶段计时，返回 (graph, branch, structure_fallbacks, rows)；rows 为 (phase, ms, num_colors, valid)。
+    branch 与 structure_fallbacks 取自计时的那次 delta_list_coloring（instrument=True），非 Brooks 图为 non_brooks
+    """
+    graph, gen_ms = timed(FAMILIES[family], target_m, seed)
+    rows = [("generate", gen_ms, "", "")]
+
+    bct, ms = timed(biconnected_components, graph)
+    rows.append(("block_cut_tree", ms, "", ""))
+    sizes = bct.block_sizes()
+    if len(sizes) and sizes.max() >= 3:
+        block = bct.block(int(np.argmax(sizes)))
+        block_set = set(block.tolist())
+        rows.append(("even_cycle", timed(find_even_cycle, block, graph)[1], "", ""))
+        rows.append(("theta", timed(find_theta, block_set, graph)[1], "", ""))
+        rows.append(("whel", timed(find_whel, block_set, graph)[1], "", ""))
+
+    (is_brooks, _), ms = timed(is_brooks_graph, graph)
+    rows.append(("brooks_check", ms, "", ""))
+    branch, fallbacks = "non_brooks", ""
+    if is_brooks:
+        res = run_delta_list_coloring(graph, instrument=True)
+        branch = res["branch"]
+        fallbacks = res["counters"].get("structure_fallbacks", 0)
+        rows.append(("delta_list", res["elapsed_ms"], res["num_colors"],
+                     int(is_valid_coloring(graph, res["colors"]))))
+    res = run_delta_plus_one_coloring(graph, seed=seed)
+    rows.append(("delta_plus_one", res["elapsed_ms"], res["num_colors"],
+                 int(is_valid_coloring(graph, res["colors"], plus_one=True))))
+    res = run_vectorized_delta_plus_one_coloring(graph, seed=seed)
+    rows.append(("vectorized", res["elapsed_ms"], res["num_colors"],
+                 int(is_valid_coloring(graph, res["colors"], plus_one=True))))
+    return graph, branch, fallbacks, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--families", nargs="+", default=list(FAMILIES), choices=list(FAMILIES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10000, 100000, 1000000],
+                        help="目标边数（每个图族按自己的结构换算顶点数）")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    env = env_info()
+    for family in args.families:
+        print(f"\n=== {family} ===")
+        print(f"{'m':>9} {'Δ':>6} {'branch':>16} {'fb':>3} {'phase':>15} {'ms':>11} {'exp':>6} {'k':>5} {'ok':>3}")
+        previous = {}
+        for target_m in sorted(args.sizes):
+            graph, branch, fallbacks, rows = run_instance(family, target_m, args.seed)
+            m = graph.num_edges
+            for phase, ms, k, valid in rows:
+                exponent = ""
+                if phase in previous:
+                    prev_m, prev_ms = previous[phase]
+                    if m > prev_m and ms > 0 and prev_ms > 0:
+                        exponent = f"{math.log(ms / prev_ms) / math.log(m / prev_m):.2f}"
+                previous[phase] = (m, ms)
+                print(f"{m:>9} {graph.max_degree():>6} {branch:>16} {fallbacks!s:>3} {phase:>15} {ms:>11.3f} "
+                      f"{exponent:>6} {k!s:>5} {valid!s:>3}")
+                append_csv(SCALING_CSV, HEADER, {
+                    "family": family,
+                    "target_m": target_m,
+                    "n": graph.num_nodes,
+                    "m": m,
+                    "Delta": graph.max_degree(),
+                    "branch": branch,
+                    "structure_fallbacks": fallbacks,
+                    "phase": phase,
+                    "ms": fmt_ms(ms),
+                    "exponent": exponent,
+                    "num_colors": k,
+                    "valid": valid,
+                    "seed": args.seed,
+                    "date_time": env["date_time"],
+                })
+    print(f"\nScaling curves appended to {SCALING_CSV}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Stress benchmark: find_theta on regular graphs
+对比新的线性时间 find_theta 与原来的穷举路径版本（带时间预算，超时记为 timeout）。
+"""
+import time
+
+from block_cut_tree import biconnected_components
+from graph_generators import random_regular_circulant
+from Δ_list_coloring_Algorithm import find_theta
+
+BUDGET_S = 10.0            # 穷举版本每个实例的时间预算
+SIZES = [10, 20, 50, 1000, 100000]
+DEGREES = [3, 4, 6]
+
+
+class _Timeout(Exception):
+    pass
+
+
+def find_theta_exhaustive(biconn, adj, budget_s=BUDGET_S):
+    """原实现：对每对 (u, v) 枚举全部简单路径（指数级），仅用于对比"""
+    deadline = time.perf_counter() + budget_s
+    calls = [0]
+    for u in biconn:
+        for v in biconn:
+            if u >= v:
+                continue
+            paths = []
+
+            def dfs(x, target, path, visited):
+                calls[0] += 1
+                if calls[0] % 10000 == 0 and time.perf_counter() > deadline:
+                    raise _Timeout()
+                if x == target:
+                    paths.append(path)
+                    return
+                for w in adj[x]:
+                    if w in biconn and w not in visited:
+                        dfs(w, target, path + [w], visited | {w})
+
+            dfs(u, v, [u], {u})
+            if len(paths) >= 3:
+                return (u, v, paths[:3])
+    return None
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    try:
+        res = fn(*args)
+        return res, (time.perf_counter() - t0) * 1000
+    except (_Timeout, RecursionError):
+        return 'timeout', (time.perf_counter() - t0) * 1000
+
+
+if __name__ == '__main__':
+    print(f"{'n':>8} {'d':>3} {'new_ms':>10} {'old_ms':>12}")
+    for n in SIZES:
+        for d in DEGREES:
+            if d % 2 and n % 2:
+                continue
+            graph = random_regular_circulant(n, d, seed=n * 31 + d)
+            block = max(biconnected_components(graph).blocks(min_size=3), key=len)
+            biconn = set(block.tolist())
+            res_new, t_new = timed(find_theta, biconn, graph)
+            assert res_new is not None
+            if n <= 1000:
+                res_old, t_old = timed(find_theta_exhaustive, biconn, graph)
+                old = 'timeout' if res_old == 'timeout' else f"{t_old:.3f}"
+            else:
+                old = 'skipped'
+            print(f"{n:>8} {d:>3} {t_new:>10.3f} {old:>12}")
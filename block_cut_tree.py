@@ -0,0 +1,120 @@
+import numpy as np
+
+from csr_graph import as_csr
+from instrumentation import NULL_RECORDER
+
+
+class BlockCutTree:
+    """
+    双连通分量（块）与割点构成的块-割点树，全部以紧凑数组保存。
+    - block_ptr / block_vertices: 第 b 个块的顶点为 block_vertices[block_ptr[b]:block_ptr[b+1]]
+    - is_cut: 长度为 n 的布尔数组，标记割点
+    - tree_block / tree_cut: 树边 (块 b, 割点 c)，每个块与其包含的割点相连
+    """
+
+    __slots__ = ('block_ptr', 'block_vertices', 'is_cut', 'tree_block', 'tree_cut')
+
+    def __init__(self, block_ptr, block_vertices, is_cut):
+        self.block_ptr = np.asarray(block_ptr, dtype=np.int64)
+        self.block_vertices = np.asarray(block_vertices, dtype=np.int32)
+        self.is_cut = np.asarray(is_cut, dtype=bool)
+        block_id = np.repeat(np.arange(self.num_blocks, dtype=np.int32), np.diff(self.block_ptr))
+        on_cut = self.is_cut[self.block_vertices] if len(self.block_vertices) else np.zeros(0, dtype=bool)
+        self.tree_block = block_id[on_cut]
+        self.tree_cut = self.block_vertices[on_cut]
+
+    @property
+    def num_blocks(self):
+        return len(self.block_ptr) - 1
+
+    def block(self, b):
+        return self.block_vertices[self.block_ptr[b]:self.block_ptr[b + 1]]
+
+    def block_sizes(self):
+        return np.diff(self.block_ptr)
+
+    def blocks(self, min_size=1):
+        """按 DFS 完成顺序产出块（顶点数组），可过滤掉小块（例如桥 = 2 个顶点）"""
+        sizes = self.block_sizes()
+        for b in range(self.num_blocks):
+            if sizes[b] >= min_size:
+                yield self.block(b)
+
+
+def biconnected_components(adj, rec=NULL_RECORDER):
+    """
+    显式栈的 Hopcroft–Tarjan 双连通分量算法，O(n + m)，不依赖递归深度。
+    - 桥作为 2 个顶点的块保留；孤立顶点不属于任何块
+    - 块按 DFS 完成顺序输出，与原递归版 dfs_biconnected 的顺序一致
+    - rec: 可选的 PhaseRecorder，记录 DFS 启动次数与访问的顶点 / 边（每个顶点与边恰好访问一次）
+    """
+    adj = as_csr(adj)
+    n = len(adj)
+    indptr = adj.indptr.tolist()
+    indices = adj.indices.tolist()
+
+    disc = [-1] * n
+    low = [0] * n
+    parent = [-1] * n
+    nxt = indptr[:-1]          # 每个顶点下一条待扫描的边
+    is_cut = bytearray(n)
+    block_ptr = [0]
+    block_vertices = []
+    vstack = []
+    t = 0
+    launches = 0
+
+    for root in range(n):
+        if disc[root] != -1:
+            continue
+        disc[root] = low[root] = t
+        t += 1
+        if indptr[root] == indptr[root + 1]:
+            continue
+        launches += 1
+        stack = [root]
+        vstack.append(root)
+        root_children = 0
+        while stack:
+            v = stack[-1]
+            i = nxt[v]
+            if i < indptr[v + 1]:
+                nxt[v] = i + 1
+                w = indices[i]
+                if disc[w] == -1:
+                    parent[w] = v
+                    disc[w] = low[w] = t
+                    t += 1
+                    stack.append(w)
+                    vstack.append(w)
+                    if v == root:
+                        root_children += 1
+                elif w != parent[v] and disc[w] < low[v]:
+                    low[v] = disc[w]
+                continue
+
+            stack.pop()
+            p = parent[v]
+            if p == -1:
+                continue
+            if low[v] < low[p]:
+                low[p] = low[v]
+            if low[v] >= disc[p]:
+                # p 把 v 所在子树切出一个块：弹出到 v 为止，再加上 p
+                while True:
+                    x = vstack.pop()
+                    block_vertices.append(x)
+                    if x == v:
+                        break
+                block_vertices.append(p)
+                block_ptr.append(len(block_vertices))
+                if p != root:
+                    is_cut[p] = 1
+        if root_children >= 2:
+            is_cut[root] = 1
+        vstack.pop()
+
+    rec.count('dfs_launches', launches)
+    rec.count('vertices_visited', n)
+    rec.count('edges_visited', len(indices))
+    return BlockCutTree(block_ptr, block_vertices, np.frombuffer(is_cut, dtype=bool))
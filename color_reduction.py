@@ -0,0 +1,243 @@
+"""
+Kempe-chain color reduction post-pass
+着色完成后的可选后处理：反复挑选最小的颜色类，尝试把其中的顶点全部挪走（直接改色或 Kempe 链交换），
+挪空即少用一种颜色；卡住时做一轮迭代贪心（按颜色类分组重排后再首次适配，颜色数不会增加）。
+全程受墙钟预算约束，报告节省的颜色数与耗时。
+用法: python color_reduction.py facebook_combined.txt [--algorithm delta_plus_one|delta_list] [--budget-ms 2000]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from coloring_verifier import verify_coloring
+from csr_graph import as_csr, gather_segments
+from first_fit import FirstFit
+
+GREEDY_STRATEGIES = ('reverse', 'largest_first', 'random')
+
+
+def _compact(colors):
+    """颜色重新编号为 0..k-1（按原编号顺序），-1 保持不变；返回颜色数 k"""
+    used = np.flatnonzero(np.bincount(colors[colors >= 0]))
+    if len(used) and used[-1] != len(used) - 1:
+        remap = np.full(int(used[-1]) + 1, -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+        colored = colors >= 0
+        colors[colored] = remap[colors[colored]]
+    return len(used)
+
+
+class KempeReducer:
+    """
+    - colors: np.int64 数组，原地修改；-1 为未着色，不参与任何移动
+    - mark / gen: 链遍历的访问标记，每条链 gen += 1，不必清空数组
+    """
+
+    def __init__(self, adj, colors):
+        self.adj = as_csr(adj)
+        self.colors = colors
+        self.k = _compact(colors)
+        self.mark = np.zeros(len(colors), dtype=np.int64)
+        self.gen = 0
+        self.direct_moves = 0
+        self.kempe_swaps = 0
+
+    def chain(self, seeds, a, b):
+        """
+        从 seeds 出发、只走颜色为 a / b 的顶点的 Kempe 链（可能是几条链的并），按层向量化 BFS。
+        本次访问的顶点 mark == self.gen。
+        """
+        self.gen += 1
+        gen = self.gen
+        colors, mark = self.colors, self.mark
+        frontier = np.unique(seeds)
+        mark[frontier] = gen
+        parts = [frontier]
+        while len(frontier):
+            _, nbrs = gather_segments(self.adj.indptr, self.adj.indices, frontier)
+            c = colors[nbrs]
+            nbrs = np.unique(nbrs[((c == a) | (c == b)) & (mark[nbrs] != gen)])
+            mark[nbrs] = gen
+            parts.append(nbrs)
+            frontier = nbrs
+        return np.concatenate(parts)
+
+    def move_out(self, v, deadline):
+        """把 v 从它当前的颜色挪到别的颜色类；成功返回 True"""
+        colors = self.colors
+        c = int(colors[v])
+        nbrs = np.asarray(self.adj.neighbors(v), dtype=np.int64)
+        nc = colors[nbrs]
+        count = np.bincount(nc[nc >= 0], minlength=self.k)
+        count[c] = -1
+        free = np.flatnonzero(count == 0)
+        if len(free):
+            colors[v] = free[0]
+            self.direct_moves += 1
+            return True
+        # Kempe 交换：把 v 的 a 色邻居所在的 (a, b) 链整体互换颜色；
+        # 只要链中不含 v 的 b 色邻居，交换后 v 的邻居里就没有 a 色，v 可以改成 a
+        targets = [a for a in np.argsort(count, kind='stable').tolist() if a != c]
+        for a in targets:
+            a_nbrs = nbrs[nc == a]
+            for b in targets:
+                if b == a:
+                    continue
+                if time.perf_counter() > deadline:
+                    return False
+                members = self.chain(a_nbrs, a, b)
+                if (self.mark[nbrs[nc == b]] == self.gen).any():
+                    continue
+                colors[members] = np.where(colors[members] == a, b, a)
+                colors[v] = a
+                self.kempe_swaps += 1
+                return True
+        return False
+
+    def eliminate(self, c, deadline):
+        """尝试挪空颜色类 c；成功时把最后一个颜色改名为 c，颜色数减一"""
+        for v in np.flatnonzero(self.colors == c).tolist():
+            if not self.move_out(v, deadline):
+                return False
+        last = self.k - 1
+        if c != last:
+            self.colors[self.colors == last] = c
+        self.k -= 1
+        return True
+
+    def iterated_greedy(self, strategy, rng):
+        """
+        Culberson 迭代贪心：同一颜色类的顶点连续着色（类内两两不相邻），首次适配的结果不会比原来多用颜色。
+        strategy 决定颜色类的先后：reverse（编号倒序）/ largest_first（大类在前）/ random
+        """
+        colors = self.colors
+        classes = list(range(self.k))
+        if strategy == 'reverse':
+            classes.reverse()
+        elif strategy == 'largest_first':
+            sizes = np.bincount(colors[colors >= 0], minlength=self.k)
+            classes.sort(key=lambda c: -sizes[c])
+        else:
+            rng.shuffle(classes)
+        rank = np.empty(self.k, dtype=np.int64)
+        rank[classes] = np.arange(self.k)
+        colored = np.flatnonzero(colors >= 0)
+        order = colored[np.argsort(rank[colors[colored]], kind='stable')].tolist()
+
+        new = [-1] * len(colors)
+        ff = FirstFit(self.k)
+        ptr, idx = self.adj.neighbor_views()
+        for v in order:
+            new[v] = ff.smallest(idx[ptr[v]:ptr[v + 1]], new)
+        colors[:] = new
+        before = self.k
+        self.k = _compact(colors)
+        return before - self.k
+
+
+def reduce_colors(adj, colors, budget_ms=1000.0, seed=None):
+    """
+    Kempe 链 + 迭代贪心的减色后处理（不修改传入的 colors）。
+    - budget_ms: 墙钟预算；每次链遍历前检查，超时立即停止（已完成的改动都保持着色合法）
+    - seed: 迭代贪心 random 策略的种子
+    每一步都保持合法着色，未着色顶点（-1）原样保留。
+    输入本身有冲突边时 Kempe 交换与迭代贪心都失去保证，直接原样返回（skipped_conflicts 为冲突边数）。
+    返回 colors（np.int32）/ num_colors_before / num_colors / colors_saved / elapsed_ms / budget_ms /
+    direct_moves / kempe_swaps / greedy_rounds / trajectory（[(ms, 颜色数)]，每次颜色数下降记一项）/
+    skipped_conflicts
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + budget_ms / 1000.0
+    adj = as_csr(adj)
+    reducer = KempeReducer(adj, np.array(colors, dtype=np.int64))
+    before = reducer.k
+    rng = random.Random(seed)
+    trajectory = [(0.0, before)]
+    failed = set()
+    greedy_rounds = 0
+    stalled = 0
+    conflicts = verify_coloring(adj, reducer.colors, max_examples=0)['conflicts']
+
+    while not conflicts and reducer.k > 1 and time.perf_counter() < deadline:
+        sizes = np.bincount(reducer.colors[reducer.colors >= 0], minlength=reducer.k)
+        candidates = [c for c in np.argsort(sizes, kind='stable').tolist() if c not in failed]
+        progressed = False
+        if candidates:
+            c = candidates[0]
+            if reducer.eliminate(c, deadline):
+                progressed = True
+            else:
+                # 部分顶点已经挪走：颜色类变小，下次迭代贪心更容易把它消掉
+                failed.add(c)
+                continue
+        else:
+            strategy = GREEDY_STRATEGIES[greedy_rounds % len(GREEDY_STRATEGIES)]
+            greedy_rounds += 1
+            progressed = reducer.iterated_greedy(strategy, rng) > 0
+            stalled = 0 if progressed else stalled + 1
+            if stalled >= 2 * len(GREEDY_STRATEGIES):
+                break
+        if progressed:
+            failed.clear()
+            trajectory.append(((time.perf_counter() - t0) * 1000.0, reducer.k))
+
+    return {
+        'colors': reducer.colors.astype(np.int32),
+        'num_colors_before': before,
+        'num_colors': reducer.k,
+        'colors_saved': before - reducer.k,
+        'elapsed_ms': (time.perf_counter() - t0) * 1000.0,
+        'budget_ms': budget_ms,
+        'direct_moves': reducer.direct_moves,
+        'kempe_swaps': reducer.kempe_swaps,
+        'greedy_rounds': greedy_rounds,
+        'trajectory': trajectory,
+        'skipped_conflicts': conflicts,
+    }
+
+
+def apply_reduction(result, adj, budget_ms, seed=None):
+    """
+    在 run_*_coloring 的结果上原地做减色后处理：colors / num_colors 换成减色后的值，
+    另附 reduction（reduce_colors 的统计，不含 colors）；elapsed_ms 仍只计着色本身
+    """
+    report = reduce_colors(adj, result['colors'], budget_ms, seed)
+    colors = report.pop('colors')
+    result['colors'] = colors.tolist() if isinstance(result['colors'], list) else colors
+    result['num_colors'] = len(set(result['colors']))
+    result['reduction'] = report
+    return result
+
+
+def main(argv=None):
+    from graph_cache import load_graph_cached
+    from Δ_1_coloring_Algorithm import run_delta_plus_one_coloring
+    from Δ_list_coloring_Algorithm import run_delta_list_coloring
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("dataset")
+    parser.add_argument("--algorithm", choices=["delta_plus_one", "delta_list"], default="delta_plus_one")
+    parser.add_argument("--budget-ms", type=float, default=2000.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    graph, _, _ = load_graph_cached(args.dataset)
+    if args.algorithm == "delta_plus_one":
+        res = run_delta_plus_one_coloring(graph, seed=args.seed, reduce_ms=args.budget_ms)
+    else:
+        res = run_delta_list_coloring(graph, reduce_ms=args.budget_ms)
+    red = res['reduction']
+    if red['skipped_conflicts']:
+        print(f"input coloring has {red['skipped_conflicts']} conflicting edge(s); reduction skipped")
+    print(f"{args.algorithm}: {red['num_colors_before']} → {red['num_colors']} colors "
+          f"(saved {red['colors_saved']}) in {red['elapsed_ms']:.1f} ms of {red['budget_ms']:.0f} ms budget; "
+          f"{red['direct_moves']} direct moves, {red['kempe_swaps']} Kempe swaps, {red['greedy_rounds']} greedy rounds")
+    for ms, k in red['trajectory']:
+        print(f"  {ms:>10.1f} ms → {k} colors")
+    print("valid:", verify_coloring(graph, res['colors'], plus_one=args.algorithm == "delta_plus_one")['valid'])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+着色结果校验：向量化比较 colors[src] == colors[dst]，逐块进行，内存只与块大小和顶点数有关。
+- verify_coloring: 对内存中的图（CSRGraph 或 list-of-lists）校验
+- verify_edge_file: 直接流式读取原始边表（.txt / .gz），不构建图，适合上亿条边的数据集
+两者返回同样格式的报告：冲突边、未着色顶点、颜色数上界（≤Δ 或 ≤Δ+1）、列表着色的成员约束。
+用法: python coloring_verifier.py edges.txt colors.npy [--delta N] [--plus-one] [--node-ids ids.npy]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from csr_graph import as_csr
+from first_fit import BitsetPalettes, palette_arrays
+from graph_loader import CHUNK_BYTES, iter_edge_chunks
+
+CHUNK_EDGES = 1 << 22     # 内存中的图每块校验的边数（按顶点区间切分）
+MAX_EXAMPLES = 10         # 报告中保留的冲突 / 违规样例数
+
+
+def check_lists(colors, lists, max_examples=MAX_EXAMPLES):
+    """
+    列表着色约束：每个已着色顶点的颜色必须在它自己的列表里。
+    lists 为 BitsetPalettes 时直接按位查表；否则把 (顶点, 颜色) 打包成 64 位键，用一次 np.isin 完成全部成员判断。
+    返回 (违规顶点数, 样例 [(v, color)])
+    """
+    vs = np.flatnonzero(colors >= 0)
+    if isinstance(lists, BitsetPalettes):
+        if len(lists) != len(colors):
+            raise ValueError(f"lists 长度 {len(lists)} 与顶点数 {len(colors)} 不一致")
+        bad = vs[~lists.allows(vs, colors[vs])]
+        return len(bad), [(int(v), int(colors[v])) for v in bad[:max_examples]]
+    ptr, idx = palette_arrays(lists)
+    if len(ptr) - 1 != len(colors):
+        raise ValueError(f"lists 长度 {len(ptr) - 1} 与顶点数 {len(colors)} 不一致")
+    width = int(max(idx.max(initial=0), colors.max(initial=0))) + 1
+    owner = np.repeat(np.arange(len(colors), dtype=np.int64), np.diff(ptr))
+    allowed = owner * width + idx
+    bad = vs[~np.isin(vs * width + colors[vs], allowed)]
+    return len(bad), [(int(v), int(colors[v])) for v in bad[:max_examples]]
+
+
+class _Report:
+    """逐块累计冲突，最后与顶点侧的检查合成报告"""
+
+    def __init__(self, colors, max_examples):
+        self.colors = colors
+        self.max_examples = max_examples
+        self.edges = 0
+        self.self_loops = 0
+        self.conflicts = 0
+        self.examples = []
+
+    def add(self, u, v):
+        """u, v 为压缩编号；每条无向边只应传入一次"""
+        loops = u == v
+        if loops.any():
+            self.self_loops += int(loops.sum())
+            u, v = u[~loops], v[~loops]
+        self.edges += len(u)
+        cu = self.colors[u]
+        same = (cu == self.colors[v]) & (cu >= 0)
+        k = int(same.sum())
+        if k:
+            self.conflicts += k
+            room = self.max_examples - len(self.examples)
+            if room > 0:
+                hit = np.flatnonzero(same)[:room]
+                self.examples.extend((int(a), int(b), int(c)) for a, b, c in zip(u[hit], v[hit], cu[hit]))
+
+    def finish(self, Delta, plus_one, lists, t0, node_ids=None):
+        colors = self.colors
+        used = np.unique(colors[colors >= 0])
+        num_colors = len(used)
+        bound = None if Delta is None else Delta + (1 if plus_one else 0)
+        list_violations, list_examples = 0, []
+        if lists is not None:
+            list_violations, list_examples = check_lists(colors, lists, self.max_examples)
+        uncolored = int((colors < 0).sum())
+        examples = self.examples
+        if node_ids is not None:
+            # 流式校验时样例用原始 ID 报告，便于回到边表里查找
+            examples = [(int(node_ids[a]), int(node_ids[b]), c) for a, b, c in examples]
+        within_bound = None if bound is None else bool(num_colors <= bound and (used < bound).all())
+        return {
+            'valid': self.conflicts == 0 and uncolored == 0 and list_violations == 0
+                     and within_bound is not False,
+            'n': len(colors),
+            'edges_checked': self.edges,
+            'self_loops': self.self_loops,
+            'conflicts': self.conflicts,
+            'conflict_examples': examples,
+            'uncolored': uncolored,
+            'num_colors': num_colors,
+            'max_color': int(used[-1]) if num_colors else -1,
+            'Delta': Delta,
+            'bound': bound,
+            'within_bound': within_bound,
+            'list_violations': list_violations,
+            'list_examples': list_examples,
+            'elapsed_ms': (time.perf_counter() - t0) * 1000.0,
+        }
+
+
+def _as_colors(colors, n):
+    colors = np.asarray(colors, dtype=np.int64)
+    if colors.ndim != 1 or len(colors) != n:
+        raise ValueError(f"colors 长度 {len(colors)} 与顶点数 {n} 不一致")
+    return colors
+
+
+def _iter_csr_chunks(graph, chunk_edges):
+    """按顶点区间切块产出 (src, dst)，每条无向边只产出 src < dst 的一次"""
+    n = graph.num_nodes
+    indptr = np.asarray(graph.indptr)
+    start = 0
+    while start < n:
+        stop = int(np.searchsorted(indptr, indptr[start] + chunk_edges, side='right')) - 1
+        stop = min(max(stop, start + 1), n)
+        lo, hi = int(indptr[start]), int(indptr[stop])
+        src = np.repeat(np.arange(start, stop, dtype=np.int64), np.diff(indptr[start:stop + 1]))
+        dst = np.asarray(graph.indices[lo:hi], dtype=np.int64)
+        keep = src < dst
+        yield src[keep], dst[keep]
+        start = stop
+
+
+def verify_coloring(adj, colors, plus_one=False, lists=None, chunk_edges=CHUNK_EDGES,
+                    max_examples=MAX_EXAMPLES):
+    """
+    校验内存中的图的着色。
+    - adj: CSRGraph 或 list-of-lists
+    - plus_one: 颜色数上界取 Δ+1（默认 Δ，即 Δ-list-coloring 的目标）
+    - lists: 可选，每个顶点的可用颜色列表（或 (ptr, idx)、BitsetPalettes），检查列表成员约束
+    返回报告 dict，report['valid'] 为总判定
+    """
+    t0 = time.perf_counter()
+    graph = as_csr(adj)
+    report = _Report(_as_colors(colors, graph.num_nodes), max_examples)
+    for src, dst in _iter_csr_chunks(graph, chunk_edges):
+        report.add(src, dst)
+    return report.finish(graph.max_degree(), plus_one, lists, t0)
+
+
+def _id_mapper(node_ids, n):
+    """
+    原始 ID 块 → 压缩编号（未知 ID 为 -1）。
+    - node_ids 为 None：原始 ID 即顶点编号
+    - 否则按 load_edge_list / 图缓存给出的升序 node_ids 二分查找；超长 ID（字节串 / object）转成 Python int 比较
+    """
+    if node_ids is None:
+        def identity(raw):
+            raw = np.asarray(raw, dtype=np.int64)
+            return np.where((raw >= 0) & (raw < n), raw, -1)
+        return identity, None
+
+    node_ids = np.asarray(node_ids)
+    if node_ids.dtype.kind in 'SUO':
+        node_ids = np.array([int(x) for x in node_ids], dtype=object)
+    if len(node_ids) != n:
+        raise ValueError(f"node_ids 长度 {len(node_ids)} 与顶点数 {n} 不一致")
+
+    def lookup(raw):
+        if raw.dtype.kind == 'S' or node_ids.dtype == object:
+            raw = np.array([int(x) for x in raw], dtype=object)
+        loc = np.searchsorted(node_ids, raw)
+        loc[loc == n] = 0
+        return np.where(node_ids[loc] == raw, loc, -1).astype(np.int64)
+    return lookup, node_ids
+
+
+def verify_edge_file(path, colors, node_ids=None, Delta=None, plus_one=False, lists=None,
+                     chunk_bytes=CHUNK_BYTES, max_examples=MAX_EXAMPLES):
+    """
+    流式校验：逐块读取原始边表，不构建 CSR，内存为 O(n + chunk)。
+    - colors: 压缩编号下的颜色数组（run_* 的结果）
+    - node_ids: 压缩编号 → 原始 ID（load_edge_list / 图缓存的 node_ids）；None 表示原始 ID 就是编号
+    - Delta: 已知的最大度数；流式读取无法对重复边去重，因此不自行计算，None 时跳过上界检查
+    边表中的重复边会被重复计数（conflicts 按出现次数），自环跳过并计入 self_loops；
+    边表中出现而 node_ids 中没有的 ID 会抛出 ValueError。
+    """
+    t0 = time.perf_counter()
+    colors = np.asarray(colors, dtype=np.int64)
+    to_index, original = _id_mapper(node_ids, len(colors))
+    report = _Report(colors, max_examples)
+    for src, dst in iter_edge_chunks(path, chunk_bytes):
+        u, v = to_index(src), to_index(dst)
+        if (u < 0).any() or (v < 0).any():
+            raise ValueError(f"{path} 中的顶点 ID 超出着色范围")
+        report.add(u, v)
+    return report.finish(Delta, plus_one, lists, t0, original)
+
+
+def _load_array(path):
+    return np.load(path, allow_pickle=True) if path.endswith('.npy') else np.loadtxt(path, dtype=np.int64, ndmin=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("edges", help="原始边表（.txt / .gz）")
+    parser.add_argument("colors", help="颜色数组：.npy 或每行一个整数的文本")
+    parser.add_argument("--node-ids", default=None, help="压缩编号 → 原始 ID（.npy，例如 <dataset>.csrcache/node_ids.npy）")
+    parser.add_argument("--delta", type=int, default=None, help="最大度数 Δ，给出时检查颜色数上界")
+    parser.add_argument("--plus-one", action="store_true", help="上界取 Δ+1")
+    args = parser.parse_args(argv)
+
+    node_ids = _load_array(args.node_ids) if args.node_ids else None
+    report = verify_edge_file(args.edges, _load_array(args.colors), node_ids=node_ids,
+                              Delta=args.delta, plus_one=args.plus_one)
+    for key, value in report.items():
+        print(f"{key:>18}: {value}")
+    raise SystemExit(0 if report['valid'] else 1)
+
+
+if __name__ == "__main__":
+    main()
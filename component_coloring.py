@@ -0,0 +1,197 @@
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+
+from csr_graph import as_csr, connected_components, gather_segments
+from is_brooks_graph import BROOKS, KIND_NAMES, KIND_REASONS, classify_components
+from shared_graph import attach_arrays, graph_from_arrays, share_graph
+from Δ_1_coloring_Algorithm import run_delta_plus_one_coloring
+from Δ_list_coloring_Algorithm import delta_list_coloring
+
+SMALL_COMPONENT = 4096   # 顶点数低于此值的分量在主进程内合并批量处理，不值得一次进程间往返
+
+_worker = {}   # worker 端 attach 到的共享数组
+
+
+def color_component(sub, kind=None):
+    """
+    给一个连通分量着色，Δ 取本分量自己的最大度数。
+    - Brooks 分量：Δ-list-coloring
+    - 非 Brooks 分量（完全图、奇圈）：Δ 色不可能，退回按顶点顺序的 (Δ+1) 首次适配
+    - kind: classify_components 给出的分量类型；None 时对 sub 单独判定
+    返回 (colors, stats)；colors 为局部编号下的颜色数组，-1 表示未能着色
+    """
+    t0 = time.perf_counter()
+    Delta = sub.max_degree()
+    if kind is None:
+        kind = int(classify_components(sub, (1, np.zeros(sub.num_nodes, dtype=np.int64)))['kind'][0])
+    is_brooks, reason = kind == BROOKS, KIND_REASONS[kind]
+    t1 = time.perf_counter()
+    if is_brooks:
+        method = 'delta_list'
+        colors = delta_list_coloring(sub)
+    else:
+        method = 'delta_plus_one'
+        colors = run_delta_plus_one_coloring(sub, randomize_order=False)['colors']
+    t2 = time.perf_counter()
+    colors = np.asarray(colors, dtype=np.int32)
+    return colors, {
+        'n': sub.num_nodes,
+        'm': sub.num_edges,
+        'Delta': Delta,
+        'is_brooks': is_brooks,
+        'kind': KIND_NAMES[kind],
+        'reason': reason,
+        'method': method,
+        'num_colors': len(np.unique(colors[colors >= 0])),
+        'uncolored': int((colors < 0).sum()),
+        'brooks_ms': (t1 - t0) * 1000.0,
+        'elapsed_ms': (t2 - t1) * 1000.0,
+    }
+
+
+def _color_small(adj, comps, comp_ptr, comp_order, classes, colors, stats):
+    """
+    小分量批量着色：按方法分组，每组只取一次导出子图（即这些分量的不相交并）、调用一次着色，
+    结果直接写入 colors（全局）与 stats（分量编号 → 统计）。
+    - 非 Brooks 分量按顶点顺序首次适配，各分量互不影响，全部并在一起
+    - Δ-list-coloring 的颜色数取并图的 Δ，Brooks 分量只和 Δ 相同的分量合并
+    每个分量的 elapsed_ms 为所在批次的耗时按顶点数分摊，brooks_ms 为 0（分类已在全图上一次完成）
+    """
+    kind = classes['kind'][comps]
+    Delta = classes['Delta'][comps]
+    brooks = kind == BROOKS
+    groups = [('delta_plus_one', comps[~brooks])]
+    groups += [('delta_list', comps[brooks & (Delta == d)]) for d in np.unique(Delta[brooks]).tolist()]
+    labels, sizes = classes['labels'], classes['size']
+    k = len(sizes)
+    for method, group in groups:
+        if not len(group):
+            continue
+        t0 = time.perf_counter()
+        _, members = gather_segments(comp_ptr, comp_order, group)
+        sub, vs = adj.induced_subgraph(members)
+        if method == 'delta_list':
+            local = delta_list_coloring(sub)
+        else:
+            local = run_delta_plus_one_coloring(sub, randomize_order=False)['colors']
+        local = np.asarray(local, dtype=np.int32)
+        colors[vs] = local
+        ms = (time.perf_counter() - t0) * 1000.0
+
+        # 各分量的颜色数：(分量, 颜色) 去重后按分量计数
+        comp = labels[vs]
+        ok = local >= 0
+        width = int(local.max()) + 1 if ok.any() else 1
+        pairs = np.unique(comp[ok] * width + local[ok])
+        num_colors = np.bincount(pairs // width, minlength=k)
+        uncolored = np.bincount(comp[~ok], minlength=k)
+        share = ms / len(vs)
+        for c in group.tolist():
+            kc = int(classes['kind'][c])
+            stats[c] = {
+                'n': int(sizes[c]),
+                'm': int(classes['edges'][c]),
+                'Delta': int(classes['Delta'][c]),
+                'is_brooks': kc == BROOKS,
+                'kind': KIND_NAMES[kc],
+                'reason': KIND_REASONS[kc],
+                'method': method,
+                'num_colors': int(num_colors[c]),
+                'uncolored': int(uncolored[c]),
+                'brooks_ms': 0.0,
+                'elapsed_ms': share * int(sizes[c]),
+                'component': c,
+            }
+
+
+def _component(arrays, c):
+    ptr = arrays['comp_ptr']
+    vs = arrays['comp_order'][ptr[c]:ptr[c + 1]]
+    sub, vs = graph_from_arrays(arrays).induced_subgraph(vs)
+    colors, stats = color_component(sub, int(arrays['comp_kind'][c]))
+    return c, vs, colors, stats
+
+
+def _init_worker(spec):
+    arrays, handles = attach_arrays(spec)
+    _worker['arrays'] = arrays
+    _worker['handles'] = handles
+
+
+def _pool_component(c):
+    return _component(_worker['arrays'], c)
+
+
+def run_component_coloring(adj, processes=None, small_component=SMALL_COMPONENT):
+    """
+    按连通分量分别做 Brooks 判定与 Δ-list-coloring，每个分量使用自己的 Δ。
+    - processes: 大分量使用的 worker 数，默认 os.cpu_count()；大分量不足两个时全部在主进程内完成
+    - small_component: 顶点数低于此值的分量在主进程内合并成几张不相交并图批量着色（_color_small，与进程池中的大分量重叠执行）
+    - 孤立顶点统一着色为 0，不单独出现在 component_stats 中
+    worker 通过共享内存 attach 整图与分量划分，自己抽取导出子图，只回传颜色与统计。
+    返回 colors（全局颜色数组）/ num_colors / elapsed_ms / components / isolated / processes /
+    component_stats（每个非孤立分量一项，按分量编号排序）。
+    """
+    adj = as_csr(adj)
+    n = len(adj)
+    processes = processes or os.cpu_count() or 1
+
+    t0 = time.perf_counter()
+    num_components, labels = connected_components(adj)
+    # 一次性对全部分量做 Brooks 分类，worker 里不再逐分量判定
+    classes = classify_components(adj, (num_components, labels))
+    sizes = classes['size']
+    comp_ptr = np.zeros(num_components + 1, dtype=np.int64)
+    np.cumsum(sizes, out=comp_ptr[1:])
+    comp_order = np.argsort(labels, kind='stable')
+
+    colors = np.full(n, -1, dtype=np.int32)
+    isolated = adj.degree == 0
+    colors[isolated] = 0
+    multi = np.flatnonzero(sizes > 1)
+    large = multi[sizes[multi] >= small_component]
+    small = multi[sizes[multi] < small_component]
+    # 大分量从大到小提交，尽量让最长的任务最先开始
+    large = large[np.argsort(-sizes[large], kind='stable')]
+    use_pool = processes > 1 and len(large) > 1
+
+    arrays = {'indptr': adj.indptr, 'indices': adj.indices, 'degree': adj.degree,
+              'comp_ptr': comp_ptr, 'comp_order': comp_order, 'comp_kind': classes['kind']}
+    stats = {}
+
+    def merge(result):
+        c, vs, local, row = result
+        colors[vs] = local
+        row['component'] = int(c)
+        stats[int(c)] = row
+
+    if use_pool:
+        shared = share_graph(adj, comp_ptr=comp_ptr, comp_order=comp_order, comp_kind=classes['kind'])
+        pool = mp.Pool(min(processes, len(large)), initializer=_init_worker, initargs=(shared.spec,))
+        try:
+            pending = pool.imap_unordered(_pool_component, large.tolist())
+            _color_small(adj, small, comp_ptr, comp_order, classes, colors, stats)
+            for result in pending:
+                merge(result)
+        finally:
+            pool.close()
+            pool.join()
+            shared.close()
+    else:
+        for c in large.tolist():
+            merge(_component(arrays, c))
+        _color_small(adj, small, comp_ptr, comp_order, classes, colors, stats)
+    t1 = time.perf_counter()
+
+    return {
+        'colors': colors,
+        'num_colors': len(np.unique(colors)) if n else 0,
+        'elapsed_ms': (t1 - t0) * 1000.0,
+        'components': num_components,
+        'isolated': int(isolated.sum()),
+        'processes': processes if use_pool else 1,
+        'component_stats': [stats[c] for c in sorted(stats)],
+    }
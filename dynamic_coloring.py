@@ -0,0 +1,285 @@
+import time
+
+import numpy as np
+
+from csr_graph import CSRGraph, as_csr
+from first_fit import FirstFit
+
+KEMPE_CHAIN_LIMIT = 4096   # 单条 Kempe 链最多访问的顶点数，超过即放弃这对颜色，保持修复是局部的
+
+
+class DynamicColoring:
+    """
+    支持批量插入 / 删除边与顶点的增量着色，不再每次改动都重建 adj_list 并从头运行。
+    - 由已有的 colors 数组（例如 run_delta_list_coloring 的结果）初始化；-1 视为待修复
+    - 每批更新后只修复冲突邻域：冲突边的一端被取消着色，按 complete_coloring 的首次适配重新取色
+    - 取色优先落在 Δ 色以内；Δ 色全被邻居占用时，先尝试把某个邻居挪到它的另一个空闲色（一步交换），
+      再尝试 Kempe 链交换（_kempe_into），仍不行才使用第 Δ+1 种颜色
+    - 每批修复的最后，用了第 Δ+1 种颜色的顶点再按同样的步骤尝试回到 Δ 色以内（邻域变化后可能有空位）
+    - Δ 随更新变化：删除导致 Δ 下降时，颜色超出新色域的顶点同样进入修复队列
+    保证：始终合法且不超过 Δ+1 色。即使图满足 Brooks 条件也不保证回到 Δ 色：Brooks 定理的构造需要全局重排，
+    这里只做局部交换，失败时保留第 Δ+1 种颜色（batch_stats 的 extra_color / num_colors 可见）；
+    需要 Δ 色时对 to_csr() 重新运行 delta_list_coloring。
+    顶点编号在删除后不复用，被删除的顶点颜色为 -1。
+    """
+
+    def __init__(self, adj, colors):
+        adj = as_csr(adj)
+        n = len(adj)
+        if len(colors) != n:
+            raise ValueError(f"colors 长度 {len(colors)} 与顶点数 {n} 不一致")
+        self.adj = [set(adj[v]) for v in range(n)]
+        self.alive = [True] * n
+        self.colors = [int(c) for c in colors]
+        self.degree_count = np.bincount(adj.degree, minlength=2).tolist()
+        self.Delta = adj.max_degree()
+        self.color_count = []
+        self._high = set()    # 可能用了第 Δ+1 种颜色的顶点（可能过时，修复时按当前 Δ 过滤）
+        for c in self.colors:
+            if c >= 0:
+                self._count_color(c, 1)
+        self.batch_stats = []
+
+        dirty = [v for v in range(n) if self.colors[v] < 0]
+        for v in range(n):
+            for u in self.adj[v]:
+                if u > v and self.colors[u] == self.colors[v] >= 0:
+                    self._uncolor(u)
+                    dirty.append(u)
+        self._repair(dirty)
+
+    # ------------------------------------------------------------
+    # 计数维护
+    # ------------------------------------------------------------
+    def _count_color(self, c, delta):
+        while len(self.color_count) <= c:
+            self.color_count.append(0)
+        self.color_count[c] += delta
+
+    def _uncolor(self, v):
+        c = self.colors[v]
+        if c >= 0:
+            self.color_count[c] -= 1
+            self.colors[v] = -1
+
+    def _set_color(self, v, c):
+        self._uncolor(v)
+        self.colors[v] = c
+        self._count_color(c, 1)
+        if c >= self.Delta:
+            self._high.add(v)
+
+    def _move_degree(self, d, delta):
+        """顶点度数从 d 变为 d + delta，同步维护度数直方图与 Δ"""
+        self.degree_count[d] -= 1
+        d += delta
+        while len(self.degree_count) <= d:
+            self.degree_count.append(0)
+        self.degree_count[d] += 1
+        if d > self.Delta:
+            self.Delta = d
+        while self.Delta > 0 and self.degree_count[self.Delta] == 0:
+            self.Delta -= 1
+
+    # ------------------------------------------------------------
+    # 图更新（只改结构，修复在 apply 的最后统一进行）
+    # ------------------------------------------------------------
+    def _insert_edge(self, u, v):
+        if u == v or not (self.alive[u] and self.alive[v]) or v in self.adj[u]:
+            return None
+        self._move_degree(len(self.adj[u]), 1)
+        self._move_degree(len(self.adj[v]), 1)
+        self.adj[u].add(v)
+        self.adj[v].add(u)
+        if self.colors[u] == self.colors[v] >= 0:
+            # 取消度数较小的一端，重新取色时受约束更少
+            w = u if len(self.adj[u]) <= len(self.adj[v]) else v
+            self._uncolor(w)
+            return w
+        return None
+
+    def _delete_edge(self, u, v):
+        if v not in self.adj[u]:
+            return
+        self._move_degree(len(self.adj[u]), -1)
+        self._move_degree(len(self.adj[v]), -1)
+        self.adj[u].discard(v)
+        self.adj[v].discard(u)
+
+    def _insert_vertex(self):
+        v = len(self.adj)
+        self.adj.append(set())
+        self.alive.append(True)
+        self.colors.append(-1)
+        self.degree_count[0] += 1
+        return v
+
+    def _delete_vertex(self, v):
+        if not self.alive[v]:
+            return
+        for u in list(self.adj[v]):
+            self._delete_edge(u, v)
+        self.degree_count[0] -= 1
+        self.alive[v] = False
+        self._uncolor(v)
+
+    # ------------------------------------------------------------
+    # 修复
+    # ------------------------------------------------------------
+    def _swap_into(self, v):
+        """
+        v 的邻居占满了 Δ 种颜色：找一个邻居 u，它在 Δ 色内还有别的空闲色，
+        把 u 挪过去，v 取 u 原来的颜色。O(deg(v) · (Δ + deg(u)))，成功返回 True。
+        """
+        Delta = self.Delta
+        colors = self.colors
+        for u in self.adj[v]:
+            cu = colors[u]
+            if not 0 <= cu < Delta:
+                continue
+            if any(colors[w] == cu for w in self.adj[v] if w != u):
+                continue
+            # v 尚未着色，不会出现在 u 的邻居颜色中
+            used = {colors[w] for w in self.adj[u]}
+            for c in range(Delta):
+                if c != cu and c not in used:
+                    self._set_color(u, c)
+                    self._set_color(v, cu)
+                    return True
+        return False
+
+    def _kempe_into(self, v):
+        """
+        v 的邻居占满了 Δ 种颜色、一步交换也不行：对颜色对 (a, b)，把 v 的 a 色邻居所在的 (a, b) Kempe 链整体互换，
+        只要链中不含 v 的 b 色邻居，交换后 v 的邻居里就没有 a 色，v 取 a。
+        a 按 v 的同色邻居数从少到多尝试；链超过 KEMPE_CHAIN_LIMIT 个顶点时跳过该颜色对。成功返回 True
+        """
+        Delta = self.Delta
+        colors = self.colors
+        by_color = {}
+        for u in self.adj[v]:
+            if 0 <= colors[u] < Delta:
+                by_color.setdefault(colors[u], []).append(u)
+        for a in sorted(by_color, key=lambda c: len(by_color[c])):
+            for b in range(Delta):
+                if b == a:
+                    continue
+                chain = self._chain(by_color[a], a, b)
+                if chain is None or any(u in chain for u in by_color.get(b, ())):
+                    continue
+                for u in chain:
+                    self._set_color(u, b if colors[u] == a else a)
+                self._set_color(v, a)
+                return True
+        return False
+
+    def _chain(self, seeds, a, b):
+        """seeds 出发、只经过 a / b 色顶点的 Kempe 链（顶点集合）；超过 KEMPE_CHAIN_LIMIT 返回 None"""
+        colors = self.colors
+        seen = set(seeds)
+        stack = list(seeds)
+        while stack:
+            x = stack.pop()
+            for w in self.adj[x]:
+                if w not in seen and (colors[w] == a or colors[w] == b):
+                    seen.add(w)
+                    if len(seen) > KEMPE_CHAIN_LIMIT:
+                        return None
+                    stack.append(w)
+        return seen
+
+    def _recolor(self, v, ff):
+        """给未着色的 v 取色：Δ 色内首次适配 → 一步交换 → Kempe 链 → 第 Δ+1 种颜色。用了第 Δ+1 种颜色时返回 True"""
+        c = ff.smallest(self.adj[v], self.colors)
+        if c < self.Delta:
+            self._set_color(v, c)
+            return False
+        if self._swap_into(v) or self._kempe_into(v):
+            return False
+        # Δ+1 色总有空位：邻居至多 Δ 个
+        self._set_color(v, c)
+        return True
+
+    def _repair(self, dirty):
+        Delta = self.Delta
+        # 色域缩小后，颜色 ≥ Δ+1 的顶点同样需要重新取色
+        if len(self.color_count) > Delta + 1 and any(self.color_count[Delta + 1:]):
+            for v, c in enumerate(self.colors):
+                if c > Delta:
+                    self._uncolor(v)
+                    dirty.append(v)
+
+        ff = FirstFit(Delta + 1)
+        recolored = 0
+        for v in dirty:
+            if not self.alive[v] or self.colors[v] >= 0:
+                continue
+            self._recolor(v, ff)
+            recolored += 1
+
+        # 用了第 Δ+1 种颜色的顶点再试一次回到 Δ 色以内；_high 可能漏掉 Δ 下降后恰好落在色 Δ 的顶点，此时整遍扫描
+        high = [v for v in self._high if self.colors[v] >= Delta]
+        if len(high) < sum(self.color_count[Delta:]):
+            high = [v for v, c in enumerate(self.colors) if c >= Delta]
+        self._high = set()
+        for v in high:
+            self._uncolor(v)
+            if not self._recolor(v, ff):
+                recolored += 1
+        return recolored, sum(self.color_count[Delta:])
+
+    # ------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------
+    def apply(self, insert_edges=(), delete_edges=(), insert_vertices=(), delete_vertices=()):
+        """
+        应用一批更新并修复着色，返回本批统计（同时追加到 self.batch_stats）。
+        - insert_edges / delete_edges: (u, v) 对的可迭代对象
+        - insert_vertices: 每个新顶点的邻居列表；新顶点依次编号为当前顶点数、+1、…
+        - delete_vertices: 要删除的顶点（连同关联边）
+        顺序：删除顶点 → 删除边 → 插入顶点 → 插入边 → 修复。
+        """
+        t0 = time.perf_counter()
+        for v in delete_vertices:
+            self._delete_vertex(v)
+        for u, v in delete_edges:
+            self._delete_edge(u, v)
+        dirty = []
+        new_vertices = []
+        for neighbors in insert_vertices:
+            v = self._insert_vertex()
+            new_vertices.append(v)
+            dirty.append(v)
+            for u in neighbors:
+                self._insert_edge(v, u)
+        conflicts = 0
+        for u, v in insert_edges:
+            w = self._insert_edge(u, v)
+            if w is not None:
+                conflicts += 1
+                dirty.append(w)
+        recolored, extra = self._repair(dirty)
+        t1 = time.perf_counter()
+
+        stats = {
+            'latency_ms': (t1 - t0) * 1000.0,
+            'conflicts': conflicts,
+            'recolored': recolored,
+            'extra_color': extra,
+            'new_vertices': new_vertices,
+            'Delta': self.Delta,
+            'num_colors': self.num_colors,
+        }
+        self.batch_stats.append(stats)
+        return stats
+
+    @property
+    def num_colors(self):
+        return sum(1 for k in self.color_count if k > 0)
+
+    def colors_array(self):
+        return np.asarray(self.colors, dtype=np.int32)
+
+    def to_csr(self):
+        """当前图的 CSR 快照（被删除的顶点保留为孤立顶点）"""
+        return CSRGraph.from_adj_list([sorted(nbrs) for nbrs in self.adj])
@@ -0,0 +1,115 @@
+import csv
+import os
+import platform
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+try:
+    # Python 3.9+
+    from zoneinfo import ZoneInfo
+    TZ_LONDON = ZoneInfo("Europe/London")
+except Exception:
+    TZ_LONDON = None
+try:
+    import fcntl
+except ImportError:
+    # Windows 没有 fcntl：不加锁，同一 CSV 的并发写入需由调用方避免
+    fcntl = None
+
+
+def env_info():
+    now = datetime.now(TZ_LONDON) if TZ_LONDON else datetime.now()
+    return {
+        "date_time": now.isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def _read_header(path):
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+@contextmanager
+def csv_lock(path):
+    """
+    独占锁（flock）串行化对同一 CSV 的迁移、追加与整文件重写，锁在旁路文件 <path>.lock 上：
+    重写用 os.replace 换掉了 CSV 的 inode，锁在 CSV 本身上的等待者拿到锁时已经是旧文件
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _rewrite_csv(path, header, rows):
+    """写到同目录下独占的临时文件再 os.replace，读者只会看到完整的旧文件或新文件"""
+    directory, name = os.path.split(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, prefix=name + ".", suffix=".tmp",
+                                     newline="", encoding="utf-8", delete=False) as f:
+        tmp = f.name
+        try:
+            writer = csv.DictWriter(f, fieldnames=header, restval="", extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        except BaseException:
+            f.close()
+            os.unlink(tmp)
+            raise
+    os.replace(tmp, path)
+
+
+def write_csv(path, header, rows):
+    """整文件重写（加锁 + 原子替换）；行中没有的列留空，header 之外的键忽略"""
+    with csv_lock(path):
+        _rewrite_csv(path, header, rows)
+
+
+def _migrate_header(path, header):
+    """
+    已有 CSV 的表头缺少新列时，按"旧列 + 新列"重写一次文件（旧行的新列留空）。
+    调用方须持有 csv_lock(path)。返回迁移后的完整表头。
+    """
+    old = _read_header(path)
+    merged = old + [col for col in header if col not in old]
+    if merged == old:
+        return old
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    _rewrite_csv(path, merged, rows)
+    return merged
+
+
+def append_csv_rows(path, header, rows):
+    """
+    在同一把锁内追加多行：文件不存在时写表头，表头新增列时先迁移旧文件。
+    并发运行的行不会交错，迁移也不会覆盖别人刚追加的行
+    """
+    with csv_lock(path):
+        file_exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if file_exists:
+            header = _migrate_header(path, header)
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=header, restval="")
+            if not file_exists:
+                writer.writeheader()
+            writer.writerows(rows)
+
+
+def append_csv(path, header, rowdict):
+    """追加一行；文件不存在时写表头，表头新增列时自动迁移旧文件"""
+    append_csv_rows(path, header, [rowdict])
+
+
+def fmt_ms(value):
+    """毫秒数统一保留 3 位小数；None 记为空"""
+    return "" if value is None else f"{value:.3f}"
@@ -0,0 +1,193 @@
+import numpy as np
+
+
+class FirstFit:
+    """
+    O(deg(v)) 的首次适配取色核，所有贪心着色共用。
+    - 用带时间戳的标记数组记录邻居已用颜色：每个顶点只需 stamp += 1，不必清空数组
+    - palette: 色域大小，颜色取值 [0, palette)；返回 palette 表示色域内没有可用颜色
+    """
+
+    __slots__ = ('mark', 'stamp', 'palette')
+
+    def __init__(self, palette):
+        self.palette = palette
+        self.mark = [0] * palette
+        self.stamp = 0
+
+    def _mark_used(self, neighbors, colors):
+        self.stamp += 1
+        stamp = self.stamp
+        mark = self.mark
+        palette = self.palette
+        for u in neighbors:
+            c = colors[u]
+            if 0 <= c < palette:
+                mark[c] = stamp
+        return stamp
+
+    def smallest(self, neighbors, colors):
+        """最小可用颜色；最多扫描 deg(v) + 1 个位置"""
+        stamp = self._mark_used(neighbors, colors)
+        mark = self.mark
+        c = 0
+        while c < self.palette and mark[c] == stamp:
+            c += 1
+        return c
+
+    def random_free(self, neighbors, colors, rng):
+        """
+        在色域内均匀随机选一个可用颜色，不构造候选列表：
+        取第 r 个空位，r ~ randrange(空位数)，再跳过排好序的已用颜色，O(deg log deg)。
+        与 rng.choice(available) 消耗相同的随机数，结果一致。
+        """
+        stamp = self.stamp + 1
+        self.stamp = stamp
+        mark = self.mark
+        palette = self.palette
+        used = []
+        for u in neighbors:
+            c = colors[u]
+            if 0 <= c < palette and mark[c] != stamp:
+                mark[c] = stamp
+                used.append(c)
+        free = palette - len(used)
+        if free <= 0:
+            return palette
+        r = rng.randrange(free)
+        used.sort()
+        for c in used:
+            if c > r:
+                break
+            r += 1
+        return r
+
+
+def batch_smallest(counts, nbr_colors):
+    """
+    向量化的首次适配（供 NumPy 着色引擎使用）。
+    - counts[i]: 第 i 个待着色顶点的邻居数；nbr_colors 按顶点依次拼接这些邻居的颜色（-1 为未着色）
+    返回每个顶点的最小可用颜色（邻居颜色集合的 mex）。
+    做法：(顶点, 颜色) 打包成整数键排序去重；同一顶点的第 j 个不同颜色若不等于 j，mex 即为 j。
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    k = len(counts)
+    owner = np.repeat(np.arange(k, dtype=np.int64), counts)
+    nbr_colors = np.asarray(nbr_colors, dtype=np.int64)
+    # 大于邻居数的颜色不可能影响 mex
+    keep = (nbr_colors >= 0) & (nbr_colors <= counts[owner])
+    owner, c = owner[keep], nbr_colors[keep]
+    mex = np.zeros(k, dtype=np.int64)
+    if len(c) == 0:
+        return mex
+    base = int(c.max()) + 1
+    key = owner * base + c
+    key.sort()
+    distinct = np.empty(len(key), dtype=bool)
+    distinct[0] = True
+    np.not_equal(key[1:], key[:-1], out=distinct[1:])
+    key = key[distinct]
+    owner, c = key // base, key % base
+    size = np.bincount(owner, minlength=k)
+    starts = np.zeros(k, dtype=np.int64)
+    np.cumsum(size[:-1], out=starts[1:])
+    pos = np.arange(len(key)) - starts[owner]
+    mex[:] = size
+    gap = c != pos
+    gown, gpos = owner[gap], pos[gap]
+    if len(gown):
+        first = np.empty(len(gown), dtype=bool)
+        first[0] = True
+        np.not_equal(gown[1:], gown[:-1], out=first[1:])
+        mex[gown[first]] = gpos[first]
+    return mex
+
+
+def palette_arrays(lists):
+    """每个顶点的颜色列表（可迭代对象的序列）→ CSR 形式 (ptr, idx)；也接受已经是 (ptr, idx) 的二元组"""
+    if isinstance(lists, tuple) and len(lists) == 2:
+        return np.asarray(lists[0], dtype=np.int64), np.asarray(lists[1], dtype=np.int64)
+    lengths = np.fromiter((len(c) for c in lists), dtype=np.int64, count=len(lists))
+    ptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=ptr[1:])
+    idx = np.fromiter((c for cs in lists for c in cs), dtype=np.int64, count=int(ptr[-1]))
+    return ptr, idx
+
+
+class BitsetPalettes:
+    """
+    列表着色用的逐顶点可用颜色集合，按位压缩成 (n, W) 的 uint64 矩阵，W = ⌈颜色总数 / 64⌉。
+    - first_free 只做字级别的位运算：邻居颜色按 c >> 6 归入各字的掩码，palette & ~used 后取最低位，
+      每个顶点 O(deg(v) + W)；Δ 上千时 W 也只有几十个字
+    - size[v] 为 v 的列表大小（去重后）
+    - 内存为 n · W · 8 字节；颜色编号很大而列表很短时，改用 palette_arrays 的 CSR 形式保存更省
+    """
+
+    __slots__ = ('words', 'size', 'num_colors')
+
+    def __init__(self, words, size, num_colors):
+        self.words = words
+        self.size = size
+        self.num_colors = num_colors
+
+    @classmethod
+    def from_lists(cls, lists):
+        """lists: 每个顶点的颜色列表，或 CSR 形式的 (ptr, idx)；颜色为非负整数"""
+        ptr, idx = palette_arrays(lists)
+        n = len(ptr) - 1
+        if len(idx) and idx.min() < 0:
+            raise ValueError("颜色列表中不能有负数颜色")
+        num_colors = int(idx.max()) + 1 if len(idx) else 0
+        width = max(1, (num_colors + 63) >> 6)
+        words = np.zeros((n, width), dtype=np.uint64)
+        # (顶点, 颜色) 排序去重后，同一个字的各位互不相同，按字分段 OR 一次写入
+        owner = np.repeat(np.arange(n, dtype=np.int64), np.diff(ptr))
+        keys = owner * max(num_colors, 1) + idx
+        keys.sort()
+        if len(keys):
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        owner, idx = keys // max(num_colors, 1), keys % max(num_colors, 1)
+        slot = owner * width + (idx >> 6)
+        if len(slot):
+            starts = np.flatnonzero(np.concatenate(([True], slot[1:] != slot[:-1])))
+            bits = np.left_shift(np.uint64(1), (idx & 63).astype(np.uint64))
+            words.ravel()[slot[starts]] = np.bitwise_or.reduceat(bits, starts)
+        size = np.bincount(owner, minlength=n)
+        return cls(words, size, num_colors)
+
+    def __len__(self):
+        return len(self.words)
+
+    def allows(self, vs, cs):
+        """向量化的成员判断：cs[i] 是否在 vs[i] 的列表里"""
+        vs = np.asarray(vs, dtype=np.int64)
+        cs = np.asarray(cs, dtype=np.int64)
+        inside = (cs >= 0) & (cs < self.num_colors)
+        ok = np.zeros(len(vs), dtype=bool)
+        v, c = vs[inside], cs[inside]
+        bits = self.words[v, c >> 6] >> (c & 63).astype(np.uint64)
+        ok[inside] = (bits & np.uint64(1)).astype(bool)
+        return ok
+
+    def colors(self, v):
+        """v 的可用颜色（升序）"""
+        bits = np.unpackbits(self.words[v].view(np.uint8), bitorder='little')
+        return np.flatnonzero(bits).tolist()
+
+    def mask(self, v):
+        """v 的列表转成 Python 整数位掩码（第 c 位为颜色 c），供逐顶点的集合运算"""
+        return sum(w << (i << 6) for i, w in enumerate(self.words[v].tolist()))
+
+    def first_free(self, v, neighbors, colors):
+        """v 的列表中最小的、未被任何邻居占用的颜色；没有时返回 -1"""
+        used = {}
+        for u in neighbors:
+            c = colors[u]
+            if c >= 0:
+                w = c >> 6
+                used[w] = used.get(w, 0) | (1 << (c & 63))
+        for w, bits in enumerate(self.words[v].tolist()):
+            free = bits & ~used.get(w, 0)
+            if free:
+                return (w << 6) | ((free & -free).bit_length() - 1)
+        return -1
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from graph_loader import load_edge_list
+from instrumentation import peak_rss_mb
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = '.csrcache'
+_ARRAYS = ('indptr', 'indices', 'degree', 'node_ids')
+
+
+def file_sha256(path, block=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for data in iter(lambda: f.read(block), b''):
+            h.update(data)
+    return h.hexdigest()
+
+
+def cache_dir_for(path):
+    """缓存目录放在数据集旁边，例如 facebook_combined.txt.csrcache/"""
+    return path + CACHE_SUFFIX
+
+
+def _source_key(path):
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(cache_dir, meta):
+    # meta.json 最后写入并原子替换，作为缓存完整的标志
+    tmp = os.path.join(cache_dir, 'meta.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(cache_dir, 'meta.json'))
+
+
+def cache_is_valid(path, cache_dir):
+    """
+    校验缓存是否对应当前源文件。
+    - size + mtime 一致：直接命中，不读源文件
+    - 仅 size 一致（例如文件被复制 / touch 过）：比较内容哈希，一致则刷新 mtime 后命中
+    """
+    meta = _read_meta(cache_dir)
+    if meta is None or meta.get('version') != CACHE_VERSION:
+        return False
+    key = _source_key(path)
+    if meta['size'] != key['size']:
+        return False
+    if meta['mtime_ns'] == key['mtime_ns']:
+        return True
+    if file_sha256(path) != meta['sha256']:
+        return False
+    meta['mtime_ns'] = key['mtime_ns']
+    _write_meta(cache_dir, meta)
+    return True
+
+
+def save_graph_cache(path, graph, node_ids, cache_dir=None):
+    """把 CSR 数组与原始 ID 映射写成 .npy 文件，供之后 mmap 读回"""
+    cache_dir = cache_dir or cache_dir_for(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    if node_ids.dtype == object:
+        # 超长 ID（gplus）以定长字节串保存，保证可以 mmap
+        node_ids = np.array([str(x) for x in node_ids], dtype=bytes)
+    arrays = {'indptr': graph.indptr, 'indices': graph.indices, 'degree': graph.degree, 'node_ids': node_ids}
+    for name in _ARRAYS:
+        np.save(os.path.join(cache_dir, name + '.npy'), np.ascontiguousarray(arrays[name]))
+    write_cache_meta(path, cache_dir, graph.num_nodes, graph.num_edges)
+    return cache_dir
+
+
+def write_cache_meta(path, cache_dir, n, m):
+    """数组文件全部写完后调用：记录源文件的 size / mtime / 哈希，缓存从此可以命中"""
+    meta = _source_key(path)
+    meta.update({
+        'version': CACHE_VERSION,
+        'sha256': file_sha256(path),
+        'source': os.path.basename(path),
+        'n': n,
+        'm': m,
+    })
+    _write_meta(cache_dir, meta)
+
+
+def load_graph_cache(cache_dir):
+    """以 mmap 只读方式读回缓存（几乎零拷贝）"""
+    arrays = {name: np.load(os.path.join(cache_dir, name + '.npy'), mmap_mode='r') for name in _ARRAYS}
+    graph = CSRGraph(arrays['indptr'], arrays['indices'], arrays['degree'])
+    return graph, arrays['node_ids']
+
+
+def load_graph_cached(path, cache_dir=None, use_cache=True, **loader_kwargs):
+    """
+    带缓存的图加载：命中时 mmap 读回，未命中时冷加载文本并写缓存。
+    - cache_dir: 缓存目录，默认 <path>.csrcache
+    - use_cache: False 时强制冷加载（仍会刷新缓存）
+    返回 (graph, node_ids, stats)；stats['cache_hit'] 区分命中与冷加载，
+    命中耗时记在 cache_ms，冷加载耗时记在 cold_load_ms（另一个为 None）。
+    """
+    cache_dir = cache_dir or cache_dir_for(path)
+    t0 = time.perf_counter()
+    if use_cache and cache_is_valid(path, cache_dir):
+        graph, node_ids = load_graph_cache(cache_dir)
+        elapsed = (time.perf_counter() - t0) * 1000
+        stats = {
+            'n': graph.num_nodes,
+            'm': graph.num_edges,
+            'cache_hit': True,
+            'cache_ms': elapsed,
+            'cold_load_ms': None,
+            'load_ms': elapsed,
+            'peak_mem_mb': float('nan'),
+            'peak_rss_mb': peak_rss_mb(),
+            'bytes_per_edge': graph.nbytes / max(graph.num_edges, 1),
+        }
+        return graph, node_ids, stats
+
+    graph, node_ids, stats = load_edge_list(path, **loader_kwargs)
+    t1 = time.perf_counter()
+    try:
+        save_graph_cache(path, graph, node_ids, cache_dir)
+    except OSError as e:
+        print(f"Warning: graph cache not written ({e})")
+    stats.update({
+        'cache_hit': False,
+        'cache_ms': None,
+        'cold_load_ms': (t1 - t0) * 1000,
+        'cache_write_ms': (time.perf_counter() - t1) * 1000,
+    })
+    return graph, node_ids, stats
@@ -0,0 +1,146 @@
+"""
+合成图生成器（全部向量化，百万级边数在秒级以内），供基准测试与正确性检查使用。
+所有生成器返回邻居有序的 CSRGraph，顶点编号 0..n-1。
+"""
+import random
+
+import numpy as np
+
+from csr_graph import connected_components
+from graph_loader import edges_to_csr
+
+
+def _simple_graph(u, v, n):
+    """任意端点数组 → 简单无向图：删除自环、规范化为 lo < hi 后交给 edges_to_csr 去重"""
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    keep = u != v
+    u, v = u[keep], v[keep]
+    return edges_to_csr(np.minimum(u, v), np.maximum(u, v), n)
+
+
+def cycle_graph(n):
+    """n 个顶点的圈 C_n（n 为偶数时走偶圈分支，奇数时是非 Brooks 图）"""
+    v = np.arange(n)
+    return _simple_graph(v, (v + 1) % n, n)
+
+
+def random_regular_graph(n, d, seed=None, max_rounds=10000):
+    """
+    随机 d-正则图（配对模型）：n·d 个桩随机配对；自环与重边所在的配对，连同同样数量的随机合法配对，
+    拆开重新配对，直到没有坏配对。坏配对的期望数与 n 无关，百万级边数也只需几轮。
+    分布接近（但不严格是）d-正则简单图上的均匀分布。要求 n·d 为偶数且 d < n
+    """
+    if (n * d) % 2 or not 0 < d < n:
+        raise ValueError(f"不存在 {n} 个顶点的 {d}-正则简单图（要求 n·d 为偶数且 0 < d < n）")
+    if 2 * d > n - 1:
+        # 稠密时配对几乎总会撞上重边：取稀疏的 (n-1-d)-正则补图再求补
+        u, v = np.triu_indices(n, k=1)
+        keep = np.ones(len(u), dtype=bool)
+        if d < n - 1:
+            comp = random_regular_graph(n, n - 1 - d, seed, max_rounds)
+            cu, cv = comp.edge_arrays()
+            # triu_indices 按 (u, v) 字典序排列，(lo, hi) 在其中的下标可直接算出
+            lo, hi = np.minimum(cu, cv).astype(np.int64), np.maximum(cu, cv).astype(np.int64)
+            keep[lo * (2 * n - lo - 1) // 2 + (hi - lo - 1)] = False
+        return _simple_graph(u[keep], v[keep], n)
+    rng = np.random.default_rng(seed)
+    stubs = rng.permutation(np.repeat(np.arange(n, dtype=np.int64), d))
+    u, v = stubs[0::2].copy(), stubs[1::2].copy()
+    for _ in range(max_rounds):
+        key = np.minimum(u, v) * n + np.maximum(u, v)
+        order = np.argsort(key, kind='stable')
+        bad = u == v
+        bad[order[1:]] |= key[order[1:]] == key[order[:-1]]
+        nbad = int(bad.sum())
+        if nbad == 0:
+            return _simple_graph(u, v, n)
+        good = np.flatnonzero(~bad)
+        redo = np.concatenate((np.flatnonzero(bad), rng.choice(good, size=min(nbad, len(good)), replace=False)))
+        stubs = rng.permutation(np.concatenate((u[redo], v[redo])))
+        u[redo], v[redo] = stubs[0::2], stubs[1::2]
+    raise RuntimeError(f"{max_rounds} 轮重新配对后仍有自环或重边（n = {n}, d = {d}）")
+
+
+def random_regular_circulant(n, d, seed):
+    """
+    d-正则循环图（Z_n 上的 Cayley 图）：随机挑选 d // 2 个偏移（d 为奇数时再加 n/2，要求 n 为偶数），再随机重标号。
+    结构是确定的循环图，随机的只有偏移与编号，不是随机正则图（那个见 random_regular_graph）；
+    bench_theta 用它得到与种子无关、稳定可比的正则块
+    """
+    rng = random.Random(seed)
+    offsets = rng.sample(range(1, (n - 1) // 2 + 1), d // 2)
+    if d % 2:
+        offsets.append(n // 2)
+    perm = np.array(rng.sample(range(n), n))
+    v = np.arange(n)
+    src = np.concatenate([v for _ in offsets])
+    dst = np.concatenate([(v + s) % n for s in offsets])
+    return _simple_graph(perm[src], perm[dst], n)
+
+
+def cubic_graph(n, seed):
+    """随机 3-正则图（n 为偶数），见 random_regular_graph"""
+    return random_regular_graph(n, 3, seed)
+
+
+def wheel_graph(n):
+    """轮图 W_n：中心 0 + 长度为 n-1 的外圈 1..n-1"""
+    rim = np.arange(1, n)
+    nxt = np.where(rim == n - 1, 1, rim + 1)
+    return _simple_graph(np.concatenate((np.zeros(n - 1, dtype=np.int64), rim)),
+                         np.concatenate((rim, nxt)), n)
+
+
+def near_complete_graph(n, missing_matching=True):
+    """
+    近完全图。
+    - missing_matching=True：K_n 去掉一个完美匹配（n 为偶数），(n-2)-正则
+    - False：K_n 去掉一条边 (0, n-1)，非正则，走贪心分支
+    """
+    u, v = np.triu_indices(n, k=1)
+    if missing_matching:
+        keep = v - u != n // 2
+    else:
+        keep = ~((u == 0) & (v == n - 1))
+    return _simple_graph(u[keep], v[keep], n)
+
+
+def diamond_chain(k):
+    """
+    3-正则的"菱形链"：k 个菱形（K4 去掉一条边）用桥串成一条链，两端各接一个帽子
+    （K4 细分一条边，细分点通过桥接入链）。
+    每个菱形是一个块，块内 DFS 的返祖边都闭合奇圈，find_even_cycle 在其中找不到偶圈，改用菱形本身的 theta；
+    它与帽子中的 4-圈一样大，帽子先被找到，因此 delta_list_coloring 走偶圈分支。
+    """
+    if k < 1:
+        raise ValueError("diamond_chain 至少需要 1 个菱形")
+    t = np.arange(k, dtype=np.int64)
+    a, b, c, d = 4 * t, 4 * t + 1, 4 * t + 2, 4 * t + 3
+    us = [a, a, b, b, c, d[:-1]]
+    vs = [b, c, c, d, d, a[1:]]
+    # 帽子：p, q, r, s 为 K4 去掉 rs，x 与 r, s 相连，再通过桥接到链端
+    for base, port in ((4 * k, a[0]), (4 * k + 5, d[-1])):
+        p, q, r, s, x = range(base, base + 5)
+        us.append(np.array([p, p, p, q, q, r, s, x]))
+        vs.append(np.array([q, r, s, r, s, x, x, port]))
+    return _simple_graph(np.concatenate(us), np.concatenate(vs), 4 * k + 10)
+
+
+def power_law_graph(n, avg_degree, gamma=2.5, seed=None, largest_component=True):
+    """
+    Chung–Lu 幂律图：端点按权重 w_i ∝ (i+1)^(-1/(γ-1)) 独立抽样，去掉自环与重边。
+    度数分布近似幂律（指数 γ），非正则，走贪心分支。
+    - largest_component: 只保留最大连通分量（重新编号），否则低权重顶点大多是孤立点，整图不连通
+    """
+    rng = np.random.default_rng(seed)
+    w = np.arange(1, n + 1, dtype=np.float64) ** (-1.0 / (gamma - 1.0))
+    p = w / w.sum()
+    m = int(n * avg_degree / 2)
+    u = rng.choice(n, size=m, p=p)
+    v = rng.choice(n, size=m, p=p)
+    graph = _simple_graph(u, v, n)
+    if largest_component:
+        _, labels = connected_components(graph)
+        graph, _ = graph.induced_subgraph(np.flatnonzero(labels == np.bincount(labels).argmax()))
+    return graph
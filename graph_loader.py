@@ -0,0 +1,208 @@
+import gzip
+import io
+import re
+import time
+import tracemalloc
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from instrumentation import peak_rss_mb
+
+CHUNK_BYTES = 1 << 24    # 每次读取 16 MB 文本
+_LONG_ID = re.compile(rb'\d{19,}')   # 超过 int64 的 ID（如 gplus）改走字符串压缩路径
+
+
+def _open_binary(path):
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def _strip_comments(block):
+    if b'#' not in block:
+        return block
+    return b'\n'.join(line for line in block.split(b'\n') if not line.lstrip().startswith(b'#'))
+
+
+def iter_text_blocks(path, chunk_bytes=CHUNK_BYTES):
+    """按行边界切分的大块文本（已去掉 # 注释行），支持 .txt / .gz"""
+    rest = b''
+    with _open_binary(path) as f:
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            data = rest + data
+            cut = data.rfind(b'\n')
+            if cut < 0:
+                rest = data
+                continue
+            rest = data[cut + 1:]
+            yield _strip_comments(data[:cut + 1])
+    if rest.strip():
+        yield _strip_comments(rest)
+
+
+def _parse_int_block(block):
+    # np.loadtxt 的 C 解析器（NumPy ≥ 1.23）：已弃用的 np.fromstring(sep=' ') 的替代里最快的，
+    # split 后逐个转换要慢 3 倍以上
+    if not block.strip():
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    try:
+        values = np.loadtxt(io.BytesIO(block), dtype=np.int64, ndmin=2)
+    except ValueError as e:
+        raise ValueError("边表格式错误：每行应为两个节点 ID") from e
+    if values.shape[1] != 2:
+        raise ValueError("边表格式错误：每行应为两个节点 ID")
+    return values[:, 0], values[:, 1]
+
+
+def iter_edge_chunks(path, chunk_bytes=CHUNK_BYTES):
+    """
+    逐块产出原始边 (src, dst)，不去重、不删自环，供加载与流式校验复用。
+    - 节点 ID 可放入 int64 时产出 int64 数组；一旦遇到超长 ID，此后产出字节串数组
+    """
+    string_ids = False
+    for block in iter_text_blocks(path, chunk_bytes):
+        string_ids = string_ids or _LONG_ID.search(block) is not None
+        if string_ids:
+            tokens = np.array(block.split())
+            if len(tokens) % 2:
+                raise ValueError("边表格式错误：每行应为两个节点 ID")
+            yield tokens[0::2], tokens[1::2]
+        else:
+            yield _parse_int_block(block)
+
+
+def _compact_string_ids(tokens):
+    # 字符串 ID 先去重，再按整数值排序，保证与原脚本 sorted(node_set) 的编号一致
+    uniq, inverse = np.unique(tokens, return_inverse=True)
+    as_int = [int(tok) for tok in uniq]
+    order = sorted(range(len(as_int)), key=as_int.__getitem__)
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    node_ids = np.array([as_int[i] for i in order], dtype=object)
+    return node_ids, rank[inverse.ravel()]
+
+
+def sorted_unique(keys):
+    """原地排序后去重（比 np.unique 少一次复制）"""
+    keys.sort()
+    if len(keys) == 0:
+        return keys
+    keep = np.empty(len(keys), dtype=bool)
+    keep[0] = True
+    np.not_equal(keys[1:], keys[:-1], out=keep[1:])
+    return keys[keep]
+
+
+def _compact_int_ids(ids):
+    # ID 范围不大时用位图压缩（O(max_id)），否则退回排序去重
+    if len(ids) == 0:
+        return ids, ids
+    min_id, max_id = int(ids.min()), int(ids.max())
+    if min_id >= 0 and max_id < 8 * len(ids) + 1024:
+        present = np.zeros(max_id + 1, dtype=bool)
+        present[ids] = True
+        remap = np.cumsum(present, dtype=np.int64) - 1
+        return np.flatnonzero(present), remap[ids]
+    node_ids, inverse = np.unique(ids, return_inverse=True)
+    return node_ids, inverse.ravel()
+
+
+def edges_to_csr(lo, hi, n):
+    """
+    已压缩编号的无向边 → 对称、去重后的 CSR。
+    - 用 (lo << 32 | hi) 打包成 64 位键做向量化去重
+    """
+    keys = sorted_unique((lo.astype(np.int64) << 32) | hi)
+    lo = keys >> 32
+    hi = keys & 0xFFFFFFFF
+    # 两个方向合并后按 (src, dst) 排序，邻居列表天然有序
+    both = np.concatenate((keys, (hi << 32) | lo))
+    both.sort()
+    src = both >> 32
+    dst = both & 0xFFFFFFFF
+    degree = np.bincount(src, minlength=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    return CSRGraph(indptr, dst, degree)
+
+
+def _read_csr(path, chunk_bytes=CHUNK_BYTES):
+    """边表 → (graph, node_ids, raw_edges, self_loops, parse_ms, build_ms)"""
+    t0 = time.perf_counter()
+    src_parts, dst_parts = [], []
+    raw_edges = 0
+    for src, dst in iter_edge_chunks(path, chunk_bytes):
+        raw_edges += len(src)
+        src_parts.append(src)
+        dst_parts.append(dst)
+    t1 = time.perf_counter()
+
+    if any(part.dtype.kind == 'S' for part in src_parts):
+        src_parts = [part.astype(bytes) for part in src_parts]
+        dst_parts = [part.astype(bytes) for part in dst_parts]
+    if src_parts:
+        src = np.concatenate(src_parts)
+        dst = np.concatenate(dst_parts)
+    else:
+        src = dst = np.zeros(0, dtype=np.int64)
+    del src_parts, dst_parts
+
+    if src.dtype.kind == 'S':
+        node_ids, inverse = _compact_string_ids(np.concatenate((src, dst)))
+    else:
+        node_ids, inverse = _compact_int_ids(np.concatenate((src, dst)))
+    m_raw = len(src)
+    del src, dst
+    u, v = inverse[:m_raw], inverse[m_raw:]
+    keep = u != v
+    self_loops = int(m_raw - keep.sum())
+    u, v = u[keep], v[keep]
+    graph = edges_to_csr(np.minimum(u, v), np.maximum(u, v), len(node_ids))
+    t2 = time.perf_counter()
+    return graph, node_ids, raw_edges, self_loops, (t1 - t0) * 1000, (t2 - t1) * 1000
+
+
+def measure_load_memory(path, chunk_bytes=CHUNK_BYTES):
+    """在 tracemalloc 下把边表再加载一遍（不计时），返回加载过程的峰值内存（MB）"""
+    own_trace = not tracemalloc.is_tracing()
+    if own_trace:
+        tracemalloc.start()
+    try:
+        _read_csr(path, chunk_bytes)
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        if own_trace:
+            tracemalloc.stop()
+
+
+def load_edge_list(path, chunk_bytes=CHUNK_BYTES, measure_memory=False):
+    """
+    读取 SNAP 风格边表（.txt / .gz），直接生成对称、去重的 CSRGraph，不经过 SNAP。
+    - 自动跳过 # 注释行，删除自环（自环端点仍作为孤立顶点保留）
+    - 节点 ID 压缩到 [0..N-1]，顺序与原 ID 升序一致
+    - measure_memory: 计时的加载结束后，再用 measure_load_memory 单独加载一遍记录峰值内存；
+      tracemalloc 会拖慢每次分配，不与计时的那一遍同时开启
+    返回 (graph, node_ids, stats)，node_ids[i] 为压缩编号 i 对应的原始 ID；
+    stats 中 load_ms 与 peak_mem_mb 分开报告，便于和着色耗时区分（未测量时 peak_mem_mb 为 nan）；
+    peak_rss_mb 为加载结束时的进程峰值 RSS，bytes_per_edge 为 CSR 表示每条无向边占用的字节数。
+    """
+    graph, node_ids, raw_edges, self_loops, parse_ms, build_ms = _read_csr(path, chunk_bytes)
+    rss_mb = peak_rss_mb()
+    peak_mem_mb = measure_load_memory(path, chunk_bytes) if measure_memory else float('nan')
+
+    stats = {
+        'n': graph.num_nodes,
+        'm': graph.num_edges,
+        'raw_edges': raw_edges,
+        'self_loops': self_loops,
+        'parse_ms': parse_ms,
+        'build_ms': build_ms,
+        'load_ms': parse_ms + build_ms,
+        'peak_mem_mb': peak_mem_mb,
+        'peak_rss_mb': rss_mb,
+        'bytes_per_edge': graph.nbytes / max(graph.num_edges, 1),
+    }
+    return graph, node_ids, stats
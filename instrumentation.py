@@ -0,0 +1,176 @@
+import json
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource            # Unix
+except ImportError:            # Windows：退回 psutil（可选依赖）
+    resource = None
+
+MB = 2 ** 20
+
+
+def peak_rss_mb():
+    """进程生命周期内的峰值常驻内存（MB）；无法获取时返回 None"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 以 KB 计，macOS 以字节计
+        return peak / MB if sys.platform == 'darwin' else peak / 1024.0
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / MB
+    except Exception:
+        return None
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullRecorder:
+    """
+    关闭插桩时使用的空记录器：所有方法都是空操作，phase() 返回同一个共享的空上下文。
+    算法内部只在每个阶段 / 每次搜索结束时调用一次，不在逐边循环里调用，因此关闭时几乎没有开销。
+    """
+
+    __slots__ = ()
+    enabled = False
+    _PHASE = _NullPhase()
+
+    def phase(self, name):
+        return self._PHASE
+
+    def count(self, name, k=1):
+        pass
+
+    def set_branch(self, branch):
+        pass
+
+
+NULL_RECORDER = NullRecorder()
+
+
+class _Phase:
+    __slots__ = ('rec', 'name', 'wall', 'cpu', 'base')
+
+    def __init__(self, rec, name):
+        self.rec = rec
+        self.name = name
+
+    def __enter__(self):
+        if self.rec.memory:
+            self.base = tracemalloc.get_traced_memory()[0]
+            if hasattr(tracemalloc, 'reset_peak'):     # Python 3.9+
+                tracemalloc.reset_peak()
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall_ms = (time.perf_counter() - self.wall) * 1000.0
+        cpu_ms = (time.process_time() - self.cpu) * 1000.0
+        memory = None
+        if self.rec.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            memory = (max(peak - self.base, 0) / MB, peak_rss_mb())
+        self.rec._add_phase(self.name, wall_ms, cpu_ms, memory)
+        return False
+
+
+class PhaseRecorder:
+    """
+    结构化插桩：按阶段累计 wall / CPU 时间，累计计数器（访问的顶点与边、BFS / DFS 启动次数），记录所走的分支。
+    - 同名阶段多次进入时累加（例如逐块调用的 find_even_cycle），calls 记录进入次数
+    - stream: 可选的文本文件对象；每个阶段结束时写一行 JSON，close() 时再写一行汇总
+    - memory: 内存剖析模式，每个阶段另记 tm_peak_mb（阶段内 tracemalloc 峰值，相对进入时的已分配量）
+      与 rss_peak_mb（阶段结束时的进程峰值 RSS）。tracemalloc 会显著拖慢运行，此时的计时只作参考；
+      Python 3.9 以下没有 reset_peak，tm_peak_mb 退化为自开始跟踪以来的峰值
+    """
+
+    enabled = True
+
+    def __init__(self, stream=None, memory=False, **context):
+        self.phases = {}
+        self.counters = {}
+        self.branch = None
+        self.stream = stream
+        self.memory = memory
+        self.context = context
+        self._own_trace = memory and not tracemalloc.is_tracing()
+        if self._own_trace:
+            tracemalloc.start()
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def count(self, name, k=1):
+        self.counters[name] = self.counters.get(name, 0) + k
+
+    def set_branch(self, branch):
+        self.branch = branch
+
+    def _add_phase(self, name, wall_ms, cpu_ms, memory=None):
+        entry = self.phases.get(name)
+        if entry is None:
+            entry = self.phases[name] = {'wall_ms': 0.0, 'cpu_ms': 0.0, 'calls': 0}
+        entry['wall_ms'] += wall_ms
+        entry['cpu_ms'] += cpu_ms
+        entry['calls'] += 1
+        record = {'event': 'phase', 'phase': name, 'wall_ms': wall_ms, 'cpu_ms': cpu_ms}
+        if memory is not None:
+            # 多次进入的阶段取各次的最大值
+            tm_mb, rss_mb = memory
+            entry['tm_peak_mb'] = max(entry.get('tm_peak_mb', 0.0), tm_mb)
+            if rss_mb is not None:
+                entry['rss_peak_mb'] = max(entry.get('rss_peak_mb', 0.0), rss_mb)
+            record.update(tm_peak_mb=tm_mb, rss_peak_mb=rss_mb)
+        if self.stream is not None:
+            self._emit(record)
+
+    def _emit(self, record):
+        record.update(self.context)
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def to_dict(self):
+        return {'branch': self.branch, 'phases': self.phases, 'counters': dict(self.counters)}
+
+    def close(self):
+        """写汇总行（若有 stream），并停止本记录器自己开启的 tracemalloc"""
+        if self.stream is not None:
+            self._emit(dict(self.to_dict(), event='summary'))
+            self.stream.flush()
+        if self._own_trace:
+            tracemalloc.stop()
+            self._own_trace = False
+
+
+def flatten(profile, prefix=''):
+    """
+    把 PhaseRecorder.to_dict() 的结果展平成 CSV 可写的字段：
+    <prefix>branch、<prefix><phase>_wall_ms / _cpu_ms、<prefix><counter>
+    """
+    row = {f'{prefix}branch': profile.get('branch') or ''}
+    for name, entry in profile.get('phases', {}).items():
+        row[f'{prefix}{name}_wall_ms'] = f"{entry['wall_ms']:.3f}"
+        row[f'{prefix}{name}_cpu_ms'] = f"{entry['cpu_ms']:.3f}"
+    for name, value in profile.get('counters', {}).items():
+        row[f'{prefix}{name}'] = value
+    return row
+
+
+def flatten_memory(profile, prefix='mem_'):
+    """内存剖析字段：<prefix><phase>_tm_mb / _rss_mb（MB，保留 2 位小数）"""
+    row = {}
+    for name, entry in profile.get('phases', {}).items():
+        if 'tm_peak_mb' in entry:
+            row[f'{prefix}{name}_tm_mb'] = f"{entry['tm_peak_mb']:.2f}"
+        if 'rss_peak_mb' in entry:
+            row[f'{prefix}{name}_rss_mb'] = f"{entry['rss_peak_mb']:.2f}"
+    return row
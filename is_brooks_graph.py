@@ -1,50 +1,63 @@
-from collections import deque
-import itertools
-
-
-def is_brooks_graph(adj):
-    n = len(adj)
-
-    # 1. 判断连通性（BFS）
-    visited = [False] * n
-    def bfs(start):
-        queue = deque([start])
-        visited[start] = True
-        while queue:
-            v = queue.popleft()
-            for u in adj[v]:
-                if not visited[u]:
-                    visited[u] = True
-                    queue.append(u)
-
-    bfs(0)
-    if not all(visited):
+import numpy as np
+
+from csr_graph import as_csr, connected_components
+
+# classify_components 给出的分量类型
+BROOKS, COMPLETE, ODD_CYCLE = 0, 1, 2
+KIND_NAMES = ('brooks', 'complete', 'odd_cycle')
+KIND_REASONS = ("图是 Brooks 图", "图是完全图", "图是奇圈")
+
+
+def classify_components(adj, components=None):
+    """
+    按连通分量做 Brooks 判定，只用度数与分量标号上的 bincount，O(n) 且不再遍历边。
+    简单图中：
+    - 分量是完全图 ⇔ m_c = n_c (n_c - 1) / 2（孤立顶点即 K1，单条边即 K2）
+    - 分量是圈 ⇔ Δ_c = 2 且 m_c = n_c（连通、2-正则），n_c 为奇数时是奇圈
+    其余分量可用 Δ_c 种颜色着色（Brooks 定理）。
+    - components: 已经算好的 connected_components(adj) 结果 (k, labels)，避免重复 BFS
+    返回 dict：num_components / labels / size / edges / Delta / kind（int8，取值见 KIND_NAMES）
+    """
+    adj = as_csr(adj)
+    k, labels = components if components is not None else connected_components(adj)
+    degree = np.asarray(adj.degree, dtype=np.int64)
+    size = np.bincount(labels, minlength=k)
+    edges = np.bincount(labels, weights=degree, minlength=k).astype(np.int64) // 2
+    Delta = np.zeros(k, dtype=np.int64)
+    np.maximum.at(Delta, labels, degree)
+
+    kind = np.full(k, BROOKS, dtype=np.int8)
+    kind[(Delta == 2) & (edges == size) & (size % 2 == 1)] = ODD_CYCLE
+    # K3 同时满足两个条件，按完全图报告（与逐项判定的先后顺序一致）
+    kind[edges == size * (size - 1) // 2] = COMPLETE
+    return {
+        'num_components': k,
+        'labels': labels,
+        'size': size,
+        'edges': edges,
+        'Delta': Delta,
+        'kind': kind,
+    }
+
+
+def component_summary(report):
+    """每种分量类型的个数，例如 {'brooks': 3, 'complete': 120, 'odd_cycle': 0}"""
+    counts = np.bincount(report['kind'], minlength=len(KIND_NAMES))
+    return {name: int(c) for name, c in zip(KIND_NAMES, counts)}
+
+
+def graph_verdict(report):
+    """由 classify_components 的结果给出整图判定 (bool, 原因)：连通、不是完全图、不是奇圈"""
+    if report['num_components'] != 1:
         return False, "图不连通"
+    kind = int(report['kind'][0])
+    return kind == BROOKS, KIND_REASONS[kind]
 
-    # 2. 判断是否是完全图（每个顶点度数为 n-1）
-    if all(len(adj[v]) == n - 1 for v in range(n)):
-        return False, "图是完全图"
-
-    # 3. 判断是否是奇圈（即长度为奇数的简单环图）
-    if all(len(adj[v]) == 2 for v in range(n)):
-        # 每个点度数为2，可能是环图
-        # 用 BFS 检查是否有奇数个点 + 环
-        def is_cycle():
-            count = 0
-            v = 0
-            prev = -1
-            visited_cycle = set()
-            while v not in visited_cycle:
-                visited_cycle.add(v)
-                count += 1
-                neighbors = [u for u in adj[v] if u != prev]
-                if not neighbors:
-                    return False
-                prev, v = v, neighbors[0]
-            return count == len(adj) and count % 2 == 1
-
-        if is_cycle():
-            return False, "图是奇圈"
-
-    # 都通过则为 Brooks 图
-    return True, "图是 Brooks 图"
+
+def is_brooks_graph(adj, components=None):
+    """
+    整图的 Brooks 判定。
+    - components: 可选的 connected_components(adj) 结果，调用方已算过时直接复用
+    返回 (bool, 原因)
+    """
+    return graph_verdict(classify_components(adj, components))
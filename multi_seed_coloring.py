@@ -0,0 +1,147 @@
+"""
+Batched multi-seed (Δ+1)-coloring
+同一张图上一次跑完多个随机顺序：图只加载、展开一次，多个种子拼成不相交并图一起做向量化的 Jones–Plassmann，
+返回颜色数与耗时的分布，以及颜色数最少的那个着色。
+用法: python multi_seed_coloring.py facebook_combined.txt [--num-seeds 50 | --seeds 1 2 3] [--processes 4]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+
+from csr_graph import as_csr
+from shared_graph import attach_arrays, graph_from_arrays, share_graph
+from vectorized_coloring import batched_delta_plus_one_coloring
+
+BATCH_EDGES = 1 << 22    # 每批并图的有向边数上限（约 S · 2m）：小图多个种子合批分摊每轮开销，大图每批一个种子
+
+_worker = {}   # worker 端 attach 到的共享数组
+
+
+def _seed_batches(seeds, num_edges, batch_edges):
+    per_batch = max(1, batch_edges // max(2 * num_edges, 1))
+    return [seeds[i:i + per_batch] for i in range(0, len(seeds), per_batch)]
+
+
+def _run_batch(graph, seeds):
+    """
+    一批种子：返回 (每个种子的颜色数, 每个种子的均摊耗时, 本批最好的 (seed, colors), rounds)。
+    贪心取 mex，用到颜色 c 的顶点的邻居必然占满 0..c-1，因此颜色数就是 max + 1。
+    """
+    t0 = time.perf_counter()
+    colors, rounds = batched_delta_plus_one_coloring(graph, seeds)
+    per_seed_ms = (time.perf_counter() - t0) * 1000.0 / len(seeds)
+    counts = colors.max(axis=1).astype(np.int64) + 1 if graph.num_nodes else np.zeros(len(seeds), dtype=np.int64)
+    best = int(np.argmin(counts))
+    return counts.tolist(), [per_seed_ms] * len(seeds), (seeds[best], colors[best].copy()), rounds
+
+
+def _init_worker(spec):
+    arrays, handles = attach_arrays(spec)
+    _worker['graph'] = graph_from_arrays(arrays)
+    _worker['handles'] = handles
+
+
+def _pool_batch(seeds):
+    return _run_batch(_worker['graph'], seeds)
+
+
+def run_multi_seed_delta_plus_one_coloring(adj, seeds=None, num_seeds=None, processes=1,
+                                           batch_edges=BATCH_EDGES):
+    """
+    对多个种子的随机顺序做 (Δ+1)-coloring，返回分布统计与最好的着色。
+    - seeds: 种子列表；或用 num_seeds 表示 seed = 0 .. num_seeds-1（两者都不给时为 [42]）
+    - processes: >1 时各批种子分给进程池，worker 通过共享内存 attach 同一份图
+    - batch_edges: 每批并图的边数上限；种子数 × 2m 超过它时分批
+    每个种子的结果与 run_vectorized_delta_plus_one_coloring(adj, seed) 一致
+    （注意与 run_delta_plus_one_coloring 的 random.shuffle 顺序不同，同一 seed 颜色数不必相同）。
+    同一批内各种子的耗时无法分开，ms_per_seed 记为该批耗时的均摊值。
+    返回 colors / num_colors / best_seed（颜色数最少的种子，并列取最先出现的）/ seeds /
+    num_colors_per_seed / min_colors / mean_colors / max_colors / ms_per_seed /
+    elapsed_ms（全部种子的总墙钟时间）/ setup_ms / rounds（各批最大值）/ batches / processes
+    """
+    if seeds is None:
+        seeds = list(range(num_seeds)) if num_seeds else [42]
+    seeds = list(seeds)
+    if not seeds:
+        raise ValueError("至少需要一个种子")
+    adj = as_csr(adj)
+    processes = max(1, min(processes or os.cpu_count() or 1, len(seeds)))
+    batches = _seed_batches(seeds, adj.num_edges, batch_edges)
+    if processes > 1 and len(batches) < processes:
+        # 种子不多时按进程数切开，让每个 worker 都有活干
+        per_batch = -(-len(seeds) // processes)
+        batches = [seeds[i:i + per_batch] for i in range(0, len(seeds), per_batch)]
+
+    t0 = time.perf_counter()
+    if processes > 1:
+        shared = share_graph(adj)
+        try:
+            pool = mp.Pool(processes, initializer=_init_worker, initargs=(shared.spec,))
+            t1 = time.perf_counter()
+            try:
+                results = pool.map(_pool_batch, batches)
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            shared.close()
+    else:
+        t1 = time.perf_counter()
+        results = [_run_batch(adj, batch) for batch in batches]
+    t2 = time.perf_counter()
+
+    counts, times, best, rounds = [], [], None, 0
+    for batch_counts, batch_times, (seed, colors), batch_rounds in results:
+        k = min(batch_counts)
+        if best is None or k < best[0]:
+            best = (k, seed, colors)
+        counts += batch_counts
+        times += batch_times
+        rounds = max(rounds, batch_rounds)
+    return {
+        'colors': best[2],
+        'num_colors': best[0],
+        'best_seed': best[1],
+        'seeds': seeds,
+        'num_colors_per_seed': counts,
+        'min_colors': min(counts),
+        'mean_colors': float(np.mean(counts)),
+        'max_colors': max(counts),
+        'ms_per_seed': times,
+        'elapsed_ms': (t2 - t1) * 1000.0,
+        'setup_ms': (t1 - t0) * 1000.0,
+        'rounds': rounds,
+        'batches': len(batches),
+        'processes': processes,
+    }
+
+
+def main(argv=None):
+    from graph_cache import load_graph_cached
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("dataset")
+    seeds = parser.add_mutually_exclusive_group()
+    seeds.add_argument("--seeds", nargs="+", type=int, default=None)
+    seeds.add_argument("--num-seeds", type=int, default=20, help="使用 seed = 0 .. N-1")
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    graph, _, _ = load_graph_cached(args.dataset)
+    res = run_multi_seed_delta_plus_one_coloring(graph, seeds=args.seeds, num_seeds=args.num_seeds,
+                                                 processes=args.processes)
+    times = np.asarray(res['ms_per_seed'])
+    print(f"{os.path.basename(args.dataset)}: n = {graph.num_nodes}, m = {graph.num_edges}, "
+          f"Δ = {graph.max_degree()}, {len(res['seeds'])} seeds in {res['batches']} batch(es), "
+          f"{res['processes']} process(es)")
+    print(f"colors   min / mean / max = {res['min_colors']} / {res['mean_colors']:.2f} / {res['max_colors']} "
+          f"(best seed {res['best_seed']})")
+    print(f"ms/seed  min / mean / max = {times.min():.3f} / {times.mean():.3f} / {times.max():.3f}, "
+          f"total {res['elapsed_ms']:.3f} ms (+ setup {res['setup_ms']:.3f} ms), rounds ≤ {res['rounds']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+贪心着色的顶点顺序策略，全部在 CSR 上线性或近线性时间完成。
+- largest_first: 按度数从大到小（稳定排序，同度数按编号）
+- smallest_last: 退化序（Matula–Beck），O(n + m) 桶队列；逆序着色时颜色数 ≤ degeneracy + 1
+- dsatur: 饱和度优先，顺序依赖已着的颜色，因此直接给出着色（dsatur_coloring）
+"""
+import heapq
+
+import numpy as np
+
+from csr_graph import as_csr
+from first_fit import FirstFit
+
+
+def largest_first_order(adj):
+    adj = as_csr(adj)
+    return np.argsort(-np.asarray(adj.degree), kind='stable').tolist()
+
+
+def degeneracy_ordering(adj):
+    """
+    Batagelj–Zaversnik 桶队列：按当前度数分桶的顶点数组 vert，pos[v] 为 v 在 vert 中的位置，
+    bin[d] 为度数 d 的桶在 vert 中的起点。每次取当前度数最小的顶点删除，
+    邻居降一度时与所在桶的第一个顶点交换位置，O(1)。总计 O(n + m)。
+    返回 (removal, core)：removal 为删除顺序（最小度优先），core[v] 为 v 的核数，max(core) 即 degeneracy。
+    """
+    adj = as_csr(adj)
+    n = len(adj)
+    ptr, idx = adj.neighbor_views()
+    deg = adj.degree.tolist()
+    max_deg = max(deg) if n else 0
+
+    bins = [0] * (max_deg + 1)
+    for d in deg:
+        bins[d] += 1
+    start = 0
+    for d in range(max_deg + 1):
+        bins[d], start = start, start + bins[d]
+    pos = [0] * n
+    vert = [0] * n
+    for v in range(n):
+        pos[v] = bins[deg[v]]
+        vert[pos[v]] = v
+        bins[deg[v]] += 1
+    for d in range(max_deg, 0, -1):
+        bins[d] = bins[d - 1]
+    bins[0] = 0
+
+    for i in range(n):
+        v = vert[i]
+        dv = deg[v]
+        for u in idx[ptr[v]:ptr[v + 1]]:
+            du = deg[u]
+            if du > dv:
+                pu = pos[u]
+                pw = bins[du]
+                w = vert[pw]
+                if u != w:
+                    pos[u], pos[w] = pw, pu
+                    vert[pu], vert[pw] = w, u
+                bins[du] += 1
+                deg[u] = du - 1
+    return vert, deg
+
+
+def smallest_last_order(adj):
+    """退化序的逆序：最后删除的顶点最先着色"""
+    removal, _ = degeneracy_ordering(adj)
+    return removal[::-1]
+
+
+def dsatur_coloring(adj, palette=None):
+    """
+    DSATUR：每步取饱和度（邻居中不同颜色数）最大的未着色顶点，度数大者优先，再按编号。
+    - 优先级结构是带惰性删除的二叉堆：饱和度上升时压入新条目，弹出时丢弃过期条目；
+      每条边至多触发一次压入，总计 O((n + m) log n)，不会每步重扫全部顶点
+    - 每个顶点的邻居颜色集合只在它第一次被着色邻居触及时才分配
+    - palette: 色域大小，默认 Δ+1（首次适配保证不会超出）
+    返回 (colors, order)
+    """
+    adj = as_csr(adj)
+    n = len(adj)
+    ptr, idx = adj.neighbor_views()
+    deg = adj.degree.tolist()
+    ff = FirstFit(palette if palette is not None else adj.max_degree() + 1)
+
+    colors = [-1] * n
+    seen = [None] * n
+    sat = [0] * n
+    heap = [(0, -deg[v], v) for v in range(n)]
+    heapq.heapify(heap)
+    order = []
+    while heap:
+        s, _, v = heapq.heappop(heap)
+        if colors[v] != -1 or -s != sat[v]:
+            continue
+        nbrs = idx[ptr[v]:ptr[v + 1]]
+        c = ff.smallest(nbrs, colors)
+        colors[v] = c
+        order.append(v)
+        for u in nbrs:
+            if colors[u] != -1:
+                continue
+            su = seen[u]
+            if su is None:
+                su = seen[u] = set()
+            if c not in su:
+                su.add(c)
+                sat[u] += 1
+                heapq.heappush(heap, (-sat[u], -deg[u], u))
+    return colors, order
+
+
+# 静态顺序：函数 adj → 顶点列表（按着色先后）
+ORDERINGS = {
+    'largest_first': largest_first_order,
+    'smallest_last': smallest_last_order,
+}
+STRATEGIES = ('random', 'identity') + tuple(ORDERINGS) + ('dsatur',)
+
+
+def vertex_order(adj, order):
+    """order 为 ORDERINGS 中的名字或显式的顶点序列，返回顶点列表"""
+    if isinstance(order, str):
+        if order not in ORDERINGS:
+            raise ValueError(f"未知的顶点顺序 {order!r}，可选 {', '.join(ORDERINGS)} 或 'dsatur'")
+        return ORDERINGS[order](adj)
+    return [int(v) for v in order]
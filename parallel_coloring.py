@@ -0,0 +1,211 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+
+import numpy as np
+
+from csr_graph import as_csr, gather_segments
+from first_fit import batch_smallest
+from shared_graph import SharedArrays, attach_arrays
+
+def _color_ready(arrays, lo, hi):
+    """
+    一轮 Jones–Plassmann：给 [lo, hi) 中所有"更高优先级邻居都已着色"的顶点取色，全部向量化。
+    - cursor[v] 指向 v 的高优先级邻居列表中第一个可能未着色的位置，只前进不后退，整体摊还 O(deg)
+    - 同一批就绪顶点两两不相邻（相邻时低优先级一方必然还在等待），可以同时着色
+    - 颜色 = 高优先级邻居颜色的 mex；低优先级邻居此时必然未着色，因此结果与
+      按优先级顺序的串行贪心完全一致，与进程数、调度顺序无关
+    """
+    colors = arrays['colors']
+    hp_ptr = arrays['hp_ptr']
+    hp_idx = arrays['hp_idx']
+    cursor = arrays['cursor']
+    pending = np.flatnonzero(colors[lo:hi] == -1) + lo
+
+    ready = []
+    active = pending
+    while len(active):
+        pos = cursor[active]
+        at_end = pos >= hp_ptr[active + 1]
+        ready.append(active[at_end])
+        active, pos = active[~at_end], pos[~at_end]
+        advance = colors[hp_idx[pos]] != -1
+        active = active[advance]
+        cursor[active] += 1
+    ready = np.concatenate(ready) if ready else pending
+
+    if len(ready):
+        counts, nbrs = gather_segments(hp_ptr, hp_idx, ready)
+        colors[ready] = batch_smallest(counts, colors[nbrs])
+    return len(ready), len(pending) - len(ready)
+
+
+def _jp_worker(spec, rank, lo, hi, gate, barrier):
+    """
+    常驻 worker：在自己的顶点区间 [lo, hi) 上连续执行全部轮次，轮与轮之间只做一次 barrier，不经过主进程。
+    - left: (2, P) 的共享计数，第 r 轮写 left[r % 2]；双缓冲保证快的 worker 写下一轮时，慢的还能读到本轮的和
+    - 其他 worker 在同一轮里着色的邻居也可能被本轮看到：颜色只写一次，结果仍与串行的优先级贪心一致
+    - gate: 与主进程共用的起止屏障，主进程只在两次 gate 之间计时
+    """
+    arrays, handles = attach_arrays(spec)
+    left = arrays['left']
+    try:
+        gate.wait()
+        rounds = 0
+        while True:
+            _, remaining = _color_ready(arrays, lo, hi)
+            left[rounds & 1, rank] = remaining
+            barrier.wait()
+            rounds += 1
+            if not left[(rounds - 1) & 1].any():
+                break
+        arrays['rounds'][rank] = rounds
+        gate.wait()
+    except BaseException:
+        # 让其他 worker 与主进程从 wait 中醒来，而不是永远等待
+        barrier.abort()
+        gate.abort()
+        raise
+    finally:
+        del arrays, left
+        for shm in handles:
+            shm.close()
+
+
+def _edge_balanced_chunks(indptr, parts):
+    """按边数均分顶点区间，避免高度数顶点集中在同一个 worker"""
+    n = len(indptr) - 1
+    cuts = np.searchsorted(indptr, np.linspace(0, indptr[-1], parts + 1))
+    cuts[0], cuts[-1] = 0, n
+    cuts = np.unique(cuts)
+    return [(int(a), int(b)) for a, b in zip(cuts[:-1], cuts[1:]) if b > a]
+
+
+def run_parallel_delta_plus_one_coloring(adj, seed=None, processes=None):
+    """
+    多进程 Jones–Plassmann (Δ+1)-coloring。
+    - seed: 随机优先级的种子；同一 seed 下结果与进程数无关（确定性）
+    - processes: worker 数，默认 os.cpu_count()；1 表示在当前进程内按同样的轮次执行
+    - 每个 worker 按边数均分到一个顶点区间，常驻执行全部轮次（见 _jp_worker），
+      通过 multiprocessing.shared_memory attach 优先级子图与颜色数组，不 pickle 邻接表，每轮也没有 IPC
+    返回与 run_delta_plus_one_coloring 相同的 colors / num_colors / elapsed_ms（只含着色的轮次），
+    另附 setup_ms（优先级、共享内存、启动 worker）、total_ms（从开始到 worker 全部退出、共享内存释放）、
+    rounds 与 processes。
+    """
+    adj = as_csr(adj)
+    n = len(adj)
+    processes = processes or os.cpu_count() or 1
+
+    t0 = time.perf_counter()
+    priority = np.random.default_rng(seed).permutation(n)
+    src, dst = adj.edge_arrays()
+    higher = priority[dst] > priority[src]
+    hp_ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src[higher], minlength=n), out=hp_ptr[1:])
+    ranges = _edge_balanced_chunks(adj.indptr, processes) if processes > 1 else []
+    shared = SharedArrays({
+        'colors': np.full(n, -1, dtype=np.int32),
+        'hp_ptr': hp_ptr,
+        'hp_idx': dst[higher],
+        'cursor': hp_ptr[:-1],
+        'left': np.zeros((2, max(len(ranges), 1)), dtype=np.int64),
+        'rounds': np.zeros(max(len(ranges), 1), dtype=np.int64),
+    })
+    workers = []
+    try:
+        if len(ranges) > 1:
+            gate = mp.Barrier(len(ranges) + 1)
+            barrier = mp.Barrier(len(ranges))
+            workers = [mp.Process(target=_jp_worker, args=(shared.spec, rank, lo, hi, gate, barrier), daemon=True)
+                       for rank, (lo, hi) in enumerate(ranges)]
+            for w in workers:
+                w.start()
+            try:
+                gate.wait()
+                t1 = time.perf_counter()
+                gate.wait()
+                t2 = time.perf_counter()
+            except threading.BrokenBarrierError:
+                for w in workers:
+                    w.join()
+                codes = [w.exitcode for w in workers]
+                raise RuntimeError(f"Jones–Plassmann worker 异常退出（exit codes {codes}）") from None
+            rounds = int(shared.arrays['rounds'].max())
+        else:
+            t1 = time.perf_counter()
+            rounds = 0
+            remaining = n
+            while remaining:
+                _, remaining = _color_ready(shared.arrays, 0, n)
+                rounds += 1
+            t2 = time.perf_counter()
+        colors = shared.arrays['colors'].copy()
+    finally:
+        for w in workers:
+            w.join()
+        shared.close()
+    t3 = time.perf_counter()
+
+    return {
+        'colors': colors,
+        'num_colors': len(np.unique(colors)) if n else 0,
+        'elapsed_ms': (t2 - t1) * 1000.0,
+        'setup_ms': (t1 - t0) * 1000.0,
+        'total_ms': (t3 - t0) * 1000.0,
+        'rounds': rounds,
+        'processes': max(len(ranges), 1),
+    }
+
+
+def sequential_baselines(adj, seed=0):
+    """
+    单进程基线：逐顶点首次适配（run_delta_plus_one_coloring）与向量化 Jones–Plassmann，
+    各跑一次，返回 {名称: elapsed_ms}
+    """
+    from vectorized_coloring import run_vectorized_delta_plus_one_coloring
+    from Δ_1_coloring_Algorithm import run_delta_plus_one_coloring
+
+    adj = as_csr(adj)
+    return {
+        'delta_plus_one': run_delta_plus_one_coloring(adj, seed=seed)['elapsed_ms'],
+        'vectorized': run_vectorized_delta_plus_one_coloring(adj, seed=seed)['elapsed_ms'],
+    }
+
+
+def strong_scaling(adj, process_counts, seed=0):
+    """
+    固定问题规模、改变进程数的强扩展性测试。
+    加速比以最快的单进程基线（sequential_baselines）为分母，而不是本引擎自己的 1 进程运行：
+    共享内存的多进程版在 1 进程时本身就比串行实现慢，自比会夸大扩展性。
+    每个进程数的着色结果都与第一个（通常为 1 进程）比较，确认确定性。
+    返回每个进程数一行：processes / elapsed_ms / setup_ms / total_ms / baseline / baseline_ms /
+    speedup（基线 / 着色轮次）/ total_speedup（基线 / 含准备与退出）/ efficiency（total_speedup / 进程数）/
+    num_colors / rounds / identical
+    """
+    adj = as_csr(adj)
+    baselines = sequential_baselines(adj, seed)
+    baseline = min(baselines, key=baselines.get)
+    baseline_ms = baselines[baseline]
+    rows = []
+    base = None
+    for p in process_counts:
+        res = run_parallel_delta_plus_one_coloring(adj, seed=seed, processes=p)
+        if base is None:
+            base = res
+        total_speedup = baseline_ms / res['total_ms'] if res['total_ms'] > 0 else float('nan')
+        rows.append({
+            'processes': p,
+            'elapsed_ms': res['elapsed_ms'],
+            'setup_ms': res['setup_ms'],
+            'total_ms': res['total_ms'],
+            'baseline': baseline,
+            'baseline_ms': baseline_ms,
+            'speedup': baseline_ms / res['elapsed_ms'] if res['elapsed_ms'] > 0 else float('nan'),
+            'total_speedup': total_speedup,
+            'efficiency': total_speedup / p,
+            'num_colors': res['num_colors'],
+            'rounds': res['rounds'],
+            'identical': bool(np.array_equal(res['colors'], base['colors'])),
+        })
+    return rows
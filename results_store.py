@@ -0,0 +1,283 @@
+"""
+SQLite results store
+实验结果写入标准库 sqlite3 数据库（WAL 模式，多个进程可同时写入），代替无锁追加的 CSV；
+按数据集 / 算法 / seed / 时间建索引，中位数等聚合直接在 SQL 里完成；CSV 由数据库导出，保持兼容。
+- experiments: 每个 (数据集, seed) 一行，保存总日志的整行（JSON，列随 --instrument 等开关变化）
+- runs: 每个 (数据集, 算法, seed) 一行，颜色数与耗时单独成列，供索引与聚合
+用法: python results_store.py summary [--db results.sqlite] [--dataset facebook_combined.txt]
+      python results_store.py export --results results.csv --master-log master_experiment_log.csv
+      python results_store.py import master_experiment_log.csv
+run_experiments 每次运行只把本次写入的行追加到 CSV（append_to_csv），不覆盖 CSV 中已有的行；
+export 命令按库中的全部行整文件重写。
+"""
+import argparse
+import csv
+import json
+import sqlite3
+import statistics
+from contextlib import contextmanager
+
+from experiment_log import append_csv_rows, write_csv
+
+RESULTS_DB = "results.sqlite"
+BUSY_TIMEOUT_S = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dataset TEXT NOT NULL,
+    seed INTEGER,
+    date_time TEXT,
+    row TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    experiment_id INTEGER NOT NULL REFERENCES experiments(id),
+    dataset TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    seed INTEGER,
+    date_time TEXT,
+    num_colors INTEGER,
+    elapsed_ms REAL
+);
+CREATE INDEX IF NOT EXISTS idx_experiments_dataset ON experiments(dataset);
+CREATE INDEX IF NOT EXISTS idx_experiments_date_time ON experiments(date_time);
+CREATE INDEX IF NOT EXISTS idx_runs_dataset_algorithm ON runs(dataset, algorithm);
+CREATE INDEX IF NOT EXISTS idx_runs_algorithm ON runs(algorithm);
+CREATE INDEX IF NOT EXISTS idx_runs_seed ON runs(seed);
+CREATE INDEX IF NOT EXISTS idx_runs_date_time ON runs(date_time);
+"""
+
+
+class _Median:
+    """SQL 聚合 median(x)：SQLite 没有内建中位数，注册为 Python 聚合（与 GROUP BY / WHERE 索引照常配合）"""
+
+    def __init__(self):
+        self.values = []
+
+    def step(self, value):
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        return statistics.median(self.values) if self.values else None
+
+
+def _json_default(value):
+    # NumPy 标量（如 Δ、n）转成 Python 数值
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def _columns(rows, header, extend):
+    """导出的列：header 的全部列（行中没有的留空），extend 时再按首次出现追加 header 之外的列"""
+    columns = list(header or [])
+    if header is None or extend:
+        seen = set(columns)
+        for row in rows:
+            for key in row:
+                if key not in seen:
+                    seen.add(key)
+                    columns.append(key)
+    return columns
+
+
+def _number(value, kind):
+    """CSV 导入时的数值列：空串为 NULL"""
+    if value in (None, ""):
+        return None
+    return kind(value)
+
+
+class ResultsStore:
+    """
+    结果库的一个连接。每个进程（包括进程池 worker）各自打开，不跨进程共享连接。
+    - WAL 模式：读不阻塞写，写入互相排队；busy_timeout 内等待锁，不会因并发写入报错
+    - 每次写入是一个 BEGIN IMMEDIATE 事务，要么整行（experiments + runs）写入，要么都不写
+    """
+
+    def __init__(self, path=RESULTS_DB, timeout=BUSY_TIMEOUT_S):
+        self.path = path
+        # isolation_level=None：由 _transaction 显式控制事务
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.create_aggregate("median", 1, _Median)
+        with self._transaction():
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    self.conn.execute(statement)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextmanager
+    def _transaction(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # ------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------
+    def add_experiment(self, row, runs):
+        """
+        - row: 总日志的一整行（dict），至少含 dataset / seed / date_time
+        - runs: {algorithm: (num_colors, elapsed_ms)}
+        返回 experiment id
+        """
+        with self._transaction() as conn:
+            return self._insert(conn, row, runs)
+
+    @staticmethod
+    def _insert(conn, row, runs):
+        seed = _number(row.get("seed"), int)
+        payload = json.dumps(row, ensure_ascii=False, default=_json_default)
+        cur = conn.execute("INSERT INTO experiments (dataset, seed, date_time, row) VALUES (?, ?, ?, ?)",
+                           (row["dataset"], seed, row.get("date_time"), payload))
+        conn.executemany(
+            "INSERT INTO runs (experiment_id, dataset, algorithm, seed, date_time, num_colors, elapsed_ms) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(cur.lastrowid, row["dataset"], algorithm, seed, row.get("date_time"), k, t)
+             for algorithm, (k, t) in runs.items()])
+        return cur.lastrowid
+
+    def import_csv(self, path, prefixes, only_if_empty=False):
+        """
+        导入已有的总日志 CSV（一个事务）。
+        - prefixes: {CSV 列前缀: 算法名}，例如 {"delta_list": "delta_list", "delta_plus_1": "delta_plus_one"}，
+          由 k_<prefix> / t_<prefix>_ms 两列还原 runs
+        - only_if_empty: 库中已有实验时不导入；判断与导入在同一个 BEGIN IMMEDIATE 事务里，
+          多个进程同时首次运行时只有一个会导入
+        返回导入的行数
+        """
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        with self._transaction() as conn:
+            if only_if_empty and conn.execute("SELECT 1 FROM experiments LIMIT 1").fetchone():
+                return 0
+            for row in rows:
+                runs = {algorithm: (_number(row[f"k_{prefix}"], int), _number(row.get(f"t_{prefix}_ms"), float))
+                        for prefix, algorithm in prefixes.items() if row.get(f"k_{prefix}") not in (None, "")}
+                self._insert(conn, {key: value for key, value in row.items() if value != ""}, runs)
+        return len(rows)
+
+    # ------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------
+    def rows(self, ids=None):
+        """按写入顺序返回 experiments 的整行（dict）；ids 给出时只取这些实验"""
+        if ids is None:
+            cur = self.conn.execute("SELECT row FROM experiments ORDER BY id")
+            return [json.loads(r["row"]) for r in cur]
+        ids = sorted(ids)
+        rows = []
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            cur = self.conn.execute(f"SELECT row FROM experiments WHERE id IN ({','.join('?' * len(chunk))}) "
+                                    "ORDER BY id", chunk)
+            rows += [json.loads(r["row"]) for r in cur]
+        return rows
+
+    def num_experiments(self):
+        return self.conn.execute("SELECT COUNT(*) FROM experiments").fetchone()[0]
+
+    def query(self, sql, params=()):
+        """任意只读 SQL，返回 dict 列表"""
+        return [dict(r) for r in self.conn.execute(sql, params)]
+
+    def summary(self, dataset=None, algorithm=None, since=None):
+        """
+        按 (数据集, 算法) 聚合：runs / median_ms / mean_ms / min_ms / max_ms / median_colors / min_colors。
+        dataset / algorithm / since（date_time 下限，ISO 字符串）都走索引过滤
+        """
+        where, params = [], []
+        for column, value, op in (("dataset", dataset, "="), ("algorithm", algorithm, "="),
+                                  ("date_time", since, ">=")):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        return self.query(
+            "SELECT dataset, algorithm, COUNT(*) AS runs, median(elapsed_ms) AS median_ms, "
+            "AVG(elapsed_ms) AS mean_ms, MIN(elapsed_ms) AS min_ms, MAX(elapsed_ms) AS max_ms, "
+            "median(num_colors) AS median_colors, MIN(num_colors) AS min_colors FROM runs"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " GROUP BY dataset, algorithm ORDER BY dataset, algorithm", params)
+
+    # ------------------------------------------------------------
+    # CSV 导出
+    # ------------------------------------------------------------
+    def export_csv(self, path, header=None, extend=True):
+        """
+        按写入顺序导出 experiments 的整行，整文件重写（experiment_log.write_csv：加锁，临时文件原子替换）。
+        - header: 列顺序，全部列都会输出（行中没有的留空）；None 时为各行列名的并集（按首次出现）
+        - extend: header 之外的列是否追加在后面（总日志为 True，results.csv 为 False）
+        返回导出的行数
+        """
+        rows = self.rows()
+        write_csv(path, _columns(rows, header, extend), rows)
+        return len(rows)
+
+    def append_to_csv(self, path, ids, header=None, extend=True):
+        """
+        把指定的实验追加到 CSV 末尾，文件里已有的行（旧脚本或 --no-db 运行写入的）保持不动；
+        列同 export_csv，文件表头缺列时由 append_csv_rows 迁移（同一把锁内）。返回追加的行数
+        """
+        rows = self.rows(ids)
+        columns = _columns(rows, header, extend)
+        if rows:
+            append_csv_rows(path, columns, [{key: row[key] for key in columns if key in row} for row in rows])
+        return len(rows)
+
+
+def main(argv=None):
+    from run_experiments import (ALGORITHMS, INSTRUMENT_HEADER, MASTER_LOG, MEMORY_HEADER, RESULT_CSV,
+                                 RESULTS_HEADER, master_header)
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", default=RESULTS_DB)
+    sub = parser.add_subparsers(dest="command")
+    summary = sub.add_parser("summary", help="按 (数据集, 算法) 的中位耗时与颜色数")
+    summary.add_argument("--dataset", default=None)
+    summary.add_argument("--algorithm", default=None)
+    summary.add_argument("--since", default=None, help="只统计 date_time ≥ 该 ISO 时间的运行")
+    export = sub.add_parser("export", help="导出兼容的 CSV")
+    export.add_argument("--results", default=RESULT_CSV)
+    export.add_argument("--master-log", default=MASTER_LOG)
+    imp = sub.add_parser("import", help="导入已有的总日志 CSV")
+    imp.add_argument("csv")
+    args = parser.parse_args(argv)
+
+    with ResultsStore(args.db) as store:
+        if args.command == "export":
+            keys = set().union(*store.rows())
+            header = master_header(instrument=bool(keys.intersection(INSTRUMENT_HEADER)),
+                                   profile_memory=bool(keys.intersection(MEMORY_HEADER)))
+            count = store.export_csv(args.master_log, header)
+            store.export_csv(args.results, RESULTS_HEADER, extend=False)
+            print(f"{count} rows exported to {args.results} and {args.master_log}")
+        elif args.command == "import":
+            count = store.import_csv(args.csv, {prefix: name for name, (prefix, _, _) in ALGORITHMS.items()})
+            print(f"{count} rows imported from {args.csv} into {args.db}")
+        else:
+            rows = store.summary(getattr(args, "dataset", None), getattr(args, "algorithm", None),
+                                 getattr(args, "since", None))
+            print(f"{'dataset':>28} {'algorithm':>15} {'runs':>5} {'median_ms':>11} {'mean_ms':>11} "
+                  f"{'min_ms':>10} {'max_ms':>10} {'med_k':>6} {'min_k':>6}")
+            for r in rows:
+                print(f"{r['dataset']:>28} {r['algorithm']:>15} {r['runs']:>5} {r['median_ms']:>11.3f} "
+                      f"{r['mean_ms']:>11.3f} {r['min_ms']:>10.3f} {r['max_ms']:>10.3f} "
+                      f"{r['median_colors']:>6g} {r['min_colors']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+"""
+Parametrized experiment runner: datasets × algorithms × seeds
+每个数据集只加载一次（graph_cache），放进共享内存后由进程池中的 worker attach，
+各 (算法, seed) 任务并发执行；结果按 (数据集, seed) 合并成一行写入 results.sqlite（见 results_store.py），
+运行结束后再把本次的行追加到 results.csv 与 master_experiment_log.csv；--no-db 时退回直接追加 CSV。
+用法: python run_experiments.py [--datasets facebook_combined.txt twitter_combined.txt ...]
+                               [--algorithms delta_list delta_plus_one] [--seeds 42 | --num-seeds 50]
+                               [--processes 8] [--render [--sampler hubs] [--sample-n 50]] [--no-cache]
+Facebook.py / twitter.py / slashdot.py / gplus.py 与 "python experiment_workflow.py" 都是它的薄封装。
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+
+from csr_graph import connected_components
+from component_coloring import run_component_coloring
+from experiment_log import append_csv, env_info, fmt_ms
+from graph_cache import load_graph_cached
+from instrumentation import NULL_RECORDER, PhaseRecorder, flatten, flatten_memory
+from is_brooks_graph import classify_components, component_summary, graph_verdict
+from results_store import RESULTS_DB, ResultsStore
+from shared_graph import attach_arrays, graph_from_arrays, share_graph
+from visualization import (RENDER_TIMEOUT_S, SAMPLERS, VIS_SAMPLE_N, BackgroundRenderer, induced_sample,
+                           sample_dot, sample_vertices)
+from Δ_1_coloring_Algorithm import run_delta_plus_one_coloring
+from Δ_list_coloring_Algorithm import ListColoringError, run_delta_list_coloring
+
+DATASETS = ["facebook_combined.txt", "twitter_combined.txt", "Slashdot0811.txt", "gplus_combined.txt"]
+RESULT_CSV = "results.csv"
+MASTER_LOG = "master_experiment_log.csv"
+
+RESULTS_HEADER = [
+    "dataset", "n", "m", "Delta", "connected", "is_brooks", "k_delta_list", "t_delta_list_ms",
+    "k_delta_plus_1", "t_delta_plus_1_ms", "components", "seed",
+]
+MASTER_HEADER = [
+    "dataset", "n", "m", "Delta", "connected", "is_brooks",
+    "k_delta_list", "t_delta_list_ms",
+    "k_delta_plus_1", "t_delta_plus_1_ms",
+    "date_time", "python", "platform", "machine", "processor", "seed",
+    "cache_hit", "t_load_cold_ms", "t_load_cache_ms", "components", "bytes_per_edge",
+    "brooks_components", "complete_components", "odd_cycle_components", "t_brooks_ms",
+]
+# --instrument 时附加到总日志的 Δ-list-coloring 分阶段字段
+INSTRUMENT_PHASES = ["adjacency", "degree_scan", "greedy", "biconnected", "even_cycle", "whel", "theta",
+                     "complete_coloring", "structure_coloring", "degree_choosable"]
+INSTRUMENT_COUNTERS = ["vertices_visited", "edges_visited", "bfs_launches", "dfs_launches"]
+INSTRUMENT_HEADER = ["dl_branch"] + [
+    f"dl_{phase}_{clock}_ms" for phase in INSTRUMENT_PHASES for clock in ("wall", "cpu")
+] + [f"dl_{name}" for name in INSTRUMENT_COUNTERS]
+# --profile-memory 时附加的内存字段（MB）：主进程的数据集阶段 + 各算法在 worker 中的阶段
+MEMORY_STAGES = (["load", "brooks", "sample"]
+                 + [f"dl_{phase}" for phase in INSTRUMENT_PHASES]
+                 + ["dp1_adjacency", "dp1_coloring"])
+MEMORY_HEADER = [f"mem_{stage}_{kind}_mb" for stage in MEMORY_STAGES for kind in ("tm", "rss")]
+
+_worker = {}   # worker 端：数据集 → (arrays, handles)，每个数据集只 attach 一次
+
+
+# ======================================================================
+# 算法注册表：名字 → (CSV 列前缀, 调用)
+#    非连通图上的 Δ-list-coloring 按分量进行（worker 内不再嵌套进程池，也不插桩）；
+#    连通的非 Brooks 图（完全图、奇圈）Δ 色无解，同样交给 run_component_coloring 退回 (Δ+1)
+# ======================================================================
+def _delta_list(graph, seed, connected, instrument, profile_memory):
+    if connected:
+        try:
+            return run_delta_list_coloring(graph, instrument=instrument, profile_memory=profile_memory)
+        except ListColoringError:
+            pass
+    return run_component_coloring(graph, processes=1)
+
+
+def _delta_plus_one(graph, seed, connected, instrument, profile_memory):
+    return run_delta_plus_one_coloring(graph, seed=seed, profile_memory=profile_memory)
+
+
+ALGORITHMS = {
+    "delta_list": ("delta_list", "dl", _delta_list),
+    "delta_plus_one": ("delta_plus_1", "dp1", _delta_plus_one),
+}
+
+
+def _run_task(graph, algorithm, seed, connected, instrument=False, profile_memory=False, sample=None):
+    """sample: 需要渲染时为取样顶点数组，另回传这些顶点的颜色；否则为 None"""
+    res = ALGORITHMS[algorithm][2](graph, seed, connected, instrument, profile_memory)
+    # 只回传统计量（及插桩数据），不把颜色数组 pickle 回主进程
+    profile = {key: res[key] for key in ("branch", "phases", "counters") if key in res}
+    sample_colors = None if sample is None else [int(res["colors"][v]) for v in sample.tolist()]
+    return int(res["num_colors"]), float(res["elapsed_ms"]), profile, sample_colors
+
+
+def _pool_task(task):
+    dataset, spec, algorithm, seed, connected, instrument, profile_memory, sample = task
+    if dataset not in _worker:
+        _worker[dataset] = attach_arrays(spec)
+    graph = graph_from_arrays(_worker[dataset][0])
+    return (dataset, algorithm, seed) + _run_task(graph, algorithm, seed, connected, instrument, profile_memory,
+                                                  sample)
+
+
+# ======================================================================
+# 1. Dataset Loading + 3. Preprocessing（每个数据集一次）
+# ======================================================================
+def prepare_dataset(path, use_cache=True, rec=NULL_RECORDER):
+    """rec: 内存剖析时传入 PhaseRecorder(memory=True)，记录 load / brooks 两个阶段"""
+    with rec.phase('load'):
+        graph, _, load_stats = load_graph_cached(path, use_cache=use_cache)
+    t0 = time.perf_counter()
+    with rec.phase('brooks'):
+        # 连通分量只算一次，逐分量分类与整图判定共用同一份结果
+        classes = classify_components(graph, connected_components(graph))
+        kinds = component_summary(classes)
+        is_brooks, reason = graph_verdict(classes)
+    t_brooks = (time.perf_counter() - t0) * 1000.0
+    num_components = classes["num_components"]
+    info = {
+        "dataset": os.path.basename(path),
+        "n": graph.num_nodes,
+        "m": graph.num_edges,
+        "Delta": graph.max_degree(),
+        "connected": num_components == 1,
+        "components": num_components,
+        "component_kinds": kinds,
+        "t_brooks_ms": t_brooks,
+        "is_brooks": is_brooks,
+        "brooks_reason": reason,
+        "load_stats": load_stats,
+        "bytes_per_edge": graph.nbytes / max(graph.num_edges, 1),
+        "memory": rec.phases if rec.enabled else None,
+    }
+    print(f"[1] {info['dataset']} loaded → {info['n']} nodes, {info['m']} edges "
+          f"({load_stats['load_ms']:.2f} ms, {'cache hit' if load_stats['cache_hit'] else 'cold load'})")
+    print(f"[3] Δ = {info['Delta']}, {num_components} components "
+          f"({kinds['brooks']} Brooks, {kinds['complete']} complete, {kinds['odd_cycle']} odd cycles), "
+          f"Brooks graph? → {'Yes' if is_brooks else 'No'} ({reason})")
+    return graph, info
+
+
+def sample_for_render(graph, sampler="first_k", sample_n=VIS_SAMPLE_N, seed=None, rec=NULL_RECORDER):
+    """从邻接索引取样导出子图 (vertices, edges)，供着色完成后后台渲染"""
+    with rec.phase('sample'):
+        return induced_sample(graph, sample_vertices(graph, sample_n, sampler, seed))
+
+
+# ======================================================================
+# 6./7. Result Logging
+# ======================================================================
+def log_row(info, seed, by_algorithm, env, results_csv=RESULT_CSV, master_log=MASTER_LOG,
+            profiles=None, instrument=False, profile_memory=False, store=None):
+    """
+    profiles: {algorithm: 插桩数据}；instrument / profile_memory 决定附加哪些列。
+    store: ResultsStore 时整行写入数据库（一个事务）并返回实验 id，否则追加到两个 CSV
+    """
+    row = {
+        "dataset": info["dataset"],
+        "n": info["n"],
+        "m": info["m"],
+        "Delta": info["Delta"],
+        "connected": int(info["connected"]),
+        "is_brooks": int(info["is_brooks"]),
+        "components": info["components"],
+        "seed": seed,
+    }
+    for algorithm, (k, t) in by_algorithm.items():
+        prefix = ALGORITHMS[algorithm][0]
+        row[f"k_{prefix}"] = k
+        row[f"t_{prefix}_ms"] = f"{t:.3f}"
+    if store is None:
+        append_csv(results_csv, RESULTS_HEADER, row)
+
+    load_stats = info["load_stats"]
+    row.update({
+        "date_time": env["date_time"],
+        "python": env["python"],
+        "platform": env["platform"],
+        "machine": env["machine"],
+        "processor": env["processor"],
+        "cache_hit": int(load_stats["cache_hit"]),
+        "t_load_cold_ms": fmt_ms(load_stats["cold_load_ms"]),
+        "t_load_cache_ms": fmt_ms(load_stats["cache_ms"]),
+        "bytes_per_edge": f"{info['bytes_per_edge']:.2f}",
+        "t_brooks_ms": f"{info['t_brooks_ms']:.3f}",
+    })
+    row.update({f"{kind}_components": count for kind, count in info["component_kinds"].items()})
+    profiles = profiles or {}
+    if instrument:
+        row.update(flatten(profiles.get("delta_list", {}), prefix="dl_"))
+    if profile_memory:
+        row.update(flatten_memory({"phases": info["memory"] or {}}, prefix="mem_"))
+        for algorithm, profile in profiles.items():
+            row.update(flatten_memory(profile, prefix=f"mem_{ALGORITHMS[algorithm][1]}_"))
+    if store is None:
+        append_csv(master_log, master_header(instrument, profile_memory), row)
+        return None
+    return store.add_experiment(row, by_algorithm)
+
+
+def master_header(instrument=False, profile_memory=False):
+    """总日志的列：基本列，--instrument 时加上 INSTRUMENT_HEADER，--profile-memory 时加上 MEMORY_HEADER"""
+    header = MASTER_HEADER
+    if instrument:
+        header = header + INSTRUMENT_HEADER
+    if profile_memory:
+        header = header + MEMORY_HEADER
+    return header
+
+
+# ======================================================================
+# 5. Execute Coloring Algorithms（任务矩阵）
+# ======================================================================
+def run_matrix(datasets, algorithms=tuple(ALGORITHMS), seeds=(42,), processes=None, use_cache=True,
+               results_csv=RESULT_CSV, master_log=MASTER_LOG, images=None, instrument=False, trace=None,
+               profile_memory=False, sampler="first_k", sample_n=VIS_SAMPLE_N, render_timeout=RENDER_TIMEOUT_S,
+               results_db=RESULTS_DB):
+    """
+    运行 datasets × algorithms × seeds 的全部组合。
+    - processes: worker 数，默认 os.cpu_count()；1 表示在当前进程内依次执行
+    - images: {数据集路径: 输出前缀}，需要渲染样例子图的数据集
+    - sampler / sample_n: 样例子图的取样方式（first_k / bfs / hubs / random，见 visualization.py）与顶点数；
+      顶点按第一个 (算法, seed) 的着色上色，该任务完成后交给后台线程渲染，着色与写日志不等待 Graphviz
+    - render_timeout: 每张图的渲染超时（秒）；run_matrix 返回前最多等待这么久
+    - instrument: Δ-list-coloring 分阶段插桩，字段写入总日志（dl_*）
+    - trace: 可选的 JSON lines 文件路径，每个任务写一行（含插桩数据），隐含 instrument=True
+    - profile_memory: 内存剖析（tracemalloc + 峰值 RSS），加载 / Brooks 判定 / 取样及各算法阶段写入 mem_* 列；
+      tracemalloc 会明显拖慢运行，此模式下的计时只作参考
+    - results_db: 结果库路径；每行在一个 SQLite 事务中写入，多个 run_matrix 同时运行也不会写坏；
+      结束时（包括中断）把本次写入的行追加到 results_csv 与 master_log，CSV 中已有的行保持不动。
+      库为空而 master_log 已存在时先导入它（判断与导入在同一个事务里）。
+      None 时不用数据库，直接追加两个 CSV
+    每个 (数据集, seed) 的全部算法完成后立即写一行日志，中途中断也不会丢失已完成的部分。
+    返回 {(dataset, seed): {algorithm: (num_colors, elapsed_ms)}}
+    """
+    processes = processes or os.cpu_count() or 1
+    images = images or {}
+    instrument = instrument or trace is not None
+    env = env_info()
+    infos = {}
+    pending = {}
+    profiles = {}
+    done = {}
+    samples = {}
+    logged = []
+    store = None
+    if results_db:
+        store = ResultsStore(results_db)
+        if os.path.exists(master_log):
+            store.import_csv(master_log, {prefix: name for name, (prefix, _, _) in ALGORITHMS.items()},
+                             only_if_empty=True)
+    renderer = BackgroundRenderer(timeout=render_timeout) if images else None
+    trace_file = open(trace, "a", encoding="utf-8") if trace else None
+
+    def sample(path, graph, rec):
+        if path not in images:
+            return None
+        samples[path] = sample_for_render(graph, sampler, sample_n, seeds[0], rec)
+        return samples[path][0]
+
+    def collect(dataset, algorithm, seed, k, t, profile, sample_colors=None):
+        if sample_colors is not None:
+            vertices, edges = samples[dataset]
+            renderer.submit(sample_dot(vertices, edges, sample_colors, f"{algorithm} seed={seed}"), images[dataset])
+        by_algorithm = pending.setdefault((dataset, seed), {})
+        by_algorithm[algorithm] = (k, t)
+        if instrument or profile_memory:
+            profiles.setdefault((dataset, seed), {})[algorithm] = profile
+        if trace_file is not None:
+            record = {"dataset": infos[dataset]["dataset"], "seed": seed, "algorithm": algorithm,
+                      "num_colors": k, "elapsed_ms": t}
+            record.update(profile)
+            trace_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            trace_file.flush()
+        if len(by_algorithm) == len(algorithms):
+            info = infos[dataset]
+            ordered = {a: by_algorithm[a] for a in algorithms}
+            print(f"[5] {info['dataset']} seed={seed}: " + ", ".join(
+                f"{a} → {k} colors, {t:.3f} ms" for a, (k, t) in ordered.items()))
+            experiment_id = log_row(info, seed, ordered, env, results_csv, master_log,
+                                    profiles=profiles.pop((dataset, seed), None),
+                                    instrument=instrument, profile_memory=profile_memory, store=store)
+            if experiment_id is not None:
+                logged.append(experiment_id)
+            done[(info['dataset'], seed)] = ordered
+            del pending[(dataset, seed)]
+
+    try:
+        _execute(datasets, algorithms, seeds, processes, use_cache, sample, (instrument, profile_memory),
+                 infos, collect)
+    finally:
+        if trace_file is not None:
+            trace_file.close()
+        try:
+            # 先写 CSV：renderer.close() 要等后台渲染全部结束（最长为各自的超时），不能挡在日志前面
+            if store is not None:
+                store.append_to_csv(master_log, logged, master_header(instrument, profile_memory))
+                store.append_to_csv(results_csv, logged, RESULTS_HEADER, extend=False)
+                store.close()
+        finally:
+            if renderer is not None:
+                renderer.close()
+    return done
+
+
+def _prepare(path, use_cache, sample, profile_memory):
+    """加载数据集并按需取样；内存剖析时 load / brooks / sample 三个阶段记入 info["memory"]"""
+    rec = PhaseRecorder(memory=True) if profile_memory else NULL_RECORDER
+    graph, info = prepare_dataset(path, use_cache, rec)
+    vertices = sample(path, graph, rec)
+    if rec.enabled:
+        rec.close()
+    return graph, info, vertices
+
+
+def _execute(datasets, algorithms, seeds, processes, use_cache, sample, flags, infos, collect):
+    """
+    flags: (instrument, profile_memory)，原样传给每个任务。
+    sample(path, graph, rec) 返回需要上色的取样顶点（不渲染时为 None），只随第一个 (算法, seed) 任务下发
+    """
+    def vis(vertices, algorithm, seed):
+        return vertices if (algorithm, seed) == (algorithms[0], seeds[0]) else None
+
+    if processes == 1:
+        for path in datasets:
+            graph, infos[path], vertices = _prepare(path, use_cache, sample, flags[1])
+            for seed in seeds:
+                for algorithm in algorithms:
+                    collect(path, algorithm, seed,
+                            *_run_task(graph, algorithm, seed, infos[path]["connected"], *flags,
+                                       sample=vis(vertices, algorithm, seed)))
+        return
+
+    shared = []
+    pool = None
+    try:
+        results = []
+        for path in datasets:
+            graph, infos[path], vertices = _prepare(path, use_cache, sample, flags[1])
+            arrays = share_graph(graph)
+            shared.append(arrays)
+            if pool is None:
+                # 在第一块共享内存创建之后再启动进程池：worker 与主进程共用同一个 resource_tracker，
+                # 否则 worker 退出时各自的 tracker 会提前 unlink 共享内存
+                pool = mp.Pool(processes)
+            tasks = [(path, arrays.spec, algorithm, seed, infos[path]["connected"]) + flags
+                     + (vis(vertices, algorithm, seed),)
+                     for seed in seeds for algorithm in algorithms]
+            # 提交后立即返回：下一个数据集的加载与本数据集的着色重叠进行
+            results.append(pool.imap_unordered(_pool_task, tasks))
+        for result in results:
+            for item in result:
+                collect(*item)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        for arrays in shared:
+            arrays.close()
+
+
+def run_single(path, image_out=None, seed=42, use_cache=True, processes=None,
+               results_csv=RESULT_CSV, master_log=MASTER_LOG):
+    """单个数据集、单个 seed 的完整实验（各数据集脚本的入口）"""
+    return run_matrix([path], seeds=[seed], processes=processes, use_cache=use_cache,
+                      results_csv=results_csv, master_log=master_log,
+                      images={path: image_out} if image_out else None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--datasets", nargs="+", default=DATASETS)
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    seeds = parser.add_mutually_exclusive_group()
+    seeds.add_argument("--seeds", nargs="+", type=int, default=[42])
+    seeds.add_argument("--num-seeds", type=int, help="使用 seed = 0 .. N-1")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--render", action="store_true", help="为每个数据集渲染 <name>_sample.png（后台进行）")
+    parser.add_argument("--sampler", choices=SAMPLERS, default="first_k", help="样例子图的取样方式")
+    parser.add_argument("--sample-n", type=int, default=VIS_SAMPLE_N, help="样例子图的顶点数")
+    parser.add_argument("--render-timeout", type=float, default=RENDER_TIMEOUT_S, help="每张图的渲染超时（秒）")
+    parser.add_argument("--no-cache", action="store_true", help="忽略 CSR 缓存，强制冷加载")
+    parser.add_argument("--instrument", action="store_true", help="Δ-list-coloring 分阶段计时与计数，写入总日志")
+    parser.add_argument("--trace", default=None, help="插桩数据以 JSON lines 追加到该文件（隐含 --instrument）")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="tracemalloc + 峰值 RSS 内存剖析，写入总日志 mem_* 列（会拖慢运行）")
+    parser.add_argument("--results", default=RESULT_CSV)
+    parser.add_argument("--master-log", default=MASTER_LOG)
+    parser.add_argument("--db", default=RESULTS_DB, help="SQLite 结果库（运行结束时本次的行追加到 CSV）")
+    parser.add_argument("--no-db", action="store_true", help="不用结果库，直接追加 CSV（旧行为）")
+    args = parser.parse_args(argv)
+
+    seed_list = list(range(args.num_seeds)) if args.num_seeds else args.seeds
+    images = None
+    if args.render:
+        images = {p: os.path.splitext(os.path.basename(p))[0] + "_sample" for p in args.datasets}
+    done = run_matrix(args.datasets, args.algorithms, seed_list, args.processes,
+                      use_cache=not args.no_cache, results_csv=args.results,
+                      master_log=args.master_log, images=images,
+                      instrument=args.instrument, trace=args.trace,
+                      profile_memory=args.profile_memory, sampler=args.sampler,
+                      sample_n=args.sample_n, render_timeout=args.render_timeout,
+                      results_db=None if args.no_db else args.db)
+    target = f"{args.results} and {args.master_log}"
+    if not args.no_db:
+        target = f"{args.db} (appended to {target})"
+    print(f"\n[7] {len(done)} rows written to {target}")
+
+
+if __name__ == "__main__":
+    main()
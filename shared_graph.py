@@ -0,0 +1,62 @@
+import numpy as np
+
+from csr_graph import CSRGraph
+
+
+class SharedArrays:
+    """
+    把一组 NumPy 数组放进 multiprocessing.shared_memory，worker 只需拿到 spec 即可按名字 attach，
+    不再 pickle 邻接表。创建方负责 close()（同时 unlink）。
+    """
+
+    def __init__(self, arrays):
+        from multiprocessing import shared_memory
+
+        self._shms = []
+        self.spec = {}
+        self.arrays = {}
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+            view[...] = arr
+            self._shms.append(shm)
+            self.spec[name] = (shm.name, arr.shape, arr.dtype.str)
+            self.arrays[name] = view
+
+    def close(self):
+        self.arrays = {}
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_arrays(spec):
+    """worker 端：按 spec attach 共享数组，返回 (arrays, handles)；handles 需保持引用直到不再使用"""
+    from multiprocessing import shared_memory
+
+    handles = []
+    arrays = {}
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        handles.append(shm)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    return arrays, handles
+
+
+def share_graph(graph, **extra):
+    """CSRGraph（及附加数组，如 colors / priority）放进共享内存"""
+    arrays = {'indptr': graph.indptr, 'indices': graph.indices, 'degree': graph.degree}
+    arrays.update(extra)
+    return SharedArrays(arrays)
+
+
+def graph_from_arrays(arrays):
+    return CSRGraph(arrays['indptr'], arrays['indices'], arrays['degree'])
@@ -0,0 +1,106 @@
+import time
+
+import numpy as np
+
+from csr_graph import as_csr, gather_segments
+from first_fit import batch_smallest
+
+
+def split_by_priority(adj, priority):
+    """
+    按优先级把邻接拆成两份 CSR：hp（更高优先级的邻居）与 lp（更低优先级的邻居）。
+    返回 (hp_ptr, hp_idx, lp_ptr, lp_idx)
+    """
+    adj = as_csr(adj)
+    return _split_rows(adj, np.asarray(priority)[None, :])
+
+
+def _split_rows(adj, priority):
+    """
+    priority 为 (S, n)：S 份图副本各自的优先级，拆分结果按不相交并编号（第 k 份顶点加 k·n）。
+    - 边按 src 升序展开，priority[src] 用 repeat 生成，只有 priority[dst] 一次随机 gather
+    - 每个顶点的 hp 邻居数按 indptr 分段求和（reduceat），lp 邻居数 = 度数 - hp
+    """
+    S, n = priority.shape
+    degree = np.asarray(adj.degree, dtype=np.int64)
+    indices = np.asarray(adj.indices)
+    higher = priority[:, indices] > np.repeat(priority, degree, axis=1)
+    hp = np.zeros((S, n), dtype=np.int64)
+    nz = np.flatnonzero(degree)
+    if len(nz):
+        # 只对非空段做 reduceat：空段会被 reduceat 误取成下一个元素
+        hp[:, nz] = np.add.reduceat(higher, np.asarray(adj.indptr)[nz], axis=1, dtype=np.int64)
+    idx = indices if S == 1 else indices + (np.arange(S, dtype=np.int64) * n)[:, None]
+    parts = []
+    for count, mask in ((hp, higher), (degree - hp, ~higher)):
+        ptr = np.zeros(S * n + 1, dtype=np.int64)
+        np.cumsum(count.ravel(), out=ptr[1:])
+        parts += [ptr, np.broadcast_to(idx, mask.shape)[mask]]
+    return tuple(parts)
+
+
+def vectorized_delta_plus_one_coloring(adj, seed=None):
+    """
+    单进程、按轮次的 NumPy (Δ+1)-coloring（Jones–Plassmann 的向量化实现）。
+    - waiting[v] = v 尚未着色的更高优先级邻居数；waiting == 0 的顶点就是未着色顶点中的局部最大值，
+      它们两两不相邻，构成一个独立集
+    - 每轮对整个独立集一次性取色：拼接其高优先级邻居的颜色，按顶点求 mex（first_fit.batch_smallest）
+    - 再把这批顶点的低优先级邻居的 waiting 一次 scatter 减 1，减到 0 的顶点进入下一轮
+    每条边在整个过程中只被读取两次，总工作量 O(n + m)；颜色 ≤ 度数，因此不超过 Δ+1 色。
+    结果等价于按优先级从高到低的串行贪心，同一 seed 可复现。
+    返回 (colors, rounds)
+    """
+    adj = as_csr(adj)
+    priority = np.random.default_rng(seed).permutation(len(adj))
+    return _jones_plassmann(len(adj), *split_by_priority(adj, priority))
+
+
+def _jones_plassmann(n, hp_ptr, hp_idx, lp_ptr, lp_idx):
+    colors = np.full(n, -1, dtype=np.int32)
+    waiting = np.diff(hp_ptr)
+    winners = np.flatnonzero(waiting == 0)
+    rounds = 0
+    while len(winners):
+        counts, nbrs = gather_segments(hp_ptr, hp_idx, winners)
+        colors[winners] = batch_smallest(counts, colors[nbrs])
+        _, lower = gather_segments(lp_ptr, lp_idx, winners)
+        np.subtract.at(waiting, lower, 1)
+        winners = np.unique(lower[waiting[lower] == 0])
+        rounds += 1
+    return colors, rounds
+
+
+def batched_delta_plus_one_coloring(adj, seeds):
+    """
+    多个种子一次跑完：把 S 份图副本拼成不相交并（第 k 份顶点编号加 k·n），
+    每份使用自己种子的随机优先级，再对整个并图执行一遍按轮次的 Jones–Plassmann。
+    副本之间没有边，因此每份的结果与单独调用 vectorized_delta_plus_one_coloring(adj, seed) 完全相同；
+    轮数取各副本的最大值，每轮的 NumPy 调用开销由 S 个种子分摊。
+    返回 (colors, rounds)；colors 形状为 (S, n)
+    """
+    adj = as_csr(adj)
+    n = len(adj)
+    S = len(seeds)
+    priority = np.empty((S, n), dtype=np.int64)
+    for k, seed in enumerate(seeds):
+        priority[k] = np.random.default_rng(seed).permutation(n)
+    colors, rounds = _jones_plassmann(S * n, *_split_rows(adj, priority))
+    return colors.reshape(S, n), rounds
+
+
+def run_vectorized_delta_plus_one_coloring(adj, seed=None):
+    """
+    与 run_delta_plus_one_coloring 相同的结果字典（colors / num_colors / elapsed_ms），另附 rounds。
+    - adj: CSRGraph 或 list-of-lists 邻接表（后者经适配器转换，不计入耗时）
+    - seed: 随机优先级的种子；None 则使用系统随机源
+    """
+    adj = as_csr(adj)
+    t0 = time.perf_counter()
+    colors, rounds = vectorized_delta_plus_one_coloring(adj, seed)
+    t1 = time.perf_counter()
+    return {
+        'colors': colors,
+        'num_colors': len(np.unique(colors)) if len(colors) else 0,
+        'elapsed_ms': (t1 - t0) * 1000.0,
+        'rounds': rounds,
+    }
@@ -0,0 +1,193 @@
+"""
+Sample-subgraph visualization
+从 CSR 邻接索引取样少量顶点（first_k / bfs / hubs / random），只展开这些顶点的邻接段得到导出子图，
+按着色结果给顶点上色后生成 DOT，交给后台线程调用 Graphviz 可执行文件渲染（带超时），
+调用方（着色、写日志）不必等待渲染完成。
+用法: python visualization.py facebook_combined.txt [--sampler hubs] [--sample-n 50] [--timeout 60]
+"""
+import argparse
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from csr_graph import as_csr, gather_segments
+
+SAMPLERS = ('first_k', 'bfs', 'hubs', 'random')
+VIS_SAMPLE_N = 50
+RENDER_ENGINE = 'neato'
+RENDER_TIMEOUT_S = 60.0
+GOLDEN_RATIO = 0.618033988749895
+
+
+# ------------------------------------------------------------
+# 取样
+# ------------------------------------------------------------
+def _bfs_ball(adj, k, root):
+    """从 root 出发按层扩展，取前 k 个顶点（最后一层按编号截断）；分量不足 k 个顶点时只返回整个分量"""
+    seen = np.zeros(len(adj), dtype=bool)
+    seen[root] = True
+    frontier = np.array([root], dtype=np.int64)
+    parts, total = [frontier], 1
+    while total < k and len(frontier):
+        _, nbrs = gather_segments(adj.indptr, adj.indices, frontier)
+        frontier = np.unique(nbrs[~seen[nbrs]])[:k - total]
+        seen[frontier] = True
+        parts.append(frontier)
+        total += len(frontier)
+    return np.concatenate(parts)
+
+
+def sample_vertices(adj, k=VIS_SAMPLE_N, method='first_k', seed=None, root=None):
+    """
+    取 k 个顶点，返回升序的顶点数组：
+    - first_k: 编号最小的 k 个（原脚本的做法）
+    - bfs: 以 root（默认度数最大的顶点）为中心的 BFS 球
+    - hubs: 度数最大的 k 个
+    - random: 均匀随机（seed 可复现）
+    """
+    adj = as_csr(adj)
+    n = len(adj)
+    k = min(k, n)
+    if method == 'first_k':
+        vs = np.arange(k)
+    elif method == 'bfs':
+        vs = _bfs_ball(adj, k, int(np.argmax(adj.degree)) if root is None else root) if k else np.arange(0)
+    elif method == 'hubs':
+        vs = np.argpartition(-np.asarray(adj.degree, dtype=np.int64), k - 1)[:k] if k else np.arange(0)
+    elif method == 'random':
+        vs = np.random.default_rng(seed).choice(n, k, replace=False)
+    else:
+        raise ValueError(f"未知的取样方式 {method!r}，可选 {', '.join(SAMPLERS)}")
+    return np.sort(vs).astype(np.int64)
+
+
+def induced_sample(adj, vertices):
+    """
+    取样顶点上的导出子图，只读这些顶点的邻接段，不遍历全部边。
+    返回 (vertices（升序）, edges)：edges 为 (E, 2) 的全局编号数组，每条边 u < v 出现一次
+    """
+    adj = as_csr(adj)
+    sub, vs = adj.induced_subgraph(vertices)
+    src, dst = sub.edge_arrays()
+    keep = src < dst
+    return vs, np.stack([vs[src[keep]], vs[dst[keep]]], axis=1)
+
+
+# ------------------------------------------------------------
+# DOT 与渲染
+# ------------------------------------------------------------
+def color_fill(c):
+    """颜色编号 → Graphviz 的 "H S V" 填充色；黄金分割步长让相邻编号的色相差得足够远，未着色为白色"""
+    if c < 0:
+        return "0 0 1"
+    return f"{(c * GOLDEN_RATIO) % 1.0:.3f} 0.55 0.95"
+
+
+def sample_dot(vertices, edges, colors=None, name="sample"):
+    """
+    生成无向图的 DOT 源码。
+    - colors: 与 vertices 对齐的颜色编号（可选）；给出时按颜色填充并在标签中注明颜色
+    """
+    lines = [f"graph \"{name}\" {{", "  overlap=false; splines=true;",
+             "  node [shape=circle, style=filled, fontsize=10];"]
+    for i, v in enumerate(vertices.tolist()):
+        if colors is None:
+            lines.append(f"  {v} [fillcolor=\"0 0 1\"];")
+        else:
+            c = int(colors[i])
+            lines.append(f"  {v} [fillcolor=\"{color_fill(c)}\", xlabel=\"c{c}\"];")
+    lines += [f"  {u} -- {v};" for u, v in edges.tolist()]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def render_dot(source, image_out, engine=RENDER_ENGINE, timeout=RENDER_TIMEOUT_S, fmt="png"):
+    """
+    调用 Graphviz 可执行文件把 DOT 渲染为 <image_out>.<fmt>；超时即结束子进程。
+    返回 dict：image / ok / elapsed_ms / error（成功时为 None）
+    """
+    path = f"{image_out}.{fmt}"
+    t0 = time.perf_counter()
+    error = None
+    try:
+        subprocess.run([engine, f"-T{fmt}", "-o", path], input=source.encode("utf-8"),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout, check=True)
+    except subprocess.TimeoutExpired:
+        error = f"timed out after {timeout:g} s"
+    except subprocess.CalledProcessError as e:
+        error = e.stderr.decode("utf-8", "replace").strip() or f"exit status {e.returncode}"
+    except OSError as e:
+        error = str(e)
+    return {
+        'image': path,
+        'ok': error is None,
+        'elapsed_ms': (time.perf_counter() - t0) * 1000.0,
+        'error': error,
+    }
+
+
+class BackgroundRenderer:
+    """
+    后台渲染：submit 立即返回 Future，渲染在工作线程中进行（Graphviz 是外部进程，不占 GIL）。
+    - timeout: 每个渲染任务的超时（秒）
+    - verbose: 渲染结束时打印 [6] 结果行
+    close() 等待已提交的任务结束，最长为各自的超时。
+    """
+
+    def __init__(self, engine=RENDER_ENGINE, timeout=RENDER_TIMEOUT_S, workers=1, verbose=True):
+        self.engine = engine
+        self.timeout = timeout
+        self.verbose = verbose
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self.results = []
+
+    def submit(self, source, image_out):
+        future = self._executor.submit(render_dot, source, image_out, self.engine, self.timeout)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        result = future.result()
+        with self._lock:
+            self.results.append(result)
+        if self.verbose:
+            if result['ok']:
+                print(f"[6] Rendered → {result['image']} ({result['elapsed_ms']:.1f} ms, background)")
+            else:
+                print(f"[6] Warning: Graphviz render of {result['image']} failed: {result['error']}")
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def main(argv=None):
+    from graph_cache import load_graph_cached
+    from Δ_1_coloring_Algorithm import run_delta_plus_one_coloring
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("dataset")
+    parser.add_argument("--sampler", choices=SAMPLERS, default="first_k")
+    parser.add_argument("--sample-n", type=int, default=VIS_SAMPLE_N)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--engine", default=RENDER_ENGINE)
+    parser.add_argument("--timeout", type=float, default=RENDER_TIMEOUT_S)
+    parser.add_argument("--out", default=None, help="输出前缀，默认 <数据集名>_<sampler>_sample")
+    args = parser.parse_args(argv)
+
+    graph, _, _ = load_graph_cached(args.dataset)
+    vertices, edges = induced_sample(graph, sample_vertices(graph, args.sample_n, args.sampler, args.seed))
+    colors = np.asarray(run_delta_plus_one_coloring(graph, seed=args.seed)['colors'])[vertices]
+    out = args.out or f"{os.path.splitext(os.path.basename(args.dataset))[0]}_{args.sampler}_sample"
+    print(f"{args.sampler}: {len(vertices)} vertices, {len(edges)} edges, {len(set(colors.tolist()))} colors")
+    renderer = BackgroundRenderer(args.engine, args.timeout)
+    renderer.submit(sample_dot(vertices, edges, colors, out), out)
+    renderer.close()
+
+
+if __name__ == "__main__":
+    main()
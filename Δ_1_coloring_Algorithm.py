@@ -1,50 +1,86 @@
-def run_delta_plus_one_coloring(adj, seed=None, randomize_order=True, random_tiebreak=False):
+from color_reduction import apply_reduction
+from csr_graph import as_csr
+from first_fit import FirstFit
+from instrumentation import NULL_RECORDER, PhaseRecorder
+from orderings import dsatur_coloring, vertex_order
+
+
+def run_delta_plus_one_coloring(adj, seed=None, randomize_order=True, random_tiebreak=False,
+                                profile_memory=False, order=None, reduce_ms=None):
     """
     (Δ+1)-coloring with optional randomness.
+    - adj: CSRGraph 或 list-of-lists 邻接表（后者经适配器转换）
     - seed: int|None  固定随机种子（可复现）；None 则使用系统随机源
     - randomize_order: 是否随机化顶点着色顺序（默认 True）
     - random_tiebreak: 当有多个可用颜色时是否随机选择（默认 False -> 选最小颜色）
+    - profile_memory: 内存剖析模式，结果另附 phases（adjacency / coloring 的 tm_peak_mb、rss_peak_mb）
+    - order: 顶点顺序策略，覆盖 randomize_order：'random' / 'identity' / 'largest_first' / 'smallest_last' /
+      'dsatur'（见 orderings.py）或显式的顶点序列；None 时按 randomize_order 取随机或 0..n-1。
+      给出时结果另附 order_ms（计算顺序的耗时，已含在 elapsed_ms 内）
+    - reduce_ms: 着色后做 Kempe 链减色后处理的墙钟预算（毫秒，见 color_reduction.py）；
+      结果另附 reduction，colors / num_colors 为减色后的值，elapsed_ms 不含后处理
     """
     import time, random
 
     # 局部随机源，避免污染全局 random
     rng = random.Random(seed) if seed is not None else random
 
-    def delta_plus_one_coloring(adj):
-        n = len(adj)
-        Delta = max(len(adj[v]) for v in range(n)) if n > 0 else 0
-        colors = [-1] * n
+    rec = PhaseRecorder(memory=True) if profile_memory else NULL_RECORDER
+    with rec.phase('adjacency'):
+        adj = as_csr(adj)
 
-        # 顶点顺序：默认随机；否则为 0..n-1
+    def vertex_sequence(n):
+        # 顶点顺序：默认随机；否则为 0..n-1；order 给出时按对应策略
+        if order not in (None, 'random', 'identity'):
+            return vertex_order(adj, order)
         vertices = list(range(n))
-        if randomize_order:
+        if order == 'random' or (order is None and randomize_order):
             rng.shuffle(vertices)
+        return vertices
+
+    def delta_plus_one_coloring(adj, vertices):
+        n = len(adj)
+        Delta = adj.max_degree()
+        colors = [-1] * n
+        ptr, idx = adj.neighbor_views()
 
+        # O(deg(v)) 取色：不再为每个顶点构造长度 Δ+1 的候选列表
+        ff = FirstFit(Delta + 1)
         for v in vertices:
-            used = {colors[u] for u in adj[v] if colors[u] != -1}
-            # 可用颜色集合
-            available = [c for c in range(Delta + 1) if c not in used]
-            if not available:
-                # 理论上不会发生（Δ+1 保证存在可用颜色）
-                # 兜底：扩展色域
-                c = Delta + 1
+            nbrs = idx[ptr[v]:ptr[v + 1]]
+            if random_tiebreak:
+                c = ff.random_free(nbrs, colors, rng)
             else:
-                if random_tiebreak:
-                    c = rng.choice(available)
-                else:
-                    c = min(available)
+                c = ff.smallest(nbrs, colors)
+            # c == Δ+1 理论上不会发生（Δ+1 保证存在可用颜色），此时即为扩展色域的兜底
             colors[v] = c
         return colors
 
-    t0 = time.perf_counter()
-    colors = delta_plus_one_coloring(adj)
-    t1 = time.perf_counter()
+    with rec.phase('coloring'):
+        t0 = time.perf_counter()
+        if order == 'dsatur':
+            # DSATUR 的顺序依赖已着颜色，选点与取色交替进行，顺序耗时无法单独计
+            colors, _ = dsatur_coloring(adj)
+            t_order = t0
+        else:
+            vertices = vertex_sequence(len(adj))
+            t_order = time.perf_counter()
+            colors = delta_plus_one_coloring(adj, vertices)
+        t1 = time.perf_counter()
 
     num_colors = len(set(colors)) if colors else 0
     elapsed_ms = (t1 - t0) * 1000.0
 
-    return {
+    result = {
         'colors': colors,
         'num_colors': num_colors,
         'elapsed_ms': elapsed_ms
     }
+    if order is not None:
+        result['order_ms'] = (t_order - t0) * 1000.0
+    if reduce_ms is not None:
+        apply_reduction(result, adj, reduce_ms, seed)
+    if rec.enabled:
+        rec.close()
+        result['phases'] = rec.phases
+    return result
@@ -1,146 +1,378 @@
 from collections import deque
 import time
 
+import numpy as np
 
-def run_delta_list_coloring(adj):
+from block_cut_tree import biconnected_components
+from color_reduction import apply_reduction
+from csr_graph import as_csr
+from first_fit import BitsetPalettes, FirstFit
+from instrumentation import NULL_RECORDER, PhaseRecorder
+from orderings import dsatur_coloring, vertex_order
+
+
+class ListColoringError(ValueError):
+    """列表着色无解：各分量最后都退化成剩余列表相同的完全图或奇圈（Gallai 树配上「坏」列表）"""
+
+
+def run_delta_list_coloring(adj, instrument=False, trace=None, profile_memory=False, lists=None, order=None,
+                            reduce_ms=None):
+    """
+    - adj: CSRGraph 或 list-of-lists（后者经适配器转换，不计入耗时）
+    - lists: 可选的逐顶点可用颜色列表（列表的序列、CSR 形式的 (ptr, idx) 或 BitsetPalettes），
+      要求 |L(v)| ≥ deg(v)；给出时做真正的列表着色，否则所有顶点的色域都是 range(Δ)
+    - order: 非正则（贪心）分支的顶点顺序：'largest_first' / 'smallest_last' / 'dsatur' 或显式序列，
+      见 greedy_coloring_nonregular
+    - reduce_ms: 着色后做 Kempe 链减色后处理的墙钟预算（毫秒，见 color_reduction.py）；
+      结果另附 reduction，colors / num_colors 为减色后的值，elapsed_ms 不含后处理。
+      后处理只保证着色合法、不看逐顶点列表，因此不能与 lists 同时使用
+    - instrument: 为 True 时结果中另附 branch / phases（每阶段 wall_ms、cpu_ms、calls）/ counters
+      （vertices_visited、edges_visited、bfs_launches、dfs_launches）
+    - trace: 可选的文本文件对象，插桩数据按 JSON lines 实时写入（隐含 instrument=True）
+    - profile_memory: 内存剖析模式（隐含 instrument=True），每个阶段另记 tm_peak_mb / rss_peak_mb，
+      adjacency 阶段为邻接表到 CSR 的转换
+    """
+    if reduce_ms is not None and lists is not None:
+        raise ValueError("reduce_ms 不能与 lists 同时使用：减色后处理不遵守逐顶点的可用颜色列表")
+    if instrument or trace is not None or profile_memory:
+        rec = PhaseRecorder(stream=trace, memory=profile_memory)
+    else:
+        rec = NULL_RECORDER
+    with rec.phase('adjacency'):
+        adj = as_csr(adj)
+        palettes = as_palettes(lists, len(adj))
     t0 = time.perf_counter()
-    colors = delta_list_coloring(adj)
+    colors = delta_list_coloring(adj, rec, palettes, order)
     t1 = time.perf_counter()
     num_colors = len(set(colors))
     elapsed_ms = (t1 - t0) * 1000
-    return {
+    result = {
         'colors': colors,
         'num_colors': num_colors,
         'elapsed_ms': elapsed_ms
     }
+    if rec.enabled:
+        rec.close()
+        result.update(rec.to_dict())
+    if reduce_ms is not None:
+        apply_reduction(result, adj, reduce_ms)
+    return result
+
 
+def as_palettes(lists, n):
+    """列表着色的输入统一转成 BitsetPalettes；lists 为 None 时返回 None（色域 range(Δ)）"""
+    if lists is None or isinstance(lists, BitsetPalettes):
+        palettes = lists
+    else:
+        palettes = BitsetPalettes.from_lists(lists)
+    if palettes is not None and len(palettes) != n:
+        raise ValueError(f"颜色列表个数 {len(palettes)} 与顶点数 {n} 不一致")
+    return palettes
 
-def delta_list_coloring(adj):
+
+def delta_list_coloring(adj, rec=NULL_RECORDER, palettes=None, order=None):
+    """
+    - palettes: BitsetPalettes 时为列表着色：每个顶点只从自己的列表取色，要求 |L(v)| ≥ deg(v)。
+      「非正则」推广为存在 |L(v)| > deg(v) 的顶点（它作为贪心 BFS 的根），全部取等号时走子结构分支
+    正则分支先给子结构以外的顶点按朝向子结构的 BFS 逆序着色（父节点尚未着色，Δ 色 / 自己的列表一定够用），
+    子结构最后按剩余列表着色（color_structure）。贪心或补全覆盖不到的分量（图不连通）、
+    没有子结构可用时由 degree_choosable_coloring 着色；无解（Gallai 树配上「坏」列表）时抛出 ListColoringError
+    """
+    adj = as_csr(adj)
     n = len(adj)
-    degrees = [len(neigh) for neigh in adj]
-    Delta = max(degrees)
+    with rec.phase('degree_scan'):
+        Delta = adj.max_degree()
+        if palettes is None:
+            nonregular = bool((adj.degree < Delta).any())
+        else:
+            short = np.flatnonzero(palettes.size < adj.degree)
+            if len(short):
+                raise ValueError(f"{len(short)} 个顶点的颜色列表小于其度数（例如顶点 {int(short[0])}）")
+            nonregular = bool((palettes.size > adj.degree).any())
+    rec.count('vertices_visited', n)
 
-    if any(degree < Delta for degree in degrees):
-        return greedy_coloring_nonregular(adj, Delta)
+    if nonregular:
+        rec.set_branch('greedy')
+        with rec.phase('greedy'):
+            colors = greedy_coloring_nonregular(adj, Delta, rec, palettes, order)
+        if -1 in colors:
+            # BFS 只覆盖了根所在的分量
+            with rec.phase('degree_choosable'):
+                degree_choosable_coloring(adj, palettes, rec, colors, Delta)
+        return colors
 
-    biconn = dfs_biconnected(adj)
+    with rec.phase('biconnected'):
+        bct = biconnected_components(adj, rec)
+    structure = find_cheapest_structure(bct, adj, rec)
     colors = [-1] * n
+    if structure is None:
+        # 所有块都是桥或孤立点（森林）：列表模式下仍可能有解，例如 L = [0], [0, 1], [0] 的 P3
+        rec.set_branch('degree_choosable')
+        with rec.phase('degree_choosable'):
+            return degree_choosable_coloring(adj, palettes, rec, colors, Delta)
 
-    cycle = find_even_cycle(biconn, adj)
-    if cycle:
-        color_cycle(cycle, colors)
-    else:
-        whel = find_whel(biconn, adj)
-        if whel:
-            hub, rim = whel
-            color_whel(hub, rim, colors)
-        else:
-            theta = find_theta(biconn, adj)
-            if theta:
-                u, v, paths = theta
-                color_theta(u, v, paths, colors)
-            else:
-                raise RuntimeError("未找到可行子结构，理论不应发生")
+    kind, found = structure
+    rec.set_branch(kind)
+    with rec.phase('complete_coloring'):
+        complete_coloring(adj, colors, Delta, rec, palettes, sources=structure_vertices(kind, found))
+    with rec.phase('structure_coloring'):
+        color_structure(adj, colors, Delta, kind, rec, palettes)
+    return colors
 
-    return complete_coloring(adj, colors, Delta)
 
+def _count_bfs(rec, adj, order):
+    # 事后统计一次 BFS 的访问量（只在插桩开启时计算，不进入搜索循环）
+    if rec.enabled:
+        rec.count('bfs_launches')
+        rec.count('vertices_visited', len(order))
+        rec.count('edges_visited', int(adj.degree[order].sum()) if order else 0)
 
-def greedy_coloring_nonregular(adj, Delta):
+
+def _greedy_in_order(adj, Delta, palettes, order):
+    """按给定策略贪心取色；某个顶点在 Δ 色（或自己的列表）内取不到颜色时返回 None"""
+    if order == 'dsatur':
+        if palettes is not None:
+            raise ValueError("列表着色模式不支持 dsatur 顺序")
+        colors, _ = dsatur_coloring(adj, palette=Delta)
+        return colors if max(colors, default=-1) < Delta else None
+    colors = [-1] * len(adj)
+    ptr, idx = adj.neighbor_views()
+    if palettes is not None:
+        for v in vertex_order(adj, order):
+            c = palettes.first_free(v, idx[ptr[v]:ptr[v + 1]], colors)
+            if c < 0:
+                return None
+            colors[v] = c
+        return colors
+    ff = FirstFit(Delta)
+    for v in vertex_order(adj, order):
+        c = ff.smallest(idx[ptr[v]:ptr[v + 1]], colors)
+        if c >= Delta:
+            return None
+        colors[v] = c
+    return colors
+
+
+def greedy_coloring_nonregular(adj, Delta, rec=NULL_RECORDER, palettes=None, order=None):
+    """
+    非正则图的贪心 Δ 着色。默认按从低度顶点出发的 BFS 逆序：除根外每个顶点着色时父节点尚未着色，保证 Δ 色够用。
+    - order: 其他顶点顺序（见 orderings.py），常能用远少于 Δ 的颜色，但不再有上述保证；
+      一旦有顶点在 Δ 色内取不到颜色，就退回默认的 BFS 逆序（计入 order_fallbacks）
+    """
+    adj = as_csr(adj)
     n = len(adj)
+    if order is not None:
+        colors = _greedy_in_order(adj, Delta, palettes, order)
+        if colors is not None:
+            return colors
+        rec.count('order_fallbacks')
+    ptr, idx = adj.neighbor_views()
     visited = [False] * n
     order = []
-    start = next(i for i in range(n) if len(adj[i]) < Delta)
+    if palettes is None:
+        start = int(np.flatnonzero(adj.degree < Delta)[0])
+    else:
+        start = int(np.flatnonzero(palettes.size > adj.degree)[0])
     q = deque([start])
     visited[start] = True
     while q:
         v = q.popleft()
         order.append(v)
-        for u in adj[v]:
+        for u in idx[ptr[v]:ptr[v + 1]]:
             if not visited[u]:
                 visited[u] = True
                 q.append(u)
+    _count_bfs(rec, adj, order)
     colors = [-1] * n
+    if palettes is not None:
+        _color_in_order(reversed(order), colors, palettes, ptr, idx)
+        return colors
+    ff = FirstFit(Delta)
     for v in reversed(order):
-        used = {colors[u] for u in adj[v] if colors[u] != -1}
-        for c in range(Delta):
-            if c not in used:
-                colors[v] = c
-                break
+        c = ff.smallest(idx[ptr[v]:ptr[v + 1]], colors)
+        if c < Delta:
+            colors[v] = c
     return colors
 
 
-def complete_coloring(adj, colors, Delta):
+def complete_coloring(adj, colors, Delta, rec=NULL_RECORDER, palettes=None, sources=None):
+    """
+    从 sources（默认为已着色的顶点）出发的多源 BFS 逆序，给其余未着色的顶点首次适配着色。
+    除 sources 外每个顶点着色时，它的 BFS 父节点尚未着色（或是仍未着色的 source），至多 deg - 1 个邻居已着色。
+    sources 中未着色的顶点与 BFS 到不了的顶点保持 -1，留给 color_structure
+    """
+    adj = as_csr(adj)
     n = len(adj)
-    visited = [c != -1 for c in colors]
-    q = deque([v for v in range(n) if visited[v]])
+    if sources is None:
+        sources = [v for v in range(n) if colors[v] != -1]
+    ptr, idx = adj.neighbor_views()
+    visited = [False] * n
+    for v in sources:
+        visited[v] = True
+    q = deque(sources)
     order = []
     while q:
         v = q.popleft()
         order.append(v)
-        for u in adj[v]:
+        for u in idx[ptr[v]:ptr[v + 1]]:
             if not visited[u]:
                 visited[u] = True
                 q.append(u)
-    for v in reversed(order):
-        if colors[v] != -1:
-            continue
-        used = {colors[u] for u in adj[v] if colors[u] != -1}
-        for c in range(Delta):
-            if c not in used:
-                colors[v] = c
-                break
+    _count_bfs(rec, adj, order)
+    todo = [v for v in reversed(order[len(sources):]) if colors[v] == -1]
+    if palettes is not None:
+        _color_in_order(todo, colors, palettes, ptr, idx)
+        return colors
+    ff = FirstFit(Delta)
+    for v in todo:
+        c = ff.smallest(idx[ptr[v]:ptr[v + 1]], colors)
+        if c < Delta:
+            colors[v] = c
     return colors
 
 
+def structure_vertices(kind, found):
+    """子结构的顶点（去重，保持路径顺序）"""
+    if kind == 'cycle':
+        return list(found)
+    if kind == 'whel':
+        hub, rim = found
+        return [hub] + [x for x in rim if x != hub]
+    u, v, paths = found
+    return list(dict.fromkeys([u, v] + [node for path in paths for node in path]))
+
+
+def color_structure(adj, colors, Delta, kind, rec=NULL_RECORDER, palettes=None):
+    """
+    补全之后给仍未着色的顶点（子结构，以及补全没有覆盖到的分量）着色，返回实际的分支名。
+    子结构的每个顶点在补全阶段至多失去 deg(v) - deg_P(v) 种颜色，剩余列表不小于它在子结构导出子图 P 中的度数；
+    find_cheapest_structure 只选 G[P] 不是 Gallai 树的结构，degree_choosable_coloring 通常一次成功；
+    它第 2 步的贪心选择仍可能走不通，此时整图重新按度数可选性着色（计入 structure_fallbacks）
+    """
+    try:
+        degree_choosable_coloring(adj, palettes, rec, colors, Delta)
+        return kind
+    except ListColoringError:
+        rec.count('structure_fallbacks')
+        rec.set_branch('degree_choosable')
+        for v in range(len(colors)):
+            colors[v] = -1
+        degree_choosable_coloring(adj, palettes, rec, colors, Delta)
+        return 'degree_choosable'
+
+
+def _structure_size(kind, found):
+    # 结构的代价 = 预着色的顶点数，越小留给补全阶段的自由度越大
+    if kind == 'cycle':
+        return len(found)
+    if kind == 'whel':
+        return 1 + len(found[1])
+    u, v, paths = found
+    return 2 + sum(len(path) - 2 for path in paths)
+
+
+def _choosable_structure(adj, vertices):
+    """
+    子结构顶点的导出子图 G[P] 是否可按剩余列表着色：G[P] 2-连通，不是 Gallai 树等价于既非完全图也非奇圈。
+    正则图上 G[P] 的剩余列表恰好等于它的度数，完全图 / 奇圈（例如 rim 为三角形的轮，即 K4）必然无解，
+    选中后只能整图回退，因此在挑选结构时就排除
+    """
+    ptr, idx = adj.neighbor_views()
+    members = set(vertices)
+    k = len(members)
+    m = sum(1 for v in members for u in idx[ptr[v]:ptr[v + 1]] if u in members) // 2
+    return not (m == k * (k - 1) // 2 or (m == k and k % 2 == 1))
+
+
+def find_cheapest_structure(bct, adj, rec=NULL_RECORDER):
+    """
+    在块-割点树的所有块（≥3 个顶点）中依次寻找偶圈 / theta / 轮，
+    每个块按优先级取第一个可按剩余列表着色的结构（_choosable_structure；不合格的计入 structures_rejected，
+    继续试下一种），最后返回预着色顶点最少的 (kind, found)；所有块都找不到时返回 None。
+    """
+    adj = as_csr(adj)
+    best = None
+    best_size = None
+    buffers = None
+
+    def accept(kind, found):
+        if found and _choosable_structure(adj, structure_vertices(kind, found)):
+            return (kind, found)
+        if found:
+            rec.count('structures_rejected')
+        return None
+
+    for block in bct.blocks(min_size=3):
+        with rec.phase('even_cycle'):
+            candidate = accept('cycle', find_even_cycle(block, adj, rec))
+        if candidate is None:
+            biconn = set(block.tolist())
+            with rec.phase('theta'):
+                candidate = accept('theta', find_theta(biconn, adj, rec))
+            if candidate is None:
+                if buffers is None:
+                    buffers = WhelBuffers(adj)
+                with rec.phase('whel'):
+                    candidate = accept('whel', find_whel(biconn, adj, rec, buffers))
+        if candidate is None:
+            continue
+        size = _structure_size(*candidate)
+        if best is None or size < best_size:
+            best, best_size = candidate, size
+    return best
+
+
 def dfs_biconnected(adj):
-    n = len(adj)
-    index = [None] * n
-    lowlink = [None] * n
-    stack = []
-    result = []
-    idx = [0]
-
-    def dfs(v, parent):
-        index[v] = lowlink[v] = idx[0]
-        idx[0] += 1
-        for w in adj[v]:
-            if index[w] is None:
-                stack.append((v, w))
-                dfs(w, v)
-                lowlink[v] = min(lowlink[v], lowlink[w])
-                if lowlink[w] >= index[v]:
-                    block = set()
-                    while stack:
-                        x, y = stack.pop()
-                        block.update([x, y])
-                        if (x, y) == (v, w) or (x, y) == (w, v):
-                            break
-                    if len(block) >= 3:
-                        result.append(block)
-            elif w != parent and index[w] < index[v]:
-                lowlink[v] = min(lowlink[v], index[w])
-                stack.append((v, w))
-    for v in range(n):
-        if index[v] is None:
-            dfs(v, -1)
-    return result[0] if result else set(range(n))
-
-
-def find_even_cycle(biconn, adj):
-    n = len(adj)
-    parent = [-1] * n
-    depth = [0] * n
-    visited = [False] * n
+    """兼容旧接口：返回第一个至少含 3 个顶点的块（集合），没有则返回全部顶点"""
+    adj = as_csr(adj)
+    for block in biconnected_components(adj).blocks(min_size=3):
+        return set(block.tolist())
+    return set(range(len(adj)))
 
-    def dfs(v):
-        visited[v] = True
-        for u in adj[v]:
-            if u not in biconn:
+
+def _block_vertices(biconn):
+    if isinstance(biconn, np.ndarray):
+        return biconn
+    return np.fromiter(biconn, dtype=np.int64, count=len(biconn))
+
+
+def find_even_cycle(biconn, adj, rec=NULL_RECORDER):
+    """
+    显式栈 DFS 找第一个偶圈（树路径 + 一条返祖边），最多 O(块内边数)，无递归深度限制。
+    - biconn: 块的顶点（集合或数组）；块内顶点重编号为 0..k-1，所有工作数组只按块大小分配
+    - 块外顶点由向量化的成员查表过滤，邻居只在顶点第一次展开时才取，找到偶圈即可提前返回
+    """
+    adj = as_csr(adj)
+    vs = np.unique(_block_vertices(biconn))
+    local = adj.local_index(vs)
+    k = len(vs)
+    parent = [-1] * k
+    depth = [-1] * k
+    nbrs = [None] * k
+
+    def expand(v):
+        loc = local(adj.neighbors(vs[v])).tolist()
+        return iter([u for u in loc if u >= 0])
+
+    launches = 0
+    for s in range(k):
+        if depth[s] != -1:
+            continue
+        launches += 1
+        depth[s] = 0
+        nbrs[s] = expand(s)
+        stack = [s]
+        while stack:
+            v = stack[-1]
+            u = next(nbrs[v], -1)
+            if u == -1:
+                stack.pop()
                 continue
-            if not visited[u]:
+            if depth[u] == -1:
                 parent[u] = v
                 depth[u] = depth[v] + 1
-                dfs(u)
+                nbrs[u] = expand(u)
+                stack.append(u)
             elif depth[u] < depth[v] - 1 and (depth[v] - depth[u] + 1) % 2 == 0:
                 cycle = []
                 x = v
@@ -148,81 +380,399 @@ def find_even_cycle(biconn, adj):
                     cycle.append(x)
                     x = parent[x]
                 cycle.append(u)
-                return cycle[::-1]
-        return None
-
-    for v in biconn:
-        if not visited[v]:
-            res = dfs(v)
-            if res:
-                return res
+                _count_dfs(rec, adj, vs, depth, launches)
+                return vs[cycle[::-1]].tolist()
+    _count_dfs(rec, adj, vs, depth, launches)
     return None
 
 
-def find_whel(biconn, adj):
-    n = len(adj)
+def _count_dfs(rec, adj, vs, depth, launches):
+    if rec.enabled:
+        seen = vs[np.asarray(depth) != -1]
+        rec.count('dfs_launches', launches)
+        rec.count('vertices_visited', len(seen))
+        rec.count('edges_visited', int(adj.degree[seen].sum()))
+
+
+class WhelBuffers:
+    """
+    find_whel 的工作数组 stamp / depth / parent（长度 n 的列表）与邻接的 memoryview ptr / idx，
+    每个 find_cheapest_structure 调用只分配一次。
+    每个 hub 取新的 generation：stamp[v] == gen 即 v 是本次 hub 的块内邻居，depth / parent 只在 stamp 命中时才读，不必清空
+    """
+
+    __slots__ = ('ptr', 'idx', 'stamp', 'depth', 'parent', 'gen')
+
+    def __init__(self, adj):
+        n = len(adj)
+        self.ptr, self.idx = adj.neighbor_views()
+        self.stamp = [0] * n
+        self.depth = [0] * n
+        self.parent = [0] * n
+        self.gen = 0
+
+
+def find_whel(biconn, adj, rec=NULL_RECORDER, buffers=None):
+    """
+    轮：hub 加上一个完全落在 hub 邻域里的圈 rim（rim 上每个顶点都与 hub 相邻）。
+    对每个 hub 标记它的块内邻居，在邻域导出子图 G[N(hub)] 里做 BFS，
+    第一条非树边 (x, w) 连同两端到最近公共祖先的树路径就是 rim。
+    - buffers: WhelBuffers；逐块调用时由调用方传入同一份，None 时本次调用自己分配
+    返回 (hub, rim)，rim 按圈上顺序排列（首尾相邻）；块内没有轮时返回 None。
+    """
+    adj = as_csr(adj)
+    if buffers is None:
+        buffers = WhelBuffers(adj)
+    ptr, idx = buffers.ptr, buffers.idx
+    stamp, depth, parent = buffers.stamp, buffers.depth, buffers.parent
+    launches = 0
+    visited = 0       # 每个出队顶点计一次，边按其邻接表长度计
+    edges = 0
     for hub in biconn:
-        neighbors = [u for u in adj[hub] if u in biconn]
-        if len(neighbors) < 2:
+        neighbors = [u for u in idx[ptr[hub]:ptr[hub + 1]] if u in biconn]
+        if len(neighbors) < 3:
             continue
-        for i in range(len(neighbors)):
-            for j in range(i + 1, len(neighbors)):
-                u, v = neighbors[i], neighbors[j]
-                visited = [False] * n
-                q = deque([(u, [u])])
-                visited[hub] = True
-                visited[u] = True
-                found = None
-                while q:
-                    x, path = q.popleft()
-                    if x == v:
-                        found = path
-                        break
-                    for w in adj[x]:
-                        if w in biconn and not visited[w] and w != hub:
-                            visited[w] = True
-                            q.append((w, path + [w]))
-                if found:
-                    return (hub, found)
+        buffers.gen += 1
+        gen = buffers.gen
+        for u in neighbors:
+            stamp[u] = gen
+            depth[u] = -1
+        for s in neighbors:
+            if depth[s] != -1:
+                continue
+            launches += 1
+            depth[s] = 0
+            parent[s] = -1
+            q = deque([s])
+            while q:
+                x = q.popleft()
+                nbrs = idx[ptr[x]:ptr[x + 1]]
+                visited += 1
+                edges += len(nbrs)
+                for w in nbrs:
+                    if stamp[w] != gen:
+                        continue
+                    if depth[w] == -1:
+                        depth[w] = depth[x] + 1
+                        parent[w] = x
+                        q.append(w)
+                    elif w != parent[x]:
+                        _count_search(rec, 'bfs_launches', launches, visited, edges)
+                        return (hub, _tree_cycle(x, w, depth, parent))
+    _count_search(rec, 'bfs_launches', launches, visited, edges)
     return None
 
 
-def find_theta(biconn, adj):
-    n = len(adj)
-    for u in biconn:
-        for v in biconn:
-            if u >= v:
+def _tree_cycle(x, w, depth, parent):
+    """非树边 (x, w) 与两端到最近公共祖先的树路径构成的圈：x → … → lca → … → w"""
+    up, down = [x], [w]
+    while depth[up[-1]] > depth[down[-1]]:
+        up.append(parent[up[-1]])
+    while depth[down[-1]] > depth[up[-1]]:
+        down.append(parent[down[-1]])
+    while up[-1] != down[-1]:
+        up.append(parent[up[-1]])
+        down.append(parent[down[-1]])
+    return up + down[-2::-1]
+
+
+def _count_search(rec, kind, launches, visited, edges):
+    rec.count(kind, launches)
+    rec.count('vertices_visited', visited)
+    rec.count('edges_visited', edges)
+
+
+def _count_visited(rec, kind, adj, parent):
+    # parent 字典的键就是本次搜索访问过的顶点
+    if rec.enabled:
+        seen = list(parent)
+        _count_search(rec, kind, 1, len(seen), int(adj.degree[seen].sum()))
+
+
+def _block_cycle(biconn, adj, rec=NULL_RECORDER):
+    """块内任取一个圈：显式栈 DFS，遇到第一条返祖边即返回树路径 + 该边"""
+    start = next(iter(biconn))
+    parent = {start: -1}
+    on_path = {start}
+    stack = [(start, iter(adj[start]))]
+    while stack:
+        v, it = stack[-1]
+        for w in it:
+            if w not in biconn or w == parent[v]:
                 continue
-            paths = []
+            if w in on_path:
+                cycle = [v]
+                while cycle[-1] != w:
+                    cycle.append(parent[cycle[-1]])
+                _count_visited(rec, 'dfs_launches', adj, parent)
+                return cycle[::-1]
+            if w not in parent:
+                parent[w] = v
+                on_path.add(w)
+                stack.append((w, iter(adj[w])))
+                break
+        else:
+            stack.pop()
+            on_path.discard(v)
+    _count_visited(rec, 'dfs_launches', adj, parent)
+    return None
 
-            def dfs(x, target, path, visited):
-                if x == target:
-                    paths.append(path)
-                    return
-                for w in adj[x]:
-                    if w in biconn and w not in visited:
-                        dfs(w, target, path + [w], visited | {w})
 
-            dfs(u, v, [u], {u})
-            if len(paths) >= 3:
-                return (u, v, paths[:3])
+def _ear_from(x, y, biconn, pos, adj, rec=NULL_RECORDER):
+    """从圈上顶点 x 经圈外邻居 y 出发 BFS（删去 x），到达的第一个圈上顶点即耳朵的另一端"""
+    parent = {y: -1, x: -1}
+    q = deque([y])
+    while q:
+        a = q.popleft()
+        for b in adj[a]:
+            if b not in biconn or b in parent:
+                continue
+            parent[b] = a
+            if b in pos:
+                ear = [b]
+                while ear[-1] != y:
+                    ear.append(parent[ear[-1]])
+                ear.append(x)
+                _count_visited(rec, 'bfs_launches', adj, parent)
+                return ear[::-1]
+            q.append(b)
+    _count_visited(rec, 'bfs_launches', adj, parent)
     return None
 
 
-def color_cycle(cycle, colors):
-    for i, v in enumerate(cycle):
-        colors[v] = i % 2
+def find_theta(biconn, adj, rec=NULL_RECORDER):
+    """
+    线性时间 theta 子图：先在块内找一个圈 C，再找一条连接 C 上两个不同顶点、
+    内部不经过 C 的耳朵（弦或圈外路径）。块是 2-连通的，只要它不只是一个圈就一定存在。
+    返回 (u, v, [arc1, arc2, ear])，三条路径都从 u 走到 v 且内部互不相交。
+    """
+    adj = as_csr(adj)
+    cycle = _block_cycle(biconn, adj, rec)
+    if cycle is None:
+        return None
+    L = len(cycle)
+    pos = {x: i for i, x in enumerate(cycle)}
+    for i, x in enumerate(cycle):
+        prev, nxt = cycle[i - 1], cycle[(i + 1) % L]
+        for y in adj[x]:
+            if y not in biconn or y == prev or y == nxt:
+                continue
+            ear = [x, y] if y in pos else _ear_from(x, y, biconn, pos, adj, rec)
+            if ear is None:
+                continue
+            j = pos[ear[-1]]
+            forward = [cycle[(i + k) % L] for k in range((j - i) % L + 1)]
+            backward = [cycle[(i - k) % L] for k in range((i - j) % L + 1)]
+            return (x, ear[-1], [forward, backward, ear])
+    return None
+
+
+# ------------------------------------------------------------
+# 列表着色按顺序取色：每个顶点从自己的列表里取第一个与已着色邻居不冲突的颜色（取不到抛出 ListColoringError）
+# ------------------------------------------------------------
+def _color_in_order(order, colors, palettes, ptr, idx):
+    for v in order:
+        if colors[v] == -1:
+            c = palettes.first_free(v, idx[ptr[v]:ptr[v + 1]], colors)
+            if c < 0:
+                raise ListColoringError(f"顶点 {v} 的颜色列表已被已着色的邻居占满")
+            colors[v] = c
+
+
+# ------------------------------------------------------------
+# 度数可选性：|L(v)| ≥ deg(v) 的列表着色（Erdős–Rubin–Taylor 的构造证明），
+# 列表模式下图不连通、只有桥（树）或子结构预着色走不通时使用
+# ------------------------------------------------------------
+def _lowest(bits):
+    return (bits & -bits).bit_length() - 1
+
 
+def _popcount(bits):
+    return bin(bits).count('1')
+
+
+def degree_choosable_coloring(adj, palettes=None, rec=NULL_RECORDER, colors=None, Delta=None):
+    """
+    |L(v)| ≥ deg(v) 的列表着色（Erdős–Rubin–Taylor 的构造证明），逐个未着色的连通分量处理。
+    - palettes: None 时所有顶点的列表都是 range(Δ)（正则图上就是 Brooks 定理的构造）
+    - colors: 已部分着色时原地补全其余顶点，已着色的顶点只作为约束
+    avail[v] 为扣除已着色邻居颜色后的剩余列表（Python 整数位掩码），deg[v] 为未着色的邻居数，
+    只为未着色的顶点建表；每一步都保持 |avail| ≥ deg：
+    1. 分量中有 |avail(v)| > deg(v) 的顶点：以它为根 BFS 逆序贪心，除根外每个顶点着色时父节点尚未着色，一定成功
+    2. 否则若有相邻的 u、w 使 avail(u) 中有 w 用不了的颜色 c：u 取 c，删去 u 后 w 所在的分量在 w 处有余量，
+       其余分量入栈继续处理（见 _pick_split）
+    3. 否则整个分量的剩余列表相同（大小为 k）且是 k-正则图：完全图或奇圈无解，抛出 ListColoringError；
+       偶圈交替 2 着色；k ≥ 3 时有割点 v 就把 v 的各个 lobe 分别着色、再在各 lobe 内置换颜色让 v 的邻居都避开同一种颜色，
+       2-连通时找 v 与它两个不相邻、删去后图仍连通的邻居 x、y（Lovász），x、y 同色，再以 v 为根 BFS 逆序贪心
+    第 2 步的取色是贪心选择：Gallai 树（每个块都是完全图或奇圈）配上「坏」列表时本来无解，
+    其他图在个别列表下也可能因这一步的选择走进第 3 步的无解情形。
+    """
+    adj = as_csr(adj)
+    n = len(adj)
+    if colors is None:
+        colors = [-1] * n
+    if Delta is None:
+        Delta = adj.max_degree()
+    ptr, idx = adj.neighbor_views()
+
+    def nbrs(v):
+        return idx[ptr[v]:ptr[v + 1]]
+
+    todo = np.flatnonzero(np.asarray(colors) == -1).tolist()
+    avail, deg = {}, {}
+    for v in todo:
+        bits = palettes.mask(v) if palettes is not None else (1 << Delta) - 1
+        k = 0
+        for u in nbrs(v):
+            if colors[u] == -1:
+                k += 1
+            else:
+                bits &= ~(1 << colors[u])
+        avail[v], deg[v] = bits, k
 
-def color_whel(hub, rim_path, colors):
-    colors[hub] = 0
-    color_cycle(rim_path, colors)
+    def assign(v, c):
+        colors[v] = c
+        keep = ~(1 << c)
+        for u in nbrs(v):
+            if colors[u] == -1:
+                avail[u] &= keep
+                deg[u] -= 1
 
+    def bfs(root, skip=()):
+        # 未着色顶点上的 BFS 序（不经过 skip）
+        seen = set(skip)
+        seen.add(root)
+        order = [root]
+        for v in order:
+            for u in nbrs(v):
+                if colors[u] == -1 and u not in seen:
+                    seen.add(u)
+                    order.append(u)
+        return order
 
-def color_theta(u, v, paths, colors):
-    colors[u] = 0
-    colors[v] = 1
-    for path in paths:
-        for idx, node in enumerate(path):
-            if node != u and node != v and colors[node] == -1:
-                colors[node] = (idx % 2) + 2
+    def greedy(order):
+        for v in reversed(order):
+            if not avail[v]:
+                raise ListColoringError(f"顶点 {v} 的颜色列表已被已着色的邻居占满")
+            assign(v, _lowest(avail[v]))
+
+    stack = []
+    claimed = set()
+    for v in todo:
+        if v not in claimed:
+            part = bfs(v)
+            claimed.update(part)
+            stack.append(part)
+    while stack:
+        S = stack.pop()
+        rec.count('vertices_visited', len(S))
+        root = next((v for v in S if _popcount(avail[v]) > deg[v]), -1)
+        if root >= 0:
+            greedy(bfs(root))
+            continue
+        palette = avail[S[0]]
+        # 连通分量里只要有两个顶点的剩余列表不同，就有一条边两端的列表不同
+        pick = None if all(avail[v] == palette for v in S) else _pick_split(S, avail, colors, nbrs)
+        if pick is not None:
+            u, c = pick
+            assign(u, c)
+            claimed = set()
+            for x in nbrs(u):
+                if colors[x] == -1 and x not in claimed:
+                    part = bfs(x)
+                    claimed.update(part)
+                    stack.append(part)
+            continue
+        _color_regular_component(S, palette, deg[S[0]], adj, colors, nbrs, assign, bfs, greedy)
+    return colors
+
+
+def _pick_split(S, avail, colors, nbrs):
+    """
+    第 2 步的 (u, c)：c ∈ avail(u) 且至少一个未着色邻居的列表里没有 c。
+    在所有候选中取列表含 c 的邻居最少的一个——为 0 时删去 u 后的每个分量都有余量，后面只剩贪心
+    """
+    best, best_hits = None, None
+    for u in S:
+        around = [avail[x] for x in nbrs(u) if colors[x] == -1]
+        bits = avail[u]
+        while bits:
+            c = _lowest(bits)
+            bits &= bits - 1
+            hits = sum(1 for mask in around if mask >> c & 1)
+            if hits < len(around) and (best is None or hits < best_hits):
+                best, best_hits = (u, c), hits
+                if hits == 0:
+                    return best
+    return best
+
+
+def _color_regular_component(S, palette, k, adj, colors, nbrs, assign, bfs, greedy):
+    """degree_choosable_coloring 的第 3 步：S 是 k-正则的未着色分量，各顶点的剩余列表都是 palette"""
+    if len(S) == k + 1 or (k == 2 and len(S) % 2):
+        shape = "完全图" if len(S) == k + 1 else "奇圈"
+        raise ListColoringError(f"顶点 {S[0]} 所在的分量剩余 {len(S)} 个顶点，是各顶点剩余列表相同的{shape}，无法列表着色")
+    if k == 2:
+        cycle = [S[0]]
+        prev = -1
+        while len(cycle) < len(S):
+            x = next(u for u in nbrs(cycle[-1]) if colors[u] == -1 and u != prev and u != cycle[0])
+            prev = cycle[-1]
+            cycle.append(x)
+        a = _lowest(palette)
+        pair = (a, _lowest(palette & ~(1 << a)))
+        for i, v in enumerate(cycle):
+            colors[v] = pair[i % 2]
+        return
+
+    sub, vs = adj.induced_subgraph(S)
+    cut = np.flatnonzero(biconnected_components(sub).is_cut)
+    if len(cut):
+        v = int(vs[cut[0]])
+        lobes = []
+        claimed = {v}
+        for x in nbrs(v):
+            if colors[x] == -1 and x not in claimed:
+                lobe = bfs(x, skip=(v,))
+                claimed.update(lobe)
+                lobes.append(lobe)
+        # v 暂不着色：BFS 逆序中每个顶点的父节点（v 或同一 lobe 内更早的顶点）都还没着色
+        for x in reversed(bfs(v)[1:]):
+            used = 0
+            for u in nbrs(x):
+                if colors[u] >= 0:
+                    used |= 1 << colors[u]
+            colors[x] = _lowest(palette & ~used)
+        # v 在每个 lobe 内的邻居少于 k 个：各 lobe 把一种缺席的颜色换成 target，v 取 target
+        target = _lowest(palette)
+        for lobe in lobes:
+            members = set(lobe)
+            used = 0
+            for u in nbrs(v):
+                if u in members:
+                    used |= 1 << colors[u]
+            missing = _lowest(palette & ~used)
+            if missing != target:
+                for x in lobe:
+                    if colors[x] == missing:
+                        colors[x] = target
+                    elif colors[x] == target:
+                        colors[x] = missing
+        colors[v] = target
+        return
+
+    for v in S:
+        around = [u for u in nbrs(v) if colors[u] == -1]
+        for i, x in enumerate(around):
+            adjacent = set(nbrs(x))
+            for y in around[i + 1:]:
+                if y in adjacent:
+                    continue
+                order = bfs(v, skip=(x, y))
+                if len(order) == len(S) - 2:
+                    c = _lowest(palette)
+                    assign(x, c)
+                    assign(y, c)
+                    greedy(order)
+                    return
+    raise ListColoringError(f"顶点 {S[0]} 所在的 2-连通分量中没有找到 Lovász 三元组")